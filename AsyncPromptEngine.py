@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+from BatchRenderer import BatchRenderer, CATEGORY_IDS
+from PromptEngine import PromptEngine, CATEGORIES
+
+
+class AsyncPromptEngine:
+    """Asyncio-Schnittstelle zur PromptEngine für eingebettete Dienste.
+
+    Datei-Ein-/Ausgabe (Kategorie-JSON, Binär-Cache, Sprachpakete) läuft per
+    asyncio.to_thread in einem Worker-Thread; das eigentliche Rendern aus den
+    kompilierten Vorlagen ist reine Rechenarbeit im Mikrosekundenbereich und
+    läuft direkt in der Ereignisschleife. Gleichzeitige Anfragen für dieselbe
+    Kategorie teilen sich einen Ladevorgang der Definition; die Schritte je
+    Sprache (Sprachpaket, Kompilieren) laufen nacheinander unter einer Sperre.
+    """
+
+    def __init__(self, engine=None, default_language="de"):
+        self.engine = engine or PromptEngine()
+        self.renderer = BatchRenderer(self.engine, default_language)
+        self.default_language = default_language
+        self.prepared = set()
+        self.pending = {}
+        self.loading = {}
+        self.prepare_lock = threading.Lock()
+
+    def prepare_sync(self, category_id, language):
+        """Lädt Sprachpaket und kompilierte Vorlage einer geladenen Kategorie (läuft im Worker-Thread)."""
+        with self.prepare_lock:
+            self.engine.get_translations(language)
+            self.engine.get_compiled_category(category_id, language)
+            self.renderer.get_field_values(category_id, language, None)
+
+    async def prepare_async(self, category_id, language):
+        await self.load_category(category_id)
+        await asyncio.to_thread(self.prepare_sync, category_id, language)
+
+    async def prepare(self, category_id, language=None):
+        """Stellt sicher, dass eine Kategorie für eine Sprache geladen ist, ohne die Schleife zu blockieren."""
+        language = language or self.default_language
+        key = (category_id, language)
+        if key in self.prepared:
+            return
+        task = self.pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.prepare_async(category_id, language))
+            self.pending[key] = task
+            task.add_done_callback(lambda done: self.finish_prepare(key, done))
+        await asyncio.shield(task)
+
+    def finish_prepare(self, key, task):
+        self.pending.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.prepared.add(key)
+
+    async def load_category(self, category_id):
+        """Lädt eine Kategorie-Definition im Worker-Thread; liefert die CategoryDefinition oder None.
+
+        Pro Kategorie läuft höchstens ein Ladevorgang, auch wenn mehrere Sprachen sie anfordern.
+        """
+        definition = self.engine.category_cache.get(category_id)
+        if definition is not None:
+            return definition
+        task = self.loading.get(category_id)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self.engine.load_category_definition, category_id))
+            self.loading[category_id] = task
+            task.add_done_callback(lambda done: self.loading.pop(category_id, None))
+        return await asyncio.shield(task)
+
+    async def resolve_category_id(self, category):
+        """Wie BatchRenderer.resolve_category_id, liest unbekannte IDs aber im Worker-Thread."""
+        if isinstance(category, str) and category and category not in CATEGORIES and category not in CATEGORY_IDS:
+            await self.load_category(category)
+        return self.renderer.resolve_category_id(category)
+
+    async def get_category_fields(self, category, language=None):
+        """Liefert die lokalisierten Felddefinitionen einer Kategorie oder None."""
+        category_id = await self.resolve_category_id(category)
+        if category_id is None:
+            return None
+        if not isinstance(language, str) or language not in self.engine.language_names:
+            language = self.default_language
+        await self.prepare(category_id, language)
+        return self.engine.get_category_fields(category_id, language)
+
+    async def render(self, category, fields=None, language=None):
+        """Rendert einen Prompt; fehlende Felder erhalten die Standardwerte der Kategorie."""
+        result, error = await self.render_record({"category": category, "language": language, "fields": fields})
+        if error is not None:
+            raise ValueError(error)
+        return result["prompt"]
+
+    async def render_record(self, record):
+        """Rendert einen Datensatz {category, language, fields}; liefert (Ergebnis, Fehler)."""
+        if not isinstance(record, dict):
+            return None, "Datensatz ist kein JSON-Objekt"
+        category_id = await self.resolve_category_id(record.get("category"))
+        language = record.get("language") or self.default_language
+        # Unbekannte Sprachen weist render_record ab; sie dürfen keine Ladevorgänge auslösen
+        if category_id is not None and isinstance(language, str) and language in self.engine.language_names:
+            await self.prepare(category_id, language)
+        return self.renderer.render_record(record)
+
+    async def render_many(self, records, yield_every=64):
+        """Asynchroner Generator über (Ergebnis, Fehler) für eine (async) Folge von Datensätzen.
+
+        Die Reihenfolge entspricht der Eingabe; alle yield_every Datensätze wird
+        die Schleife kurz freigegeben, damit lange Stapel andere Tasks nicht aushungern.
+        """
+        if not hasattr(records, "__aiter__"):
+            records = self.iter_records(records)
+        count = 0
+        async for record in records:
+            yield await self.render_record(record)
+            count += 1
+            if count % yield_every == 0:
+                await asyncio.sleep(0)
+
+    @staticmethod
+    async def iter_records(records):
+        for record in records:
+            yield record
+
+    async def warm(self, category_ids, languages=None):
+        """Lädt mehrere Kategorien parallel vor."""
+        languages = languages or [self.default_language]
+        await asyncio.gather(*(
+            self.prepare(category_id, language)
+            for category_id in category_ids
+            for language in languages
+        ))
@@ -0,0 +1,296 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from PromptEngine import PromptEngine, CATEGORIES, is_valid_category_id
+from ResourceBundle import default_bundle_path
+from RuntimeMetrics import metrics
+
+
+RECORD_KEYS = {"category", "language", "fields"}
+CATEGORY_IDS = set(CATEGORIES.values())
+DEFAULT_CHUNK_SIZE = 500
+
+# Pro Worker-Prozess einmal erzeugt, damit jede Kategorie nur einmal geladen wird
+_worker_renderer = None
+
+
+def read_jsonl_records(stream):
+    """Liest Datensätze zeilenweise aus JSONL (leere Zeilen werden übersprungen)."""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, None, f"ungültiges JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Datensatz ist kein JSON-Objekt"
+            continue
+        yield line_number, record, None
+
+
+def read_csv_records(stream):
+    """Liest Datensätze aus CSV: Spalte fields als JSON oder jede weitere Spalte als Feld."""
+    reader = csv.DictReader(stream)
+    for line_number, row in enumerate(reader, start=2):
+        record = {
+            "category": row.get("category", ""),
+            "language": row.get("language", ""),
+        }
+        raw_fields = row.get("fields")
+        if raw_fields:
+            try:
+                record["fields"] = json.loads(raw_fields)
+            except ValueError as exc:
+                yield line_number, None, f"ungültiges JSON in Spalte fields: {exc}"
+                continue
+        else:
+            record["fields"] = {
+                key: value
+                for key, value in row.items()
+                if key and key not in RECORD_KEYS and value is not None
+            }
+        yield line_number, record, None
+
+
+def detect_input_format(path, input_format=None):
+    """Ermittelt das Eingabeformat aus Option oder Dateiendung."""
+    if input_format:
+        return input_format
+    if path.lower().endswith(".csv"):
+        return "csv"
+    return "jsonl"
+
+
+class BatchRenderer:
+    """Rendert Datensätze {category, language, fields} über die PromptEngine."""
+
+    def __init__(self, engine=None, default_language="de"):
+        self.engine = engine or PromptEngine()
+        self.default_language = default_language
+        self.default_values_cache = {}
+
+    def resolve_category_id(self, category):
+        """Akzeptiert Kategorie-ID (sourcecode) oder internen Namen (Sourcecode)."""
+        if not isinstance(category, str) or not category:
+            return None
+        if category in CATEGORIES:
+            return CATEGORIES[category]
+        if category in CATEGORY_IDS:
+            return category
+        # Unbekannte IDs nur als reiner Dateiname, nie als Pfad
+        if is_valid_category_id(category) and self.engine.load_category_definition(category):
+            return category
+        return None
+
+    def get_field_values(self, category_id, language, fields):
+        """Ergänzt die übergebenen Feldwerte um die Standardwerte der Kategorie."""
+        cache_key = (category_id, language)
+        defaults = self.default_values_cache.get(cache_key)
+        if defaults is None:
+            defaults = self.engine.get_default_field_values(category_id, language)
+            self.default_values_cache[cache_key] = defaults
+
+        field_values = dict(defaults)
+        if isinstance(fields, dict):
+            field_values.update(fields)
+        return field_values
+
+    def render_record(self, record):
+        """Rendert einen Datensatz; liefert (Ergebnis-Dict, Fehlertext)."""
+        category_id = self.resolve_category_id(record.get("category"))
+        if category_id is None:
+            return None, f"unbekannte Kategorie: {record.get('category')!r}"
+
+        language = record.get("language") or self.default_language
+        if not isinstance(language, str) or language not in self.engine.language_names:
+            # Sonst landen beliebige Werte als Schlüssel in den Caches (oder sind nicht hashbar)
+            return None, f"unbekannte Sprache: {language!r}"
+        field_values = self.get_field_values(category_id, language, record.get("fields"))
+        prompt = self.engine.render(category_id, field_values, language)
+        return {"category": category_id, "language": language, "prompt": prompt}, None
+
+    def render_records(self, numbered_records):
+        """Rendert einen Strom von (Zeile, Datensatz, Fehler)-Tupeln lazily."""
+        for line_number, record, error in numbered_records:
+            if error is None:
+                result, error = self.render_record(record)
+            else:
+                result = None
+            yield line_number, result, error
+
+    def render_records_parallel(self, numbered_records, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Rendert blockweise in einem Prozess-Pool und behält die Eingabereihenfolge bei.
+
+        Es sind höchstens einige Blöcke pro Worker gleichzeitig unterwegs, sodass der
+        Speicherbedarf unabhängig von der Eingabegröße bleibt.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            yield from self.render_records(numbered_records)
+            return
+
+        initargs = (
+            self.engine.categories_dir, self.engine.languages_file, self.default_language, self.engine.bundle_file
+        )
+        max_pending = workers * 4
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+            pending = deque()
+            for chunk in iter_chunks(numbered_records, chunk_size):
+                pending.append(executor.submit(_render_chunk, chunk))
+                if len(pending) >= max_pending:
+                    yield from self.collect_chunk(pending.popleft())
+            while pending:
+                yield from self.collect_chunk(pending.popleft())
+
+    def collect_chunk(self, future):
+        """Übernimmt die Ergebnisse eines Blocks und die Metriken des Worker-Prozesses."""
+        results, worker_metrics = future.result()
+        metrics.merge(worker_metrics)
+        return results
+
+
+def iter_chunks(iterable, chunk_size):
+    """Zerlegt einen Strom in Listen mit höchstens chunk_size Elementen."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(categories_dir, languages_file, default_language, bundle_file=None):
+    """Initialisiert den Renderer eines Worker-Prozesses."""
+    global _worker_renderer
+    engine = PromptEngine(categories_dir, languages_file, default_language, bundle_file=bundle_file)
+    _worker_renderer = BatchRenderer(engine, default_language)
+
+
+def _render_chunk(chunk):
+    """Rendert einen Block von Datensätzen im Worker-Prozess; liefert (Ergebnisse, Metriken)."""
+    results = list(_worker_renderer.render_records(chunk))
+    return results, metrics.drain()
+
+
+def write_result(stream, result, output_format):
+    """Schreibt ein Ergebnis als JSONL-Zeile oder als Textblock."""
+    if output_format == "text":
+        stream.write(result["prompt"])
+        stream.write("\n\n")
+    else:
+        stream.write(json.dumps(result, ensure_ascii=False))
+        stream.write("\n")
+
+
+def run_batch(results, output_stream, output_format="jsonl", error_stream=None):
+    """Schreibt gerenderte Ergebnisse fortlaufend und liefert (Anzahl, Fehler)."""
+    error_stream = error_stream or sys.stderr
+    rendered = 0
+    failed = 0
+    for line_number, result, error in results:
+        if error is not None:
+            failed += 1
+            error_stream.write(f"Zeile {line_number}: {error}\n")
+            continue
+        write_result(output_stream, result, output_format)
+        rendered += 1
+    return rendered, failed
+
+
+def build_argument_parser():
+    """Erstellt den Argument-Parser für den Batch-Modus."""
+    parser = argparse.ArgumentParser(
+        prog="UniversalPromptManager batch",
+        description="Rendert Prompts aus JSONL/CSV-Datensätzen {category, language, fields}.",
+    )
+    parser.add_argument("input", help="Eingabedatei (.jsonl oder .csv), '-' für stdin")
+    parser.add_argument("-o", "--output", default="-", help="Ausgabedatei, Standard: stdout")
+    parser.add_argument("--input-format", choices=["jsonl", "csv"], help="Eingabeformat erzwingen")
+    parser.add_argument("--output-format", choices=["jsonl", "text"], default="jsonl")
+    parser.add_argument("--language", default="de", help="Sprache für Datensätze ohne language")
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="Anzahl Worker-Prozesse, 0 = alle Kerne, 1 = ohne Prozess-Pool")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Datensätze pro Block im Prozess-Pool")
+    parser.add_argument("--categories-dir", default="categories")
+    parser.add_argument("--languages-file", default="upmlanguages.json")
+    parser.add_argument("--bundle", default=default_bundle_path(),
+                        help="Ressourcen-Bundle statt loser JSON-Dateien verwenden")
+    parser.add_argument("--metrics", metavar="DATEI", help="Laufzeitmetriken am Ende als JSON schreiben")
+    return parser
+
+
+def open_input(path):
+    """Öffnet die Eingabedatei oder stdin."""
+    if path == "-":
+        return sys.stdin
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def open_output(path):
+    """Öffnet die Ausgabedatei oder stdout."""
+    if path == "-":
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8', newline='\n')
+
+
+def discard_stdout():
+    """Leitet stdout nach einer geschlossenen Pipe (z.B. | head) auf devnull um.
+
+    Sonst scheitert auch das abschließende Flush des Interpreters mit BrokenPipeError.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+
+def main(argv=None):
+    """Einstiegspunkt für den nicht-interaktiven Batch-Modus."""
+    args = build_argument_parser().parse_args(argv)
+    engine = PromptEngine(args.categories_dir, args.languages_file, args.language, bundle_file=args.bundle)
+    renderer = BatchRenderer(engine, args.language)
+    input_format = detect_input_format(args.input, args.input_format)
+    reader = read_csv_records if input_format == "csv" else read_jsonl_records
+
+    input_stream = open_input(args.input)
+    output_stream = open_output(args.output)
+    started = time.perf_counter()
+    try:
+        try:
+            results = renderer.render_records_parallel(
+                reader(input_stream), args.workers, max(1, args.chunk_size)
+            )
+            rendered, failed = run_batch(results, output_stream, args.output_format)
+        finally:
+            if input_stream is not sys.stdin:
+                input_stream.close()
+            if output_stream is not sys.stdout:
+                output_stream.close()
+        if output_stream is sys.stdout:
+            output_stream.flush()
+    except BrokenPipeError:
+        discard_stdout()
+        return 1
+
+    elapsed = time.perf_counter() - started
+    rate = rendered / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(f"{rendered} Prompts gerendert, {failed} fehlerhaft in {elapsed:.2f}s ({rate:.0f} Prompts/s)\n")
+    if args.metrics:
+        metrics.write_json(args.metrics)
+    return 1 if failed and not rendered else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
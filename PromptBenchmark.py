@@ -0,0 +1,361 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from PromptEngine import PromptEngine, CATEGORIES
+from ResourceBundle import build_bundle
+
+
+BENCHMARK_SCHEMA_VERSION = 1
+BENCHMARKS = (
+    "load_languages",
+    "load_category_definition",
+    "get_category_fields",
+    "localize_saved_field_value",
+    "generate_category_prompt_from_json",
+    "generate_sourcecode_prompt",
+    "generate_nutrition_prompt",
+)
+
+
+def summarize_timings(durations_ns):
+    """Fasst Laufzeiten (Nanosekunden) als Kennzahlen in Mikrosekunden zusammen."""
+    return {
+        "runs": len(durations_ns),
+        "min_us": round(min(durations_ns) / 1000, 3),
+        "median_us": round(statistics.median(durations_ns) / 1000, 3),
+        "mean_us": round(statistics.fmean(durations_ns) / 1000, 3),
+        "max_us": round(max(durations_ns) / 1000, 3),
+    }
+
+
+class PromptBenchmark:
+    """Misst Lade- und Renderpfade der PromptEngine ohne GUI.
+
+    "cold" misst jeweils den ersten Aufruf auf einer frischen Engine ohne
+    Datei-Cache, "disk_cache" den ersten Aufruf mit vorhandenem Marshal-Cache,
+    "bundle" den ersten Aufruf mit vorkompiliertem Ressourcen-Bundle und
+    "warm" wiederholte Aufrufe auf derselben Engine.
+    """
+
+    def __init__(self, categories_dir="categories", languages_file="upmlanguages.json",
+                 category_ids=None, languages=None, cold_repeat=3, warm_repeat=50):
+        self.categories_dir = categories_dir
+        self.languages_file = languages_file
+        self.cold_repeat = max(1, cold_repeat)
+        self.warm_repeat = max(1, warm_repeat)
+        self.category_ids = list(category_ids or sorted(set(CATEGORIES.values())))
+        self.languages = list(languages or self.create_engine().language_names)
+        self.cache_dir = None
+        self.bundle_file = None
+        self.results = []
+        self.memory = {}
+
+    def create_engine(self, cache_dir=None, bundle_file=None):
+        """Erzeugt eine Engine ohne Kategorie-Index und standardmäßig ohne Datei-Cache/Sprach-Index/Bundle."""
+        language_index_file = os.path.join(cache_dir, "language_index.json") if cache_dir else None
+        return PromptEngine(self.categories_dir, self.languages_file, "de", index_file=None, cache_dir=cache_dir,
+                            language_index_file=language_index_file, bundle_file=bundle_file)
+
+    def record(self, benchmark, mode, durations_ns, category=None, language=None):
+        result = {"benchmark": benchmark, "mode": mode, "category": category, "language": language}
+        result.update(summarize_timings(durations_ns))
+        self.results.append(result)
+
+    def measure_cold(self, call, cache_dir=None, bundle_file=None):
+        """Misst den ersten Aufruf auf jeweils frischen Engines."""
+        durations = []
+        for _ in range(self.cold_repeat):
+            engine = self.create_engine(cache_dir, bundle_file)
+            if bundle_file:
+                # Öffnen des Bundles gehört zum Start, nicht zum gemessenen Aufruf
+                engine.get_resource_bundle()
+            started = time.perf_counter_ns()
+            call(engine)
+            durations.append(time.perf_counter_ns() - started)
+        return durations
+
+    def measure_warm(self, engine, call):
+        """Misst wiederholte Aufrufe auf einer bereits aufgewärmten Engine."""
+        call(engine)
+        durations = []
+        for _ in range(self.warm_repeat):
+            started = time.perf_counter_ns()
+            call(engine)
+            durations.append(time.perf_counter_ns() - started)
+        return durations
+
+    def measure_memory(self, benchmark, call):
+        """Erfasst Spitzen- und verbleibenden Speicher eines kalten Durchlaufs über alle Kategorien."""
+        engine = self.create_engine()
+        tracemalloc.start()
+        try:
+            call(engine)
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.memory[benchmark] = {"peak_bytes": peak, "retained_bytes": retained}
+        # Engine erst nach der Messung freigeben, damit retained_bytes die Caches enthält
+        del engine
+
+    def for_each_category(self, call):
+        return lambda engine: [call(engine, category_id) for category_id in self.category_ids]
+
+    def for_each_cell(self, call):
+        return lambda engine: [
+            call(engine, category_id, language)
+            for category_id in self.category_ids
+            for language in self.languages
+        ]
+
+    # === EINZELNE BENCHMARKS ===
+
+    def bench_load_languages(self):
+        call = lambda e: e.load_languages()
+        self.record("load_languages", "cold", self.measure_cold(call))
+        self.create_engine(self.cache_dir)
+        self.record("load_languages", "disk_cache", self.measure_cold(call, self.cache_dir))
+        if self.bundle_file:
+            self.record("load_languages", "bundle", self.measure_cold(call, bundle_file=self.bundle_file))
+        # load_languages() lädt immer neu; warm sind die Zugriffe auf bereits geladene Übersetzungen
+        warm_call = lambda e: [e.get_translations(language) for language in self.languages]
+        self.record("load_languages", "warm", self.measure_warm(self.create_engine(self.cache_dir), warm_call))
+        self.measure_memory("load_languages", call)
+
+    def bench_load_category_definition(self):
+        for category_id in self.category_ids:
+            call = lambda e, category_id=category_id: e.load_category_definition(category_id)
+            self.record("load_category_definition", "cold", self.measure_cold(call), category_id)
+            self.create_engine(self.cache_dir).load_category_definition(category_id)
+            self.record("load_category_definition", "disk_cache",
+                        self.measure_cold(call, self.cache_dir), category_id)
+            if self.bundle_file:
+                self.record("load_category_definition", "bundle",
+                            self.measure_cold(call, bundle_file=self.bundle_file), category_id)
+            self.record("load_category_definition", "warm",
+                        self.measure_warm(self.create_engine(), call), category_id)
+        self.measure_memory("load_category_definition", self.for_each_category(
+            lambda e, category_id: e.load_category_definition(category_id)
+        ))
+
+    def bench_get_category_fields(self):
+        for category_id in self.category_ids:
+            for language in self.languages:
+                call = lambda e, c=category_id, l=language: e.get_category_fields(c, l)
+                self.record("get_category_fields", "cold", self.measure_cold(call), category_id, language)
+                self.record("get_category_fields", "warm",
+                            self.measure_warm(self.create_engine(), call), category_id, language)
+        self.measure_memory("get_category_fields", self.for_each_cell(
+            lambda e, category_id, language: e.get_category_fields(category_id, language)
+        ))
+
+    def localize_all_fields(self, engine, category_id, language, saved_values):
+        """Lokalisiert alle (deutsch gespeicherten) Feldwerte einer Kategorie in die Zielsprache."""
+        for field_name, saved_value in saved_values.items():
+            engine.localize_saved_field_value(category_id, field_name, saved_value, language)
+
+    def bench_localize_saved_field_value(self):
+        defaults_engine = self.create_engine()
+        saved_values = {
+            category_id: defaults_engine.get_default_field_values(category_id, "de")
+            for category_id in self.category_ids
+        }
+        for category_id in self.category_ids:
+            for language in self.languages:
+                call = lambda e, c=category_id, l=language: self.localize_all_fields(e, c, l, saved_values[c])
+                self.record("localize_saved_field_value", "cold", self.measure_cold(call), category_id, language)
+                self.record("localize_saved_field_value", "warm",
+                            self.measure_warm(self.create_engine(), call), category_id, language)
+        self.measure_memory("localize_saved_field_value", self.for_each_cell(
+            lambda e, category_id, language: self.localize_all_fields(e, category_id, language, saved_values[category_id])
+        ))
+
+    def get_default_values(self):
+        """Standardwerte pro (Kategorie, Sprache) als Eingabe für die Render-Benchmarks."""
+        engine = self.create_engine()
+        return {
+            (category_id, language): engine.get_default_field_values(category_id, language)
+            for category_id in self.category_ids
+            for language in self.languages
+        }
+
+    def bench_generate_category_prompt_from_json(self):
+        defaults = self.get_default_values()
+        for category_id in self.category_ids:
+            for language in self.languages:
+                values = defaults[(category_id, language)]
+                call = lambda e, c=category_id, l=language, v=values: e.generate_category_prompt_from_json(c, v, l)
+                self.record("generate_category_prompt_from_json", "cold", self.measure_cold(call), category_id, language)
+                self.record("generate_category_prompt_from_json", "warm",
+                            self.measure_warm(self.create_engine(), call), category_id, language)
+        self.measure_memory("generate_category_prompt_from_json", self.for_each_cell(
+            lambda e, category_id, language: e.generate_category_prompt_from_json(
+                category_id, defaults[(category_id, language)], language)
+        ))
+
+    def bench_generator(self, benchmark, category_id):
+        """Misst einen handgeschriebenen Prompt-Generator in allen Sprachen."""
+        if category_id not in self.category_ids:
+            return
+        defaults_engine = self.create_engine()
+        for language in self.languages:
+            values = defaults_engine.get_default_field_values(category_id, language)
+            call = lambda e, l=language, v=values: getattr(e, benchmark)(v, l)
+            self.record(benchmark, "cold", self.measure_cold(call), category_id, language)
+            self.record(benchmark, "warm", self.measure_warm(self.create_engine(), call), category_id, language)
+
+    def bench_generate_sourcecode_prompt(self):
+        self.bench_generator("generate_sourcecode_prompt", "sourcecode")
+
+    def bench_generate_nutrition_prompt(self):
+        self.bench_generator("generate_nutrition_prompt", "nutrition")
+
+    # === AUSFÜHRUNG ===
+
+    def run(self, benchmarks=BENCHMARKS):
+        """Führt die gewählten Benchmarks aus und liefert das Ergebnis als Dict."""
+        self.results = []
+        self.memory = {}
+        self.cache_dir = tempfile.mkdtemp(prefix="prompt_benchmark_")
+        self.bundle_file = os.path.join(self.cache_dir, "resources.bundle")
+        started = time.perf_counter()
+        try:
+            errors, _ = build_bundle(self.bundle_file, self.categories_dir, self.languages_file)
+            if errors:
+                self.bundle_file = None
+            for benchmark in benchmarks:
+                getattr(self, f"bench_{benchmark}")()
+        finally:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self.cache_dir = None
+            self.bundle_file = None
+
+        return {
+            "schema": BENCHMARK_SCHEMA_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "categories": len(self.category_ids),
+            "languages": self.languages,
+            "cold_repeat": self.cold_repeat,
+            "warm_repeat": self.warm_repeat,
+            "duration_s": round(time.perf_counter() - started, 3),
+            "summary": self.build_summary(),
+            "memory": self.memory,
+            "max_rss_kb": get_max_rss_kb(),
+            "results": self.results,
+        }
+
+    def build_summary(self):
+        """Verdichtet die Einzelergebnisse pro Benchmark und Modus (Summe und Maximum der Mediane)."""
+        groups = {}
+        for result in self.results:
+            groups.setdefault(f"{result['benchmark']}/{result['mode']}", []).append(result["median_us"])
+        return {
+            key: {
+                "cells": len(medians),
+                "median_us_total": round(sum(medians), 3),
+                "median_us_max": max(medians),
+            }
+            for key, medians in groups.items()
+        }
+
+
+def get_max_rss_kb():
+    """Maximaler Arbeitsspeicher des Prozesses (nur auf Unix-Systemen verfügbar)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS liefert Bytes, Linux Kilobytes
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def compare_results(current, baseline, threshold=0.2):
+    """Vergleicht Zusammenfassung und Speicher mit einem früheren Lauf; liefert Regressionen als Text."""
+    regressions = []
+    for key, summary in current.get("summary", {}).items():
+        previous = baseline.get("summary", {}).get(key)
+        # Nur Läufe mit derselben Auswahl an Kategorien/Sprachen sind vergleichbar
+        if not previous or not previous.get("median_us_total") or previous.get("cells") != summary["cells"]:
+            continue
+        ratio = summary["median_us_total"] / previous["median_us_total"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{key}: {previous['median_us_total']:.1f}us -> {summary['median_us_total']:.1f}us (x{ratio:.2f})"
+            )
+    for key, memory in current.get("memory", {}).items():
+        previous = baseline.get("memory", {}).get(key)
+        if not previous or not previous.get("peak_bytes"):
+            continue
+        ratio = memory["peak_bytes"] / previous["peak_bytes"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{key} (Speicher): {previous['peak_bytes']} B -> {memory['peak_bytes']} B (x{ratio:.2f})"
+            )
+    return regressions
+
+
+def build_argument_parser():
+    """Erstellt den Argument-Parser für die Benchmark-Suite."""
+    parser = argparse.ArgumentParser(
+        prog="UniversalPromptManager benchmark",
+        description="Misst Lade- und Renderzeiten der PromptEngine und gibt die Ergebnisse als JSON aus.",
+    )
+    parser.add_argument("-o", "--output", default="-", help="Ergebnisdatei (JSON), Standard: stdout")
+    parser.add_argument("-b", "--benchmark", action="append", choices=BENCHMARKS,
+                        help="Nur diesen Benchmark ausführen (mehrfach möglich)")
+    parser.add_argument("--category", action="append", help="Nur diese Kategorie-ID messen (mehrfach möglich)")
+    parser.add_argument("--language", action="append", help="Nur diese Sprache messen (mehrfach möglich)")
+    parser.add_argument("--cold-repeat", type=int, default=3, help="Kalte Messungen pro Zelle")
+    parser.add_argument("--warm-repeat", type=int, default=50, help="Warme Messungen pro Zelle")
+    parser.add_argument("--compare", help="Früheres Ergebnis (JSON), gegen das Regressionen gemeldet werden")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Erlaubte Verschlechterung beim Vergleich, 0.2 = 20%%")
+    parser.add_argument("--categories-dir", default="categories")
+    parser.add_argument("--languages-file", default="upmlanguages.json")
+    return parser
+
+
+def main(argv=None):
+    """Einstiegspunkt der Benchmark-Suite."""
+    args = build_argument_parser().parse_args(argv)
+    benchmark = PromptBenchmark(
+        args.categories_dir, args.languages_file, args.category, args.language,
+        args.cold_repeat, args.warm_repeat,
+    )
+    result = benchmark.run(args.benchmark or BENCHMARKS)
+
+    content = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        sys.stdout.write(content + "\n")
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(content + "\n")
+
+    for key, summary in result["summary"].items():
+        sys.stderr.write(f"{key}: {summary['median_us_total']:.1f}us ({summary['cells']} Zellen)\n")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(result, baseline, args.threshold)
+        for regression in regressions:
+            sys.stderr.write(f"Regression: {regression}\n")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
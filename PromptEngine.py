@@ -0,0 +1,1927 @@
+import json
+import marshal
+import os
+import re
+import string
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from ResourceBundle import ResourceBundle
+from RuntimeMetrics import metrics
+
+
+# Kategorie-Mapping: interner Schlüssel → Übersetzungs-Key
+CATEGORY_KEY_MAP = {
+    "Architektur": "cat_architecture",
+    "Automatisierung / Workflow": "cat_automation",
+    "Bildbeschreibung": "cat_image_desc",
+    "Businessplan": "cat_businessplan",
+    "Technische Probleme": "cat_technical_issues",
+    "Feedback und Vorschlaege": "cat_feedback_suggestions",
+    "Produktinformationen": "cat_product_information",
+    "Bestellungsanfragen": "cat_order_inquiries",
+    "Ruecksendungen und Umtausch": "cat_returns_exchanges",
+    "Zahlungsanfragen": "cat_payment_inquiries",
+    "Lieferungsanfragen": "cat_delivery_inquiries",
+    "Garantie und Reparaturen": "cat_warranty_repairs",
+    "Datenschutz und Sicherheit": "cat_privacy_security",
+    "Karriere und Stellenangebote": "cat_careers_jobs",
+    "Presse und Medienanfragen": "cat_press_media_inquiries",
+    "Partnerschaften und Kooperationen": "cat_partnerships_cooperations",
+    "Veranstaltungen und Webinare": "cat_events_webinars",
+    "Account und Login": "cat_account_login",
+    "Rechnungen und Belege": "cat_invoices_receipts",
+    "Vertragsaenderung und Kuendigung": "cat_contract_changes_cancellation",
+    "Allgemeine/Sonstige Anfragen": "cat_general_inquiries",
+    "Datenanalyse / SQL": "cat_data_analysis",
+    "Dokumentation": "cat_documentation",
+    "E-Mail / Kommunikation": "cat_email",
+    "Eigene Vorlage": "cat_custom",
+    "Ernährungsplan": "cat_nutrition",
+    "KI-Kunst": "cat_ai_art",
+    "Marketing": "cat_marketing",
+    "Präsentationen / Pitch Deck": "cat_presentations",
+    "Produktanforderungen": "cat_specification",
+    "SEO / Blog / Content": "cat_seo_content",
+    "Social Media": "cat_social_media",
+    "Sourcecode": "cat_sourcecode",
+    "UX/UI Konzept": "cat_ux_ui",
+}
+
+# Prompt-Kategorien: interner Schlüssel → Kategorie-ID (Dateiname in categories/)
+CATEGORIES = {
+    "Architektur": "architecture",
+    "Automatisierung / Workflow": "automation",
+    "Bildbeschreibung": "image_description",
+    "Businessplan": "businessplan",
+    "Technische Probleme": "technical_issues",
+    "Feedback und Vorschlaege": "feedback_suggestions",
+    "Produktinformationen": "product_information",
+    "Bestellungsanfragen": "order_inquiries",
+    "Ruecksendungen und Umtausch": "returns_exchanges",
+    "Zahlungsanfragen": "payment_inquiries",
+    "Lieferungsanfragen": "delivery_inquiries",
+    "Garantie und Reparaturen": "warranty_repairs",
+    "Datenschutz und Sicherheit": "privacy_security",
+    "Karriere und Stellenangebote": "careers_jobs",
+    "Presse und Medienanfragen": "press_media_inquiries",
+    "Partnerschaften und Kooperationen": "partnerships_cooperations",
+    "Veranstaltungen und Webinare": "events_webinars",
+    "Account und Login": "account_login",
+    "Rechnungen und Belege": "invoices_receipts",
+    "Vertragsaenderung und Kuendigung": "contract_changes_cancellation",
+    "Allgemeine/Sonstige Anfragen": "general_inquiries",
+    "Datenanalyse / SQL": "data_analysis",
+    "Dokumentation": "documentation",
+    "E-Mail / Kommunikation": "email",
+    "Eigene Vorlage": "custom",
+    "Ernährungsplan": "nutrition",
+    "KI-Kunst": "ai_art",
+    "Marketing": "marketing",
+    "Präsentationen / Pitch Deck": "presentations",
+    "Produktanforderungen": "specification",
+    "SEO / Blog / Content": "seo_content",
+    "Social Media": "social_media",
+    "Sourcecode": "sourcecode",
+    "UX/UI Konzept": "ux_ui",
+}
+
+DEFAULT_LANGUAGES = {
+    "de": {
+        "lang_name": "Deutsch",
+        "app_title": "Universal Prompt Manager",
+        "label_category": "Kategorie:",
+        "label_template": "Vorlage:",
+        "label_language": "Sprache:",
+        "status_ready": "Bereit"
+    }
+}
+
+TRUE_VALUES = {"1", "true", "yes", "ja", "oui", "si", "sí"}
+
+CATEGORY_INDEX_VERSION = 1
+LANGUAGE_INDEX_VERSION = 1
+CATEGORY_CACHE_VERSION = 1
+
+RENDER_CACHE_ENTRIES = 2048
+RENDER_CACHE_BYTES = 16 * 1024 * 1024
+
+_FORMATTER = string.Formatter()
+
+# Laufzeitmetriken; einmalig geholt, damit die heißen Pfade nur Attribute erhöhen
+_CATEGORY_CACHE_HITS = metrics.counter("engine.category_cache.hits")
+_CATEGORY_CACHE_MISSES = metrics.counter("engine.category_cache.misses")
+_CATEGORY_LOADS = {
+    source: metrics.counter(f"engine.category_load.{source}")
+    for source in ("bundle", "disk_cache", "file", "missing")
+}
+_CATEGORY_LOAD_TIME = metrics.histogram("engine.load_category_definition")
+_RENDERS = metrics.counter("engine.render")
+
+# Erlaubte Kategorie-IDs (Dateinamen in categories/); verhindert Pfade wie "../x"
+_CATEGORY_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def is_valid_category_id(category_id):
+    """Prüft, ob eine Kategorie-ID nur aus Buchstaben, Ziffern, _ und - besteht."""
+    return isinstance(category_id, str) and _CATEGORY_ID_PATTERN.fullmatch(category_id) is not None
+
+
+def write_json_atomic(path, data):
+    """Schreibt JSON über eine eindeutige Temp-Datei und os.replace; Leser sehen nie eine halbe Datei."""
+    fd, temp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                     dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def prompt_sort_key(prompt_key):
+    """Sortiert Prompt-Keys nach Präfix und numerischem Suffix (code_2 vor code_10)."""
+    prefix, separator, suffix = prompt_key.rpartition("_")
+    if separator and suffix.isdigit():
+        return (prefix, int(suffix), prompt_key)
+    return (prompt_key, -1, prompt_key)
+
+
+def scan_top_level_object(text):
+    """Zerlegt ein JSON-Objekt in (Schlüssel, Wert, Start, Ende) je Eintrag (Zeichenpositionen)."""
+    decoder = json.JSONDecoder()
+    position = _skip_whitespace(text, 0)
+    if text[position:position + 1] != "{":
+        raise ValueError("JSON-Objekt erwartet")
+    position = _skip_whitespace(text, position + 1)
+    sections = []
+    if text[position:position + 1] == "}":
+        return sections
+    while True:
+        if text[position:position + 1] != '"':
+            raise ValueError(f"Schlüssel erwartet an Position {position}")
+        key, position = json.decoder.scanstring(text, position + 1)
+        position = _skip_whitespace(text, position)
+        if text[position:position + 1] != ":":
+            raise ValueError(f"':' erwartet an Position {position}")
+        start = _skip_whitespace(text, position + 1)
+        value, end = decoder.raw_decode(text, start)
+        sections.append((key, value, start, end))
+        position = _skip_whitespace(text, end)
+        separator = text[position:position + 1]
+        if separator == "}":
+            return sections
+        if separator != ",":
+            raise ValueError(f"',' oder '}}' erwartet an Position {position}")
+        position = _skip_whitespace(text, position + 1)
+
+
+def _skip_whitespace(text, position):
+    while position < len(text) and text[position] in " \t\r\n":
+        position += 1
+    return position
+
+
+def is_visible_line(line):
+    """Leere oder nur aus Leerzeichen bestehende Zeilen erscheinen nicht im Prompt."""
+    return bool(line and line.strip())
+
+
+# === KOMPAKTES KATEGORIE-MODELL ===
+
+# Gemeinsame Sprach-Layouts (Sprachcode → Position) und geteilte Options-Tupel;
+# gleiche Inhalte existieren dadurch nur einmal im Prozess, auch über Kategorien hinweg
+_LANGUAGE_LAYOUTS = {}
+_SHARED_TUPLES = {}
+
+
+def _compact_value(value):
+    """Interniert Strings; andere Werte bleiben unverändert."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _compact_options(value):
+    """Ersetzt eine Optionsliste durch ein geteiltes Tupel internierter Strings."""
+    if not isinstance(value, list):
+        return value
+    items = tuple(_compact_value(item) for item in value)
+    try:
+        return _SHARED_TUPLES.setdefault(items, items)
+    except TypeError:
+        return items
+
+
+class Localized(tuple):
+    """Sprachabhängiger Wert als Tupel (geteiltes Layout Code → Position, Wert, Wert, ...).
+
+    Ersetzt das Dict {"de": ..., "en": ...} der Kategorie-JSON; Reihenfolge und
+    Fallback (Sprache, dann Deutsch, dann erster Eintrag) bleiben erhalten.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_value(cls, value, compact=_compact_value):
+        """Wandelt einen JSON-Wert um; nur nicht-leere Dicts werden zu Localized."""
+        if not isinstance(value, dict):
+            return compact(value)
+        if not value:
+            return ""
+        codes = tuple(value)
+        layout = _LANGUAGE_LAYOUTS.get(codes)
+        if layout is None:
+            layout = _LANGUAGE_LAYOUTS.setdefault(codes, {code: index for index, code in enumerate(codes)})
+        return tuple.__new__(cls, (layout, *(compact(item) for item in value.values())))
+
+    @property
+    def values(self):
+        return self[1:]
+
+    def resolve(self, language):
+        layout = self[0]
+        index = layout.get(language)
+        if index is None:
+            index = layout.get("de", 0)
+        return self[index + 1]
+
+    def get(self, language, default=None):
+        index = self[0].get(language)
+        return default if index is None else self[index + 1]
+
+    def items(self):
+        return zip(self[0], self[1:])
+
+
+class CategoryField:
+    """Ein Feld einer Kategorie; label, default und options sind Localized oder Rohwerte."""
+
+    __slots__ = ("key", "type", "label", "default", "options", "min", "max")
+
+    def __init__(self, field):
+        self.key = sys.intern(field["key"]) if isinstance(field["key"], str) else field["key"]
+        self.type = _compact_value(field.get("type", "entry"))
+        self.label = Localized.from_value(field.get("label", field["key"]))
+        self.default = Localized.from_value(field.get("default", ""))
+        self.options = Localized.from_value(field["options"], _compact_options) if "options" in field else None
+        self.min = field.get("min", 1)
+        self.max = field.get("max", 10)
+
+
+class CategoryDefinition:
+    """Kompakte, unveränderliche Form einer Kategorie-JSON im Speicher-Cache."""
+
+    __slots__ = ("names", "fields", "prompts", "empty")
+
+    def __init__(self, data):
+        self.names = Localized.from_value(data.get("category_name"))
+        raw_fields = data.get("fields", [])
+        self.fields = tuple(
+            CategoryField(field) for field in (raw_fields if isinstance(raw_fields, list) else ())
+            if isinstance(field, dict) and field.get("key")
+        )
+        prompts = data.get("prompts")
+        if "prompts" not in data:
+            self.prompts = None
+        elif isinstance(prompts, dict):
+            self.prompts = tuple((key, Localized.from_value(value)) for key, value in prompts.items())
+        else:
+            self.prompts = ()
+        self.empty = not data
+
+    def __bool__(self):
+        return not self.empty
+
+
+class CompiledPrompt:
+    """Vorab zerlegte Prompt-Zeile: Literal-Abschnitte und Feld-Platzhalter."""
+
+    __slots__ = ("key", "text", "literals", "fields", "simple", "valid", "dependencies")
+
+    def __init__(self, key, text):
+        self.key = key
+        self.text = text
+        self.literals = ()
+        self.fields = ()
+        self.simple = True
+        self.valid = True
+        self.dependencies = frozenset()
+
+        literals = []
+        fields = []
+        pending = ""
+        try:
+            for literal, field_name, format_spec, conversion in _FORMATTER.parse(text):
+                pending += literal
+                if field_name is None:
+                    continue
+                if not field_name.isidentifier() or format_spec or conversion:
+                    # Attribut-/Indexzugriffe und Formatangaben übernimmt str.format
+                    self.simple = False
+                literals.append(pending)
+                fields.append(field_name)
+                pending = ""
+        except ValueError:
+            self.valid = False
+            return
+
+        literals.append(pending)
+        self.literals = tuple(literals)
+        self.fields = tuple(fields)
+        # Feldnamen ohne Attribut-/Indexzugriff, z.B. "style" für {style.name}
+        self.dependencies = frozenset(
+            field_name.split(".", 1)[0].split("[", 1)[0] for field_name in fields
+        )
+
+    def render(self, values):
+        """Setzt die Feldwerte ein; bei fehlenden Feldern bleibt der Rohtext stehen."""
+        if not values or not self.valid:
+            return self.text
+        if not self.fields:
+            return self.literals[0]
+        if not self.simple:
+            try:
+                return self.text.format(**values)
+            except Exception:
+                return self.text
+
+        literals = self.literals
+        parts = [literals[0]]
+        try:
+            for index, field_name in enumerate(self.fields):
+                value = values[field_name]
+                parts.append(value if isinstance(value, str) else format(value))
+                parts.append(literals[index + 1])
+        except Exception:
+            return self.text
+        return "".join(parts)
+
+
+class CompiledCategory:
+    """Alle Prompt-Zeilen einer Kategorie für genau eine Sprache."""
+
+    __slots__ = ("category_id", "language", "prompts", "ordered", "dependencies")
+
+    def __init__(self, category_id, language, prompts):
+        self.category_id = category_id
+        self.language = language
+        self.prompts = prompts
+        self.ordered = tuple(prompts[key] for key in sorted(prompts, key=prompt_sort_key))
+
+        # Feldname → Indizes der Zeilen, die das Feld als Platzhalter verwenden
+        dependencies = {}
+        for index, prompt in enumerate(self.ordered):
+            for field_name in prompt.dependencies:
+                dependencies.setdefault(field_name, []).append(index)
+        self.dependencies = {field_name: tuple(indices) for field_name, indices in dependencies.items()}
+
+    def render_lines(self, field_values):
+        """Rendert alle Zeilen in Sortierreihenfolge, einschließlich leerer Zeilen."""
+        if field_values:
+            return [prompt.render(field_values) for prompt in self.ordered]
+        return [prompt.text for prompt in self.ordered]
+
+    def render(self, field_values):
+        """Rendert alle Zeilen in Sortierreihenfolge und lässt leere Zeilen weg."""
+        return "\n".join(line for line in self.render_lines(field_values) if is_visible_line(line))
+
+    def get_affected_lines(self, field_names):
+        """Liefert die sortierten Indizes aller Zeilen, die von den Feldern abhängen."""
+        indices = set()
+        for field_name in field_names:
+            indices.update(self.dependencies.get(field_name, ()))
+        return sorted(indices)
+
+
+class IncrementalRenderer:
+    """Hält die gerenderten Zeilen einer Kategorie für die Live-Vorschau.
+
+    Nach einer Feldänderung werden nur die Zeilen neu gerendert, deren
+    Platzhalter das Feld verwenden. Kategorien mit eigenem Prompt-Generator
+    werden immer vollständig gerendert.
+    """
+
+    def __init__(self, engine, category_id, language):
+        self.engine = engine
+        self.category_id = category_id
+        self.language = language
+        self.compiled = None
+        if category_id not in engine.prompt_generators:
+            self.compiled = engine.get_compiled_category(category_id, language)
+        self.field_values = {}
+        self.lines = []
+
+    @property
+    def incremental(self):
+        return self.compiled is not None
+
+    def render_all(self, field_values):
+        """Rendert den vollständigen Prompt und merkt sich die einzelnen Zeilen."""
+        self.field_values = dict(field_values)
+        if self.compiled is None:
+            return self.engine.render(self.category_id, self.field_values, self.language)
+        self.lines = self.compiled.render_lines(self.field_values)
+        return "\n".join(line for line in self.lines if is_visible_line(line))
+
+    def update(self, changed_values):
+        """Übernimmt geänderte Feldwerte und rendert nur abhängige Zeilen neu.
+
+        Liefert pro geänderter Zeile (Zeilenposition in der Vorschau, alter Text,
+        neuer Text, sichtbare Zeile davor, sichtbare Zeile danach), in
+        aufsteigender Reihenfolge und bezogen auf den Stand nach den vorherigen
+        Änderungen. Ohne inkrementelles Rendern wird None geliefert.
+        """
+        self.field_values.update(changed_values)
+        if self.compiled is None:
+            return None
+
+        changes = []
+        for index in self.compiled.get_affected_lines(changed_values):
+            old_line = self.lines[index]
+            new_line = self.compiled.ordered[index].render(self.field_values)
+            if new_line == old_line:
+                continue
+            row = sum(line.count("\n") + 1 for line in self.lines[:index] if is_visible_line(line))
+            has_previous = row > 0
+            has_next = any(is_visible_line(line) for line in self.lines[index + 1:])
+            changes.append((row, old_line, new_line, has_previous, has_next))
+            self.lines[index] = new_line
+        return changes
+
+
+class RenderCache:
+    """Begrenzter LRU-Cache für fertig gerenderte Prompts.
+
+    Schlüssel: (Kategorie, Sprache, Definitionsversion, normalisierte Feldwerte).
+    Verdrängt werden die am längsten nicht genutzten Einträge, sobald
+    max_entries oder max_bytes (Größe der Prompt-Strings) überschritten ist.
+    Zugriffe sind per Lock geschützt (mehrfädiger Render-Dienst).
+    """
+
+    def __init__(self, max_entries=RENDER_CACHE_ENTRIES, max_bytes=RENDER_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def normalize_field_values(field_values):
+        """Macht Feldwerte hashbar; der Typ gehört dazu, da True, 1 und "1" verschieden gerendert werden."""
+        if not isinstance(field_values, dict):
+            return None
+        try:
+            # Ohne Sortieren: Aufrufer liefern die Felder in Definitionsreihenfolge;
+            # eine andere Reihenfolge führt nur zu einem zusätzlichen Eintrag
+            normalized = tuple([(name, value.__class__, value) for name, value in field_values.items()])
+            hash(normalized)
+        except TypeError:
+            # Nicht hashbare Werte (z.B. Listen): nicht cachen
+            return None
+        return normalized
+
+    def get(self, key):
+        with self.lock:
+            prompt = self.entries.get(key)
+            if prompt is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return prompt
+
+    def put(self, key, prompt):
+        size = sys.getsizeof(prompt)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= sys.getsizeof(previous)
+            self.entries[key] = prompt
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= sys.getsizeof(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Liefert Zähler und Füllstand als Dict."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class PromptEngine:
+    """Rendert Prompts aus Kategorie-Definitionen und Feldwerten ohne GUI."""
+
+    def __init__(self, categories_dir="categories", languages_file="upmlanguages.json", language="de",
+                 index_file="category_index.json", cache_dir="category_cache",
+                 language_index_file="language_index.json", bundle_file=None,
+                 render_cache_entries=RENDER_CACHE_ENTRIES, render_cache_bytes=RENDER_CACHE_BYTES):
+        self.categories_dir = categories_dir
+        self.languages_file = languages_file
+        self.language = language
+
+        # Fertig gerenderte Prompts (0 Einträge = deaktiviert); die Version einer
+        # Kategorie steigt bei jedem Neuladen, damit alte Ergebnisse nie getroffen werden
+        self.render_cache = RenderCache(render_cache_entries, render_cache_bytes)
+        self.category_versions = {}
+        metrics.register_source("engine.render_cache", self.render_cache.stats)
+
+        # Vorkompiliertes Ressourcen-Bundle (Build); wird beim ersten Zugriff geöffnet.
+        # Ohne Bundle werden die losen JSON-Dateien verwendet.
+        self.bundle_file = bundle_file
+        self.bundle = None
+        self.bundle_checked = False
+
+        # Sprachpakete werden einzeln über einen Byte-Offset-Index geladen; pro Sprache
+        # entsteht eine flache, bereits mit Deutsch zusammengeführte Übersetzungstabelle
+        self.language_index_file = language_index_file
+        self.language_index = None
+        self.language_packs = {}
+        self.translations = {}
+        self.language_names = {}
+        self.load_languages()
+        self.category_cache = {}
+        self.compiled_cache = {}
+        self.value_map_cache = {}
+
+        # Kleiner Index (ID → lokalisierte Namen, mtime, Größe), damit die Kategorieliste
+        # ohne vollständiges Parsen aller Kategorie-Dateien aufgebaut werden kann
+        self.index_file = index_file
+        self.category_index = None
+
+        # Persistenter Binär-Cache geparster Definitionen (None = deaktiviert)
+        self.cache_dir = cache_dir
+
+        # Fallback auf bestehende Methoden, falls externe JSON-Datei fehlt
+        self.category_fallback_fields = {
+            "architecture": self.get_architecture_fields,
+            "image_description": self.get_image_description_fields,
+            "sourcecode": self.get_sourcecode_fields,
+            "ai_art": self.get_ai_art_fields,
+            "marketing": self.get_marketing_fields,
+            "nutrition": self.get_nutrition_fields,
+            "custom": self.get_custom_fields,
+            "specification": self.get_specification_fields,
+            "ux_ui": self.get_ux_ui_fields,
+            "social_media": self.get_social_media_fields,
+            "seo_content": self.get_seo_content_fields,
+            "businessplan": self.get_businessplan_fields,
+            "data_analysis": self.get_data_analysis_fields,
+            "automation": self.get_automation_fields,
+            "email": self.get_email_fields,
+            "presentations": self.get_presentations_fields,
+            "documentation": self.get_documentation_fields,
+        }
+
+        # Handgeschriebene Generatoren; alle übrigen Kategorien werden generisch gerendert
+        self.prompt_generators = {
+            "architecture": self.generate_architecture_prompt,
+            "image_description": self.generate_image_description_prompt,
+            "sourcecode": self.generate_sourcecode_prompt,
+            "ai_art": self.generate_ai_art_prompt,
+            "marketing": self.generate_marketing_prompt,
+            "nutrition": self.generate_nutrition_prompt,
+        }
+
+    def get_resource_bundle(self):
+        """Öffnet das Ressourcen-Bundle einmalig; None, falls keines konfiguriert oder es ungültig ist."""
+        if not self.bundle_checked:
+            self.bundle_checked = True
+            if self.bundle_file and os.path.exists(self.bundle_file):
+                try:
+                    self.bundle = ResourceBundle(self.bundle_file)
+                except (OSError, ValueError):
+                    self.bundle = None
+        return self.bundle
+
+    def load_languages(self):
+        """Lädt den Sprach-Index und die Übersetzungen der aktiven Sprache; liefert Code → Sprachname."""
+        self.language_packs = {}
+        self.translations = {}
+        # Geänderte Übersetzungen betreffen Prompts aller Kategorien
+        self.render_cache.clear()
+        bundle = self.get_resource_bundle()
+        if bundle is not None and bundle.language_names:
+            self.language_names = dict(bundle.language_names)
+            self.get_translations(self.language)
+            return self.language_names
+
+        index = self.load_language_index()
+        if index is None:
+            self.language_packs = dict(DEFAULT_LANGUAGES)
+            self.language_names = {code: pack.get("lang_name", code) for code, pack in DEFAULT_LANGUAGES.items()}
+        else:
+            self.language_names = {code: entry.get("name", code) for code, entry in index["languages"].items()}
+        self.get_translations(self.language)
+        return self.language_names
+
+    def get_languages_file_stat(self):
+        try:
+            return os.stat(self.languages_file)
+        except (OSError, TypeError):
+            return None
+
+    def load_language_index(self):
+        """Liefert den Offset-Index der Sprachdatei; bei fehlendem oder veraltetem Index wird er neu erstellt."""
+        stat = self.get_languages_file_stat()
+        if stat is None:
+            self.language_index = None
+            return None
+
+        index = self.language_index
+        if index is None and self.language_index_file and os.path.exists(self.language_index_file):
+            try:
+                with open(self.language_index_file, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if (isinstance(loaded, dict) and loaded.get("version") == LANGUAGE_INDEX_VERSION
+                        and isinstance(loaded.get("languages"), dict)):
+                    index = loaded
+            except Exception:
+                index = None
+        if index is not None and index.get("mtime") == stat.st_mtime and index.get("size") == stat.st_size:
+            self.language_index = index
+            return index
+
+        self.language_index = self.build_language_index(stat)
+        self.save_language_index()
+        return self.language_index
+
+    def build_language_index(self, stat):
+        """Parst die Sprachdatei einmal vollständig und merkt sich Byte-Offsets je Sprache."""
+        try:
+            with open(self.languages_file, 'rb') as f:
+                data = f.read()
+            text = data.decode('utf-8')
+            sections = scan_top_level_object(text)
+        except (OSError, ValueError):
+            return None
+        if not sections:
+            return None
+
+        languages = {}
+        for code, pack, start, end in sections:
+            if not isinstance(pack, dict):
+                continue
+            byte_start = len(text[:start].encode('utf-8'))
+            byte_length = len(text[start:end].encode('utf-8'))
+            languages[code] = {"offset": byte_start, "length": byte_length, "name": pack.get("lang_name", code)}
+            # Bereits geparst: ohne erneutes Lesen übernehmen
+            self.language_packs[code] = pack
+        if not languages:
+            return None
+        return {"version": LANGUAGE_INDEX_VERSION, "mtime": stat.st_mtime, "size": stat.st_size, "languages": languages}
+
+    def save_language_index(self):
+        """Schreibt den Sprach-Index; Schreibfehler (z.B. read-only) werden ignoriert."""
+        if not self.language_index_file or self.language_index is None:
+            return
+        try:
+            # Batch-Worker und Server-Threads können den Index gleichzeitig schreiben
+            write_json_atomic(self.language_index_file, self.language_index)
+        except OSError:
+            pass
+
+    def load_language_pack(self, language):
+        """Lädt ein einzelnes Sprachpaket über seinen Byte-Offset (mit Cache)."""
+        pack = self.language_packs.get(language)
+        if pack is not None:
+            return pack
+        bundle = self.get_resource_bundle()
+        if bundle is not None and bundle.language_names:
+            pack = bundle.get_language_pack(language) or {}
+            self.language_packs[language] = pack
+            return pack
+
+        index = self.language_index
+        entry = index["languages"].get(language) if index else None
+        if entry is None:
+            return {}
+
+        stat = self.get_languages_file_stat()
+        if stat is None or stat.st_mtime != index.get("mtime") or stat.st_size != index.get("size"):
+            # Datei wurde seit dem Start geändert: Index und alle Tabellen neu aufbauen
+            self.load_languages()
+            return self.language_packs.get(language, {})
+
+        try:
+            with open(self.languages_file, 'rb') as f:
+                f.seek(entry["offset"])
+                pack = json.loads(f.read(entry["length"]).decode('utf-8'))
+        except (OSError, ValueError, KeyError):
+            pack = None
+        if not isinstance(pack, dict):
+            return {}
+        self.language_packs[language] = pack
+        return pack
+
+    def get_translations(self, language=None):
+        """Liefert die flache Übersetzungstabelle einer Sprache (Deutsch bereits als Fallback eingemischt)."""
+        language = language or self.language
+        table = self.translations.get(language)
+        if table is not None:
+            return table
+
+        table = dict(self.load_language_pack("de"))
+        if language != "de" and language in self.language_names:
+            table.update(self.load_language_pack(language))
+        self.translations[language] = table
+        return table
+
+    def tr(self, key, language=None, /, **kwargs) -> str:
+        """Liefert einen übersetzten Text mit Fallback auf Deutsch."""
+        table = self.translations.get(language or self.language)
+        if table is None:
+            table = self.get_translations(language)
+        raw_text = table.get(key, key)
+        text = raw_text if isinstance(raw_text, str) else str(raw_text)
+        if kwargs:
+            try:
+                return text.format(**kwargs)
+            except Exception:
+                return text
+        return text
+
+    def resolve_localized_value(self, value, language=None):
+        """Liefert einen sprachabhängigen Wert mit Fallback auf Deutsch."""
+        if value.__class__ is Localized:
+            return value.resolve(language or self.language)
+        if not isinstance(value, dict):
+            return value
+
+        language = language or self.language
+        if language in value:
+            return value[language]
+        if "de" in value:
+            return value["de"]
+        if value:
+            return next(iter(value.values()))
+        return ""
+
+    def get_category_candidate_paths(self, category_id):
+        """Liefert die möglichen Pfade einer Kategorie-Datei in Suchreihenfolge."""
+        return [
+            os.path.join(self.categories_dir, f"{category_id}.json"),
+            os.path.join("UniversalPromptManager", self.categories_dir, f"{category_id}.json"),
+        ]
+
+    def has_category_file(self, category_id):
+        """Prüft, ob eine lose Kategorie-Datei existiert (sie hat Vorrang vor dem Bundle)."""
+        return any(os.path.exists(path) for path in self.get_category_candidate_paths(category_id))
+
+    def is_bundled_category(self, category_id):
+        """True, wenn die Kategorie aus dem Bundle kommt, weil keine lose Datei sie überschreibt."""
+        bundle = self.get_resource_bundle()
+        return bundle is not None and category_id in bundle.categories and not self.has_category_file(category_id)
+
+    def read_category_file(self, category_id):
+        """Liest eine Kategorie-JSON ohne Cache; liefert (Pfad, Daten) oder (None, None)."""
+        for path in self.get_category_candidate_paths(category_id):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return path, data
+            except Exception:
+                continue
+        return None, None
+
+    def load_category_definition(self, category_id):
+        """Lädt eine Kategorie-Definition (mit Speicher- und Datei-Cache); liefert eine CategoryDefinition oder None."""
+        if category_id in self.category_cache:
+            _CATEGORY_CACHE_HITS.value += 1
+            return self.category_cache[category_id]
+        if not is_valid_category_id(category_id):
+            return None
+
+        _CATEGORY_CACHE_MISSES.value += 1
+        started = time.perf_counter()
+        source = "bundle"
+        data = None
+        if self.is_bundled_category(category_id):
+            data = self.get_resource_bundle().get_category(category_id)
+        if data is None:
+            source = "disk_cache"
+            data = self.load_cached_category(category_id)
+        if data is None:
+            source = "file"
+            path, data = self.read_category_file(category_id)
+            if data is not None:
+                self.store_cached_category(category_id, path, data)
+        if data is None:
+            _CATEGORY_LOADS["missing"].value += 1
+            return None
+        definition = CategoryDefinition(data)
+        self.category_cache[category_id] = definition
+        _CATEGORY_LOADS[source].value += 1
+        _CATEGORY_LOAD_TIME.observe(time.perf_counter() - started)
+        return definition
+
+    def get_category_cache_path(self, category_id):
+        """Pfad der Binär-Cache-Datei einer Kategorie."""
+        return os.path.join(self.cache_dir, f"{category_id}.marshal")
+
+    def load_cached_category(self, category_id):
+        """Liest eine Definition aus dem Binär-Cache, falls Pfad, mtime und Größe passen."""
+        if not self.cache_dir:
+            return None
+
+        for path in self.get_category_candidate_paths(category_id):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            try:
+                with open(self.get_category_cache_path(category_id), 'rb') as f:
+                    version, cached_path, mtime_ns, size, data = marshal.loads(f.read())
+            except Exception:
+                return None
+            if (version, cached_path, mtime_ns, size) != (CATEGORY_CACHE_VERSION, path, stat.st_mtime_ns, stat.st_size):
+                return None
+            return data if isinstance(data, dict) else None
+        return None
+
+    def store_cached_category(self, category_id, path, data):
+        """Schreibt eine geparste Definition atomar in den Binär-Cache."""
+        if not self.cache_dir:
+            return
+        cache_path = self.get_category_cache_path(category_id)
+        temp_path = None
+        try:
+            stat = os.stat(path)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Eindeutiger Temp-Name je Aufruf: Threads und Worker-Prozesse schreiben ggf. gleichzeitig
+            fd, temp_path = tempfile.mkstemp(prefix=f"{category_id}.", suffix=".tmp", dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(marshal.dumps((CATEGORY_CACHE_VERSION, path, stat.st_mtime_ns, stat.st_size, data)))
+            os.replace(temp_path, cache_path)
+        except (OSError, ValueError):
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def load_category_index(self):
+        """Lädt den Kategorie-Index aus der Index-Datei (leer bei Fehler oder anderer Version)."""
+        if self.category_index is not None:
+            return self.category_index
+
+        self.category_index = {}
+        if self.index_file and os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict) and loaded.get("version") == CATEGORY_INDEX_VERSION:
+                    entries = loaded.get("categories", {})
+                    if isinstance(entries, dict):
+                        self.category_index = entries
+            except Exception:
+                pass
+        return self.category_index
+
+    def save_category_index(self):
+        """Schreibt den Kategorie-Index; Schreibfehler (z.B. read-only) werden ignoriert."""
+        if not self.index_file or self.category_index is None:
+            return
+        data = {"version": CATEGORY_INDEX_VERSION, "categories": self.category_index}
+        try:
+            write_json_atomic(self.index_file, data)
+        except OSError:
+            pass
+
+    def is_index_entry_current(self, entry):
+        """Prüft per stat, ob ein Index-Eintrag noch zur Datei passt."""
+        if not isinstance(entry, dict):
+            return False
+        try:
+            stat = os.stat(entry.get("path", ""))
+        except (OSError, TypeError):
+            return False
+        return stat.st_mtime == entry.get("mtime") and stat.st_size == entry.get("size")
+
+    def index_category(self, category_id):
+        """Erzeugt den Index-Eintrag einer Kategorie; parst die Datei ohne sie zu cachen."""
+        path, data = self.read_category_file(category_id)
+        if data is None:
+            return None
+        return self.build_index_entry(path, data)
+
+    def build_index_entry(self, path, data):
+        """Erzeugt den Index-Eintrag aus Pfad und bereits geparsten Daten einer Kategorie-Datei."""
+        names = data.get("category_name")
+        if not isinstance(names, dict):
+            names = {"de": names} if isinstance(names, str) else {}
+        stat = os.stat(path)
+        return {"path": path, "mtime": stat.st_mtime, "size": stat.st_size, "names": names}
+
+    def refresh_category_index(self, category_ids):
+        """Aktualisiert veraltete oder fehlende Index-Einträge und speichert bei Änderungen."""
+        if self.get_resource_bundle() is not None:
+            # Namen stehen im Bundle-Index; nur Kategorien mit loser Datei indizieren
+            category_ids = [category_id for category_id in category_ids if not self.is_bundled_category(category_id)]
+            if not category_ids:
+                return {}
+        index = self.load_category_index()
+        changed = False
+        for category_id in category_ids:
+            if self.is_index_entry_current(index.get(category_id)):
+                continue
+            entry = self.index_category(category_id)
+            if entry is None:
+                changed = index.pop(category_id, None) is not None or changed
+                continue
+            index[category_id] = entry
+            changed = True
+        if changed:
+            self.save_category_index()
+        return index
+
+    def invalidate_category(self, category_id):
+        """Verwirft gecachte Definition und kompilierte Prompts einer Kategorie."""
+        self.category_cache.pop(category_id, None)
+        self.category_versions[category_id] = self.category_versions.get(category_id, 0) + 1
+        for cache in (self.compiled_cache, self.value_map_cache):
+            for cache_key in [key for key in cache if key[0] == category_id]:
+                cache.pop(cache_key, None)
+
+    def reload_category(self, category_id, language=None):
+        """Lädt eine geänderte Kategorie neu, aktualisiert den Index und kompiliert sie vor."""
+        self.invalidate_category(category_id)
+        if self.category_index is not None:
+            self.refresh_category_index([category_id])
+        return self.get_compiled_category(category_id, language)
+
+    def read_category_definition(self, category_id):
+        """Liest und parst eine Kategorie-Datei, ohne die Caches der Engine zu verändern.
+
+        Darf in einem Worker-Thread laufen; liefert (CategoryDefinition, Index-Eintrag)
+        oder (None, None). Übernommen wird das Ergebnis mit install_category() in dem
+        Thread, der die Engine benutzt.
+        """
+        path, data = self.read_category_file(category_id)
+        if data is None:
+            return None, None
+        self.store_cached_category(category_id, path, data)
+        return CategoryDefinition(data), self.build_index_entry(path, data)
+
+    def install_category(self, category_id, definition, index_entry=None, language=None):
+        """Ersetzt eine Kategorie durch eine mit read_category_definition() gelesene und kompiliert sie vor."""
+        self.invalidate_category(category_id)
+        if definition is not None:
+            self.category_cache[category_id] = definition
+        if self.category_index is not None:
+            if index_entry is not None:
+                self.category_index[category_id] = index_entry
+            else:
+                self.category_index.pop(category_id, None)
+            self.save_category_index()
+        return self.get_compiled_category(category_id, language)
+
+    def get_category_display_name(self, category_id, language=None):
+        """Liefert den lokalisierten Kategorienamen (aus Index oder Kategorie-JSON) oder None."""
+        if self.is_bundled_category(category_id):
+            names = self.get_resource_bundle().get_category_names(category_id)
+        else:
+            entry = self.load_category_index().get(category_id)
+            if isinstance(entry, dict):
+                names = entry.get("names")
+            else:
+                definition = self.load_category_definition(category_id)
+                names = definition.names if definition is not None else None
+
+        category_name = self.resolve_localized_value(names, language)
+        if isinstance(category_name, str) and category_name.strip():
+            return category_name
+        return None
+
+    def get_category_fields(self, category_id, language=None):
+        """Ermittelt Felder aus externer Kategorie-JSON, sonst Fallback-Methode."""
+        definition = self.load_category_definition(category_id)
+        if not definition:
+            fallback = self.category_fallback_fields.get(category_id)
+            return fallback() if fallback else {}
+
+        fields = {}
+        for field in definition.fields:
+            field_type = field.type
+            field_config = {
+                "type": field_type,
+                "label_text": str(self.resolve_localized_value(field.label, language)),
+                "default": self.resolve_localized_value(field.default, language),
+            }
+
+            if field_type == "combobox":
+                options = self.resolve_localized_value(field.options, language)
+                field_config["options"] = list(options) if isinstance(options, tuple) else []
+
+            if field_type == "spinbox":
+                field_config["min"] = field.min
+                field_config["max"] = field.max
+
+            fields[field.key] = field_config
+
+        return fields
+
+    def get_default_field_values(self, category_id, language=None):
+        """Liefert die Standardwerte aller Felder einer Kategorie."""
+        return {
+            field_name: field_config.get("default", "")
+            for field_name, field_config in self.get_category_fields(category_id, language).items()
+        }
+
+    def build_localized_option_mapping(self, options, language=None):
+        """Erzeugt ein Mapping lokalisierter Optionswerte auf den Wert der Zielsprache."""
+        if options.__class__ is not Localized:
+            return {}
+
+        current_options = options.get(language or self.language)
+        if not isinstance(current_options, tuple):
+            current_options = options.get("de")
+        if not isinstance(current_options, tuple):
+            for values in options.values:
+                if isinstance(values, tuple):
+                    current_options = values
+                    break
+        if not isinstance(current_options, tuple):
+            return {}
+
+        mapping = {}
+        for values in options.values:
+            if not isinstance(values, tuple):
+                continue
+            for index, option_value in enumerate(values):
+                if index < len(current_options):
+                    mapping[option_value] = current_options[index]
+        return mapping
+
+    def build_localized_scalar_mapping(self, value, language=None):
+        """Erzeugt ein Mapping lokalisierter Einzelwerte auf den Wert der Zielsprache."""
+        if value.__class__ is not Localized:
+            return {}
+
+        target_value = self.resolve_localized_value(value, language)
+        return {
+            localized_value: target_value
+            for localized_value in value.values
+            if isinstance(localized_value, str)
+        }
+
+    def get_field_value_maps(self, category_id, language=None):
+        """Liefert pro Feld ein Mapping gespeicherter Werte (jede Sprache) auf die Zielsprache (mit Cache)."""
+        language = language or self.language
+        cache_key = (category_id, language)
+        value_maps = self.value_map_cache.get(cache_key)
+        if value_maps is not None:
+            return value_maps
+
+        value_maps = {}
+        definition = self.load_category_definition(category_id)
+        if definition is not None:
+            for field in definition.fields:
+                if field.key in value_maps:
+                    continue
+                # Optionen haben Vorrang vor lokalisierten Defaultwerten
+                mapping = self.build_localized_scalar_mapping(field.default, language)
+                mapping.update(self.build_localized_option_mapping(field.options, language))
+                value_maps[field.key] = mapping
+
+        self.value_map_cache[cache_key] = value_maps
+        return value_maps
+
+    def localize_saved_field_value(self, category_id, field_name, saved_value, language=None):
+        """Überführt gespeicherte lokalisierte Auswahl-/Defaultwerte in die Zielsprache."""
+        if not isinstance(saved_value, str) or not saved_value:
+            return saved_value
+
+        mapping = self.get_field_value_maps(category_id, language).get(field_name)
+        if not mapping:
+            return saved_value
+        return mapping.get(saved_value, saved_value)
+
+    def get_compiled_category(self, category_id, language=None):
+        """Liefert die kompilierten Prompt-Zeilen einer Kategorie für eine Sprache (mit Cache)."""
+        language = language or self.language
+        cache_key = (category_id, language)
+        compiled = self.compiled_cache.get(cache_key)
+        if compiled is not None:
+            return compiled
+
+        definition = self.load_category_definition(category_id)
+        if definition is None or definition.prompts is None:
+            return None
+
+        compiled_prompts = {}
+        for prompt_key, prompt_value in definition.prompts:
+            text = self.resolve_localized_value(prompt_value, language)
+            text_str = text if isinstance(text, str) else str(text)
+            compiled_prompts[prompt_key] = CompiledPrompt(prompt_key, text_str)
+
+        compiled = CompiledCategory(category_id, language, compiled_prompts)
+        self.compiled_cache[cache_key] = compiled
+        return compiled
+
+    def get_category_prompt_text(self, category_id, prompt_key, fallback_key, language=None, /, **kwargs):
+        """Liest Prompt-Text aus Kategorie-JSON mit Fallback auf Sprachdatei."""
+        compiled = self.get_compiled_category(category_id, language)
+        if compiled is not None:
+            prompt = compiled.prompts.get(prompt_key)
+            if prompt is not None:
+                return prompt.render(kwargs)
+
+        text_str = self.tr(fallback_key, language)
+        if kwargs:
+            try:
+                return text_str.format(**kwargs)
+            except Exception:
+                return text_str
+        return text_str
+
+    def get_field_value(self, field_values, field_name):
+        """Holt den Wert eines Feldes als Text ("" wenn nicht vorhanden)."""
+        value = field_values.get(field_name)
+        if value is None:
+            return ""
+        return value if isinstance(value, str) else str(value)
+
+    def is_checked(self, value):
+        """Wertet einen Checkbox-Wert (bool, 0/1 oder lokalisierter Text) aus."""
+        if isinstance(value, str):
+            return value.strip().lower() in TRUE_VALUES
+        return bool(value)
+
+    def render(self, category_id, field_values, language=None):
+        """Rendert den Prompt einer Kategorie aus einem Feldwerte-Dict (mit LRU-Cache)."""
+        _RENDERS.value += 1
+        cache = self.render_cache
+        normalized = cache.normalize_field_values(field_values) if cache.enabled else None
+        if normalized is None:
+            return self.render_uncached(category_id, field_values, language)
+
+        cache_key = (category_id, language or self.language, self.category_versions.get(category_id, 0), normalized)
+        prompt = cache.get(cache_key)
+        if prompt is None:
+            prompt = self.render_uncached(category_id, field_values, language)
+            cache.put(cache_key, prompt)
+        return prompt
+
+    def render_uncached(self, category_id, field_values, language=None):
+        """Rendert den Prompt einer Kategorie ohne den Ergebnis-Cache."""
+        generator = self.prompt_generators.get(category_id)
+        if generator:
+            return generator(field_values, language)
+        return self.generate_category_prompt_from_json(category_id, field_values, language)
+
+    def generate_category_prompt_from_json(self, category_id, field_values, language=None):
+        """Generiert Prompt generisch aus JSON-Definition für alle neuen Kategorien"""
+        compiled = self.get_compiled_category(category_id, language)
+        if compiled is None:
+            return ""
+        return compiled.render(field_values)
+
+    # === KATEGORIE-DEFINITIONEN ===
+    
+    def get_architecture_fields(self):
+        """Felder für Architektur-Prompts"""
+        return {
+            "style": {
+                "label": "field_arch_style",
+                "type": "combobox",
+                "options": ["modern", "klassisch", "minimalistisch", "rustikal", "industriell", "viktorianisch"],
+                "default": "modern"
+            },
+            "material": {
+                "label": "field_arch_material",
+                "type": "combobox",
+                "options": ["Putz", "Holz", "Backstein", "Stein", "Metall", "Glas"],
+                "default": "Putz"
+            },
+            "color": {
+                "label": "field_arch_color",
+                "type": "entry",
+                "default": "weiß"
+            },
+            "lighting": {
+                "label": "field_arch_lighting",
+                "type": "combobox",
+                "options": ["Tageslicht", "Abendlicht", "Morgenlicht", "dramatisch", "Studio", "Nacht"],
+                "default": "Tageslicht"
+            },
+            "details": {
+                "label": "field_arch_details",
+                "type": "text",
+                "default": "Vordach, Hausnummer, Briefkasten, Fensterläden"
+            },
+            "quality": {
+                "label": "field_arch_quality",
+                "type": "combobox",
+                "options": ["4K fotorealistisch", "8K ultra-realistisch", "Skizzen-Stil", "Aquarell", "Low-Poly"],
+                "default": "4K fotorealistisch"
+            }
+        }
+    
+    def get_image_description_fields(self):
+        """Felder für Bildbeschreibungen"""
+        return {
+            "subject": {
+                "label": "field_img_subject",
+                "type": "entry",
+                "default": "Hausfassade"
+            },
+            "style": {
+                "label": "field_img_style",
+                "type": "combobox",
+                "options": ["Portrait", "Landschaft", "Architektur", "Street", "Makro", "Produkt"],
+                "default": "Architektur"
+            },
+            "composition": {
+                "label": "field_img_composition",
+                "type": "combobox",
+                "options": ["Rule of Thirds", "Symmetrisch", "Zentral", "Diagonale", "Führende Linien"],
+                "default": "Rule of Thirds"
+            },
+            "lighting": {
+                "label": "field_img_lighting",
+                "type": "combobox",
+                "options": ["Weiches Licht", "Hartes Licht", "Goldene Stunde", "Blaue Stunde", "Dramatisch"],
+                "default": "Goldene Stunde"
+            },
+            "camera": {
+                "label": "field_img_camera",
+                "type": "combobox",
+                "options": ["Weitwinkel", "Teleobjektiv", "Makro", "Fisheye", "50mm Prime"],
+                "default": "Weitwinkel"
+            },
+            "mood": {
+                "label": "field_img_mood",
+                "type": "text",
+                "default": "Friedlich, einladend, modern"
+            },
+            "details": {
+                "label": "field_img_details",
+                "type": "text",
+                "default": "Texturen sichtbar, natürliche Schatten, realistische Farben"
+            }
+        }
+    
+    def get_sourcecode_fields(self):
+        """Felder für Sourcecode-Prompts"""
+        return {
+            "language": {
+                "label": "field_code_language",
+                "type": "combobox",
+                "options": [
+                    "Bash", "C", "C#", "C++", "CSS", "Dart", "Go", "HTML",
+                    "Java", "JavaScript", "Kotlin", "MATLAB", "PHP", "Python",
+                    "R", "Ruby", "Rust", "SQL", "Swift", "TypeScript"
+                ],
+                "default": "Python"
+            },
+            "task": {
+                "label": "field_code_task",
+                "type": "text",
+                "default": "Eine Funktion zum Sortieren von Listen"
+            },
+            "requirements": {
+                "label": "field_code_requirements",
+                "type": "text",
+                "default": "Effizient, gut lesbar, mit Fehlerbehandlung"
+            },
+            "framework": {
+                "label": "field_code_framework",
+                "type": "combobox",
+                "options": [
+                    "Kein spezielles Framework", "Standard Library",
+                    "Tkinter", "ttkbootstrap", "Tkinter + ttkbootstrap", "PySide6", "CustomTkinter",
+                    "Django", "Flask", "FastAPI",
+                    "React", "Vue", "Angular", "Next.js", "Nuxt",
+                    "Node.js", "Express", "NestJS",
+                    "Laravel", "Symfony", "CodeIgniter", "WordPress",
+                    "Spring Boot", "ASP.NET Core", "Ruby on Rails"
+                ],
+                "default": "Kein spezielles Framework"
+            },
+            "target_platform": {
+                "label": "field_code_target_platform",
+                "type": "combobox",
+                "options": ["Desktop", "Web", "Mobile", "CLI", "Backend/API", "Embedded"],
+                "default": "Desktop"
+            },
+            "output_structure": {
+                "label": "field_code_output_structure",
+                "type": "combobox",
+                "options": ["Single File", "Multi-File", "Clean Architecture", "Hexagonal"],
+                "default": "Multi-File"
+            },
+            "runtime_version": {
+                "label": "field_code_runtime_version",
+                "type": "entry",
+                "default": "Aktuelle stabile Version"
+            },
+            "package_manager": {
+                "label": "field_code_package_manager",
+                "type": "combobox",
+                "options": ["Keiner", "pip", "poetry", "npm", "pnpm", "yarn", "composer", "cargo", "maven", "gradle"],
+                "default": "Keiner"
+            },
+            "database": {
+                "label": "field_code_database",
+                "type": "combobox",
+                "options": ["Keine", "SQLite", "PostgreSQL", "MySQL", "MariaDB", "MongoDB", "Redis"],
+                "default": "Keine"
+            },
+            "api_style": {
+                "label": "field_code_api_style",
+                "type": "combobox",
+                "options": ["Keine API", "REST", "GraphQL", "gRPC", "WebSocket"],
+                "default": "Keine API"
+            },
+            "ui_framework": {
+                "label": "field_code_ui_framework",
+                "type": "combobox",
+                "options": ["Keine UI", "Tkinter", "ttkbootstrap", "Tkinter + ttkbootstrap", "PySide6", "CustomTkinter"],
+                "default": "Tkinter + ttkbootstrap"
+            },
+            "complexity": {
+                "label": "field_code_complexity",
+                "type": "combobox",
+                "options": ["Einfach", "Mittel", "Komplex", "Produktions-ready"],
+                "default": "Mittel"
+            },
+            "style": {
+                "label": "field_code_style",
+                "type": "combobox",
+                "options": ["Funktional", "OOP", "Prozedural", "Deklarativ"],
+                "default": "Funktional"
+            },
+            "security_level": {
+                "label": "field_code_security_level",
+                "type": "combobox",
+                "options": ["Basis", "Standard", "Hoch", "OWASP-orientiert"],
+                "default": "Standard"
+            },
+            "multilang": {
+                "label": "field_code_multilang",
+                "type": "combobox",
+                "options": ["Nein", "Ja"],
+                "default": "Nein"
+            },
+            "target_languages": {
+                "label": "field_code_target_languages",
+                "type": "combobox",
+                "options": [
+                    "Deutsch",
+                    "Englisch",
+                    "Deutsch + Englisch",
+                    "Englisch + Deutsch + Französisch + Spanisch"
+                ],
+                "default": "Englisch + Deutsch + Französisch + Spanisch"
+            },
+            "test_depth": {
+                "label": "field_code_test_depth",
+                "type": "combobox",
+                "options": ["Keine", "Unit", "Unit + Integration", "Unit + Integration + E2E"],
+                "default": "Unit + Integration"
+            },
+            "documentation_level": {
+                "label": "field_code_documentation_level",
+                "type": "combobox",
+                "options": ["Minimal", "Standard", "Ausführlich", "Ausführlich + README + Beispiele"],
+                "default": "Standard"
+            },
+            "deployment_target": {
+                "label": "field_code_deployment_target",
+                "type": "combobox",
+                "options": ["Lokal", "Docker", "VPS", "Shared Hosting", "Serverless", "WordPress Plugin ZIP"],
+                "default": "Lokal"
+            },
+            "comments": {
+                "label": "field_code_comments",
+                "type": "checkbox",
+                "default": True
+            },
+            "tests": {
+                "label": "field_code_tests",
+                "type": "checkbox",
+                "default": True
+            }
+        }
+    
+    def get_ai_art_fields(self):
+        """Felder für KI-Kunst-Prompts"""
+        return {
+            "subject": {
+                "label": "field_art_subject",
+                "type": "text",
+                "default": "Futuristisches Haus in einer Naturlandschaft"
+            },
+            "style": {
+                "label": "field_art_style",
+                "type": "combobox",
+                "options": ["Fotorealistisch", "Ölmalerei", "Aquarell", "Pixel Art", "Cyberpunk", "Steampunk"],
+                "default": "Fotorealistisch"
+            },
+            "artist": {
+                "label": "field_art_artist",
+                "type": "entry",
+                "default": ""
+            },
+            "colors": {
+                "label": "field_art_colors",
+                "type": "text",
+                "default": "Erdtöne mit akzentuierenden Blautönen"
+            },
+            "composition": {
+                "label": "field_art_composition",
+                "type": "combobox",
+                "options": ["Epische Weitwinkel", "Nahaufnahme", "Vogelperspektive", "Froschperspektive"],
+                "default": "Epische Weitwinkel"
+            },
+            "details": {
+                "label": "field_art_details",
+                "type": "combobox",
+                "options": ["Hochdetailliert", "Mitteldetailliert", "Stilisiert", "Minimalistisch"],
+                "default": "Hochdetailliert"
+            },
+            "parameters": {
+                "label": "field_art_parameters",
+                "type": "text",
+                "default": "--ar 16:9 --v 6.0 --style raw"
+            }
+        }
+    
+    def get_marketing_fields(self):
+        """Felder für Marketing-Prompts"""
+        return {
+            "product": {
+                "label": "field_mkt_product",
+                "type": "entry",
+                "default": "Architektur-Software"
+            },
+            "audience": {
+                "label": "field_mkt_audience",
+                "type": "entry",
+                "default": "Architekten und Bauherren"
+            },
+            "goal": {
+                "label": "field_mkt_goal",
+                "type": "combobox",
+                "options": ["Verkauf", "Lead-Generierung", "Brand Awareness", "Education"],
+                "default": "Verkauf"
+            },
+            "tone": {
+                "label": "field_mkt_tone",
+                "type": "combobox",
+                "options": ["Professionell", "Freundlich", "Überzeugend", "Dringlich", "Inspirierend"],
+                "default": "Professionell"
+            },
+            "platform": {
+                "label": "field_mkt_platform",
+                "type": "combobox",
+                "options": ["Website", "Social Media", "E-Mail", "Werbung", "Blog"],
+                "default": "Website"
+            },
+            "keywords": {
+                "label": "field_mkt_keywords",
+                "type": "text",
+                "default": "modern, effizient, benutzerfreundlich, innovativ"
+            },
+            "cta": {
+                "label": "field_mkt_cta",
+                "type": "entry",
+                "default": "Jetzt kostenlos testen!"
+            }
+        }
+    
+    def get_nutrition_fields(self):
+        """Felder für Ernährungsplan-Prompts"""
+        return {
+            "days": {
+                "label": "field_nut_days",
+                "type": "spinbox",
+                "default": 7,
+                "min": 1,
+                "max": 31
+            },
+            "age": {
+                "label": "field_nut_age",
+                "type": "spinbox",
+                "default": 62,
+                "min": 18,
+                "max": 99
+            },
+            "weight": {
+                "label": "field_nut_weight",
+                "type": "spinbox",
+                "default": 110,
+                "min": 40,
+                "max": 250
+            },
+            "gender": {
+                "label": "field_nut_gender",
+                "type": "combobox",
+                "options": ["männlich", "weiblich", "divers"],
+                "default": "männlich"
+            },
+            "goal": {
+                "label": "field_nut_goal",
+                "type": "combobox",
+                "options": ["Ausgewogen & gesund", "Gewichtsreduktion", "Muskelaufbau", "Gesundheitserhalt"],
+                "default": "Gewichtsreduktion"
+            },
+            "taste": {
+                "label": "field_nut_taste",
+                "type": "combobox",
+                "options": ["Abwechslungsreich", "Mediterran", "Vegetarisch", "Fleischbetont", "Asiatisch"],
+                "default": "Abwechslungsreich"
+            },
+            "appliances": {
+                "label": "field_nut_appliances",
+                "type": "text",
+                "default": "Heißluftfritteuse, Mikrowelle, Umluftherd"
+            },
+            "meal_prep": {
+                "label": "field_nut_meal_prep",
+                "type": "checkbox",
+                "default": True
+            },
+            "storage": {
+                "label": "field_nut_storage",
+                "type": "text",
+                "default": "ungekühlt, Kühlschrank, Gefriertruhe"
+            },
+            "show_calories": {
+                "label": "field_nut_show_calories",
+                "type": "checkbox",
+                "default": True
+            },
+            "show_tips": {
+                "label": "field_nut_show_tips",
+                "type": "checkbox",
+                "default": True
+            },
+            "show_portions": {
+                "label": "field_nut_show_portions",
+                "type": "checkbox",
+                "default": True
+            }
+        }
+
+    def get_custom_fields(self):
+        """Felder für benutzerdefinierte Vorlagen"""
+        return {
+            "custom_prompt": {
+                "label": "field_custom_prompt",
+                "type": "text",
+                "default": "Geben Sie hier Ihren Prompt ein..."
+            }
+        }
+
+    def get_specification_fields(self):
+        """Felder für Produktanforderungen (Fallback)"""
+        return {}
+
+    def get_ux_ui_fields(self):
+        """Felder für UX/UI Konzept (Fallback)"""
+        return {}
+
+    def get_social_media_fields(self):
+        """Felder für Social Media (Fallback)"""
+        return {}
+
+    def get_seo_content_fields(self):
+        """Felder für SEO/Blog/Content (Fallback)"""
+        return {}
+
+    def get_businessplan_fields(self):
+        """Felder für Businessplan (Fallback)"""
+        return {}
+
+    def get_data_analysis_fields(self):
+        """Felder für Datenanalyse/SQL (Fallback)"""
+        return {}
+
+    def get_automation_fields(self):
+        """Felder für Automatisierung/Workflow (Fallback)"""
+        return {}
+
+    def get_email_fields(self):
+        """Felder für E-Mail/Kommunikation (Fallback)"""
+        return {}
+
+    def get_presentations_fields(self):
+        """Felder für Präsentationen/Pitch Deck (Fallback)"""
+        return {}
+
+    def get_documentation_fields(self):
+        """Felder für Dokumentation (Fallback)"""
+        return {}
+
+    # === PROMPT-GENERATOREN ===
+
+    def generate_architecture_prompt(self, field_values, language=None):
+        """Generiert Architektur-Prompt"""
+        style = self.get_field_value(field_values, "style")
+        material = self.get_field_value(field_values, "material")
+        color = self.get_field_value(field_values, "color")
+        lighting = self.get_field_value(field_values, "lighting")
+        details = self.get_field_value(field_values, "details")
+        quality = self.get_field_value(field_values, "quality")
+        building_type = self.get_field_value(field_values, "building_type")
+        environment_context = self.get_field_value(field_values, "environment_context")
+        camera_perspective = self.get_field_value(field_values, "camera_perspective")
+        landscaping = self.get_field_value(field_values, "landscaping")
+
+        lines = [
+            self.get_category_prompt_text("architecture", "arch_1", "prompt_arch_1", language, quality=quality),
+            self.get_category_prompt_text("architecture", "arch_2", "prompt_arch_2", language, style=style),
+            self.get_category_prompt_text("architecture", "arch_3", "prompt_arch_3", language, material=material, color=color),
+            self.get_category_prompt_text("architecture", "arch_4", "prompt_arch_4", language, lighting=lighting),
+            self.get_category_prompt_text("architecture", "arch_5", "prompt_arch_5", language, details=details),
+            self.get_category_prompt_text("architecture", "arch_6", "prompt_arch_6", language),
+            self.get_category_prompt_text("architecture", "arch_7", "prompt_arch_7", language),
+            self.get_category_prompt_text("architecture", "arch_8", "prompt_arch_8", language, building_type=building_type),
+            self.get_category_prompt_text("architecture", "arch_9", "prompt_arch_9", language, environment_context=environment_context),
+            self.get_category_prompt_text("architecture", "arch_10", "prompt_arch_10", language, camera_perspective=camera_perspective),
+            self.get_category_prompt_text("architecture", "arch_11", "prompt_arch_11", language, landscaping=landscaping),
+        ]
+        return "\n".join(lines)
+
+    def generate_image_description_prompt(self, field_values, language=None):
+        """Generiert Bildbeschreibungs-Prompt"""
+        subject = self.get_field_value(field_values, "subject")
+        style = self.get_field_value(field_values, "style")
+        composition = self.get_field_value(field_values, "composition")
+        lighting = self.get_field_value(field_values, "lighting")
+        camera = self.get_field_value(field_values, "camera")
+        mood = self.get_field_value(field_values, "mood")
+        details = self.get_field_value(field_values, "details")
+        aspect_ratio = self.get_field_value(field_values, "aspect_ratio")
+        subject_context = self.get_field_value(field_values, "subject_context")
+        usage_purpose = self.get_field_value(field_values, "usage_purpose")
+        negative_details = self.get_field_value(field_values, "negative_details")
+
+        lines = [
+            self.get_category_prompt_text("image_description", "img_1", "prompt_img_1", language, subject=subject),
+            self.get_category_prompt_text("image_description", "img_2", "prompt_img_2", language, style=style),
+            self.get_category_prompt_text("image_description", "img_3", "prompt_img_3", language, composition=composition),
+            self.get_category_prompt_text("image_description", "img_4", "prompt_img_4", language, lighting=lighting),
+            self.get_category_prompt_text("image_description", "img_5", "prompt_img_5", language, camera=camera),
+            self.get_category_prompt_text("image_description", "img_6", "prompt_img_6", language, mood=mood),
+            self.get_category_prompt_text("image_description", "img_7", "prompt_img_7", language, details=details),
+            self.get_category_prompt_text("image_description", "img_8", "prompt_img_8", language),
+            self.get_category_prompt_text("image_description", "img_9", "prompt_img_9", language, aspect_ratio=aspect_ratio),
+            self.get_category_prompt_text("image_description", "img_10", "prompt_img_10", language, subject_context=subject_context),
+            self.get_category_prompt_text("image_description", "img_11", "prompt_img_11", language, usage_purpose=usage_purpose),
+            self.get_category_prompt_text("image_description", "img_12", "prompt_img_12", language, negative_details=negative_details),
+        ]
+        return "\n".join(lines)
+
+    def generate_sourcecode_prompt(self, field_values, language=None):
+        """Generiert Sourcecode-Prompt"""
+        programming_language = self.get_field_value(field_values, "language")
+        task = self.get_field_value(field_values, "task")
+        requirements = self.get_field_value(field_values, "requirements")
+        framework = self.get_field_value(field_values, "framework")
+        target_platform = self.get_field_value(field_values, "target_platform")
+        output_structure = self.get_field_value(field_values, "output_structure")
+        runtime_version = self.get_field_value(field_values, "runtime_version")
+        package_manager = self.get_field_value(field_values, "package_manager")
+        database = self.get_field_value(field_values, "database")
+        api_style = self.get_field_value(field_values, "api_style")
+        ui_framework = self.get_field_value(field_values, "ui_framework")
+        complexity = self.get_field_value(field_values, "complexity")
+        style = self.get_field_value(field_values, "style")
+        security_level = self.get_field_value(field_values, "security_level")
+        multilang = self.get_field_value(field_values, "multilang")
+        target_languages = self.get_field_value(field_values, "target_languages")
+        test_depth = self.get_field_value(field_values, "test_depth")
+        documentation_level = self.get_field_value(field_values, "documentation_level")
+        deployment_target = self.get_field_value(field_values, "deployment_target")
+        error_handling_strategy = self.get_field_value(field_values, "error_handling_strategy")
+        auth_requirements = self.get_field_value(field_values, "auth_requirements")
+        observability = self.get_field_value(field_values, "observability")
+        performance_constraints = self.get_field_value(field_values, "performance_constraints")
+        comments = self.get_category_prompt_text("sourcecode", "code_comments", "prompt_code_comments", language) if self.is_checked(field_values.get("comments")) else ""
+        tests = self.get_category_prompt_text("sourcecode", "code_tests", "prompt_code_tests", language) if self.is_checked(field_values.get("tests")) else ""
+
+        is_multilang = str(multilang).strip().lower() in {"ja", "yes", "oui", "si", "sí", "1", "true"}
+        i18n_line = (
+            self.get_category_prompt_text("sourcecode", "code_multilang_yes", "prompt_code_multilang_yes", language, target_languages=target_languages)
+            if is_multilang
+            else self.get_category_prompt_text("sourcecode", "code_multilang_no", "prompt_code_multilang_no", language)
+        )
+
+        lines = [
+            self.get_category_prompt_text("sourcecode", "code_1", "prompt_code_1", language, complexity=complexity.lower(), language=programming_language),
+            self.get_category_prompt_text("sourcecode", "code_2", "prompt_code_2", language, task=task),
+            self.get_category_prompt_text("sourcecode", "code_3", "prompt_code_3", language, requirements=requirements),
+            self.get_category_prompt_text("sourcecode", "code_4", "prompt_code_4", language, framework=framework),
+            self.get_category_prompt_text("sourcecode", "code_platform", "prompt_code_platform", language, target_platform=target_platform),
+            self.get_category_prompt_text("sourcecode", "code_structure", "prompt_code_structure", language, output_structure=output_structure),
+            self.get_category_prompt_text("sourcecode", "code_runtime", "prompt_code_runtime", language, runtime_version=runtime_version),
+            self.get_category_prompt_text("sourcecode", "code_package_manager", "prompt_code_package_manager", language, package_manager=package_manager),
+            self.get_category_prompt_text("sourcecode", "code_database", "prompt_code_database", language, database=database),
+            self.get_category_prompt_text("sourcecode", "code_api_style", "prompt_code_api_style", language, api_style=api_style),
+            self.get_category_prompt_text("sourcecode", "code_ui", "prompt_code_ui", language, ui_framework=ui_framework),
+            self.get_category_prompt_text("sourcecode", "code_security", "prompt_code_security", language, security_level=security_level),
+            i18n_line,
+            self.get_category_prompt_text("sourcecode", "code_test_depth", "prompt_code_test_depth", language, test_depth=test_depth),
+            self.get_category_prompt_text("sourcecode", "code_documentation", "prompt_code_documentation", language, documentation_level=documentation_level),
+            self.get_category_prompt_text("sourcecode", "code_deployment", "prompt_code_deployment", language, deployment_target=deployment_target),
+            self.get_category_prompt_text("sourcecode", "code_error_handling", "prompt_code_error_handling", language, error_handling_strategy=error_handling_strategy),
+            self.get_category_prompt_text("sourcecode", "code_auth", "prompt_code_auth", language, auth_requirements=auth_requirements),
+            self.get_category_prompt_text("sourcecode", "code_observability", "prompt_code_observability", language, observability=observability),
+            self.get_category_prompt_text("sourcecode", "code_performance", "prompt_code_performance", language, performance_constraints=performance_constraints),
+            self.get_category_prompt_text("sourcecode", "code_5", "prompt_code_5", language, style=style.lower(), comments=comments, tests=tests),
+            self.get_category_prompt_text("sourcecode", "code_6", "prompt_code_6", language),
+            self.get_category_prompt_text("sourcecode", "code_7", "prompt_code_7", language),
+        ]
+        return "\n".join(lines)
+
+    def generate_ai_art_prompt(self, field_values, language=None):
+        """Generiert KI-Kunst-Prompt"""
+        subject = self.get_field_value(field_values, "subject")
+        style = self.get_field_value(field_values, "style")
+        artist = self.get_field_value(field_values, "artist")
+        colors = self.get_field_value(field_values, "colors")
+        composition = self.get_field_value(field_values, "composition")
+        details = self.get_field_value(field_values, "details")
+        parameters = self.get_field_value(field_values, "parameters")
+        lighting = self.get_field_value(field_values, "lighting")
+        medium = self.get_field_value(field_values, "medium")
+        aspect_ratio = self.get_field_value(field_values, "aspect_ratio")
+        negative_prompt = self.get_field_value(field_values, "negative_prompt")
+
+        artist_ref = self.get_category_prompt_text("ai_art", "art_artist_ref", "prompt_art_artist_ref", language, artist=artist) if artist else ""
+
+        lines = [
+            self.get_category_prompt_text("ai_art", "art_subject_style", "prompt_art_subject_style", language, subject=subject, style=style.lower(), artist_ref=artist_ref),
+            self.get_category_prompt_text("ai_art", "art_2", "prompt_art_2", language, colors=colors),
+            self.get_category_prompt_text("ai_art", "art_3", "prompt_art_3", language, composition=composition),
+            self.get_category_prompt_text("ai_art", "art_4", "prompt_art_4", language, details=details),
+            self.get_category_prompt_text("ai_art", "art_5", "prompt_art_5", language, style=style.lower()),
+            self.get_category_prompt_text("ai_art", "art_6", "prompt_art_6", language, lighting=lighting),
+            self.get_category_prompt_text("ai_art", "art_7", "prompt_art_7", language, medium=medium),
+            self.get_category_prompt_text("ai_art", "art_8", "prompt_art_8", language, aspect_ratio=aspect_ratio),
+            self.get_category_prompt_text("ai_art", "art_9", "prompt_art_9", language, negative_prompt=negative_prompt),
+            parameters,
+        ]
+        return "\n".join(lines)
+
+    def generate_marketing_prompt(self, field_values, language=None):
+        """Generiert Marketing-Prompt"""
+        product = self.get_field_value(field_values, "product")
+        audience = self.get_field_value(field_values, "audience")
+        goal = self.get_field_value(field_values, "goal")
+        tone = self.get_field_value(field_values, "tone")
+        platform = self.get_field_value(field_values, "platform")
+        keywords = self.get_field_value(field_values, "keywords")
+        cta = self.get_field_value(field_values, "cta")
+        unique_value = self.get_field_value(field_values, "unique_value")
+        offer_details = self.get_field_value(field_values, "offer_details")
+        proof_points = self.get_field_value(field_values, "proof_points")
+        funnel_stage = self.get_field_value(field_values, "funnel_stage")
+
+        lines = [
+            self.get_category_prompt_text("marketing", "mkt_1", "prompt_mkt_1", language, product=product),
+            self.get_category_prompt_text("marketing", "mkt_2", "prompt_mkt_2", language, audience=audience),
+            self.get_category_prompt_text("marketing", "mkt_3", "prompt_mkt_3", language, goal=goal.lower()),
+            self.get_category_prompt_text("marketing", "mkt_4", "prompt_mkt_4", language, tone=tone.lower()),
+            self.get_category_prompt_text("marketing", "mkt_5", "prompt_mkt_5", language, platform=platform),
+            self.get_category_prompt_text("marketing", "mkt_6", "prompt_mkt_6", language, keywords=keywords),
+            self.get_category_prompt_text("marketing", "mkt_7", "prompt_mkt_7", language, cta=cta),
+            self.get_category_prompt_text("marketing", "mkt_8", "prompt_mkt_8", language),
+            self.get_category_prompt_text("marketing", "mkt_9", "prompt_mkt_9", language, unique_value=unique_value),
+            self.get_category_prompt_text("marketing", "mkt_10", "prompt_mkt_10", language, offer_details=offer_details),
+            self.get_category_prompt_text("marketing", "mkt_11", "prompt_mkt_11", language, proof_points=proof_points),
+            self.get_category_prompt_text("marketing", "mkt_12", "prompt_mkt_12", language, funnel_stage=funnel_stage),
+        ]
+        return "\n".join(lines)
+
+    def generate_nutrition_prompt(self, field_values, language=None):
+        """Generiert Ernährungsplan-Prompt"""
+        days = self.get_field_value(field_values, "days")
+        age = self.get_field_value(field_values, "age")
+        weight = self.get_field_value(field_values, "weight")
+        gender = self.get_field_value(field_values, "gender")
+        goal = self.get_field_value(field_values, "goal")
+        taste = self.get_field_value(field_values, "taste")
+        activity_level = self.get_field_value(field_values, "activity_level")
+        dietary_restrictions = self.get_field_value(field_values, "dietary_restrictions")
+        budget_level = self.get_field_value(field_values, "budget_level")
+        meals_per_day = self.get_field_value(field_values, "meals_per_day")
+        appliances = self.get_field_value(field_values, "appliances")
+        meal_prep = self.is_checked(field_values.get("meal_prep"))
+        storage = self.get_field_value(field_values, "storage")
+        show_calories = self.is_checked(field_values.get("show_calories"))
+        show_tips = self.is_checked(field_values.get("show_tips"))
+        show_portions = self.is_checked(field_values.get("show_portions"))
+
+        meal_prep_section = ""
+        if meal_prep:
+            meal_prep_section = self.get_category_prompt_text("nutrition", "mealprep", "nutrition_mealprep", language, storage=storage)
+
+        optional_parts = []
+        if show_calories:
+            optional_parts.append(self.get_category_prompt_text("nutrition", "opt_calories", "nutrition_opt_calories", language))
+        if show_tips:
+            optional_parts.append(self.get_category_prompt_text("nutrition", "opt_tips", "nutrition_opt_tips", language))
+        if show_portions:
+            optional_parts.append(self.get_category_prompt_text("nutrition", "opt_portions", "nutrition_opt_portions", language))
+        optional_section = ""
+        if optional_parts:
+            optional_section = "\n\n" + self.get_category_prompt_text("nutrition", "optional", "nutrition_optional", language) + "\n" + "\n".join(optional_parts)
+
+        plan_label = self.get_category_prompt_text("nutrition", "plan_week", "nutrition_plan_week", language, days=days) if days != "1" else self.get_category_prompt_text("nutrition", "plan_day", "nutrition_plan_day", language)
+        shopping_period = self.get_category_prompt_text("nutrition", "shopping_day", "nutrition_shopping_day", language) if days == "1" else self.get_category_prompt_text("nutrition", "shopping_days", "nutrition_shopping_days", language, days=days)
+
+        lines = [
+            self.get_category_prompt_text("nutrition", "intro", "nutrition_intro", language, gender=gender),
+            "",
+            self.get_category_prompt_text("nutrition", "age", "nutrition_age", language, age=age),
+            self.get_category_prompt_text("nutrition", "weight", "nutrition_weight", language, weight=weight),
+            self.get_category_prompt_text("nutrition", "activity", "nutrition_activity", language, activity_level=activity_level),
+            self.get_category_prompt_text("nutrition", "goal", "nutrition_goal", language, goal=goal),
+            self.get_category_prompt_text("nutrition", "restrictions", "nutrition_restrictions", language, dietary_restrictions=dietary_restrictions),
+            self.get_category_prompt_text("nutrition", "taste", "nutrition_taste", language, taste=taste),
+            "",
+            self.get_category_prompt_text("nutrition", "requirements", "nutrition_requirements", language),
+            "",
+            self.get_category_prompt_text("nutrition", "r1", "nutrition_r1", language, plan_label=plan_label),
+            self.get_category_prompt_text("nutrition", "r2", "nutrition_r2", language),
+            self.get_category_prompt_text("nutrition", "r3", "nutrition_r3", language),
+            f"   {appliances}",
+            self.get_category_prompt_text("nutrition", "r4", "nutrition_r4", language, meals_per_day=meals_per_day, budget_level=budget_level),
+        ]
+
+        if meal_prep_section:
+            lines.append(meal_prep_section)
+
+        lines.extend([
+            self.get_category_prompt_text("nutrition", "r5", "nutrition_r5", language),
+            self.get_category_prompt_text("nutrition", "r6", "nutrition_r6", language),
+            self.get_category_prompt_text("nutrition", "r7", "nutrition_r7", language),
+            self.get_category_prompt_text("nutrition", "r8", "nutrition_r8", language, shopping_period=shopping_period),
+        ])
+
+        return "\n".join(lines) + optional_section
+
+
+class CategoryWatcher:
+    """Erkennt geänderte Kategorie-Dateien per os.stat-Polling (ohne externe Dienste)."""
+
+    def __init__(self, engine, category_ids):
+        self.engine = engine
+        # Auch gebündelte Kategorien beobachten: eine lose Datei überschreibt den Bundle-Eintrag
+        self.signatures = {category_id: self.get_signature(category_id) for category_id in category_ids}
+
+    def get_signature(self, category_id):
+        """Liefert (Pfad, mtime_ns, Größe) der aktiven Kategorie-Datei oder None."""
+        for path in self.engine.get_category_candidate_paths(category_id):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            return (path, stat.st_mtime_ns, stat.st_size)
+        return None
+
+    def poll(self):
+        """Liefert die IDs aller Kategorien, deren Datei sich seit dem letzten Aufruf geändert hat."""
+        changed = []
+        for category_id, signature in self.signatures.items():
+            current = self.get_signature(category_id)
+            if current != signature:
+                self.signatures[category_id] = current
+                changed.append(category_id)
+        return changed
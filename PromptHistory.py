@@ -0,0 +1,288 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class PromptHistory:
+    """Append-only Prompt-History im JSONL-Format (ein Datensatz pro Zeile).
+
+    Schreiben hängt nur eine Zeile an; fsync erfolgt gebündelt, spätestens
+    sync_interval Sekunden nach dem ersten nicht synchronisierten Eintrag (per
+    Timer-Thread, auch wenn danach nichts mehr angehängt wird). Zum Anzeigen
+    werden nur die letzten Datensätze rückwärts vom Dateiende gelesen.
+    """
+
+    def __init__(self, path="prompt_history.jsonl", legacy_path="prompt_history.json",
+                 sync_every=50, sync_interval=10.0):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.file = None
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.sync_timer = None
+        self.lock = threading.Lock()
+        self.migrate_legacy_history()
+
+    def migrate_legacy_history(self):
+        """Übernimmt eine alte prompt_history.json (JSON-Liste) einmalig ins JSONL-Format."""
+        if not self.legacy_path or os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception:
+            return
+        if not isinstance(entries, list):
+            return
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+            for entry in entries:
+                if isinstance(entry, dict):
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.path)
+
+    def append(self, category, prompt, language=None, fields=None):
+        """Hängt einen generierten Prompt als JSONL-Datensatz an."""
+        entry = {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "category": category,
+            "language": language,
+            "prompt": prompt,
+            "fields": fields or {},
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'a', encoding='utf-8', newline='\n')
+            self.file.write(line)
+            self.file.flush()
+
+            self.unsynced += 1
+            elapsed = time.monotonic() - self.last_sync
+            if self.unsynced >= self.sync_every or elapsed >= self.sync_interval:
+                self.sync_locked()
+            elif self.sync_timer is None:
+                self.sync_timer = threading.Timer(self.sync_interval - elapsed, self.sync)
+                self.sync_timer.daemon = True
+                self.sync_timer.start()
+        return entry
+
+    def sync(self):
+        """Schreibt gepufferte Einträge per fsync auf die Platte."""
+        with self.lock:
+            self.sync_locked()
+
+    def sync_locked(self):
+        if self.sync_timer is not None:
+            self.sync_timer.cancel()
+            self.sync_timer = None
+        if self.file is not None and self.unsynced:
+            os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        """Synchronisiert und schließt die History-Datei."""
+        with self.lock:
+            if self.file is None:
+                return
+            try:
+                self.sync_locked()
+            finally:
+                self.file.close()
+                self.file = None
+
+    def read_last(self, count, block_size=8192):
+        """Liest die letzten count Datensätze, indem vom Dateiende rückwärts gelesen wird."""
+        if count <= 0 or not os.path.exists(self.path):
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            # Eine Zeile mehr als nötig lesen, damit die erste Zeile sicher vollständig ist
+            while position > 0 and data.count(b"\n") <= count:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                data = f.read(read_size) + data
+
+        lines = data.split(b"\n")
+        if position > 0:
+            lines = lines[1:]
+
+        entries = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+        return entries[-count:]
+
+
+class HistorySearchIndex:
+    """Inkrementeller Volltext-Index (SQLite FTS5) über die JSONL-History.
+
+    Die JSONL-Datei bleibt die Quelle; der Index merkt sich den Byte-Offset der
+    zuletzt indizierten Zeile und liest bei sync() nur neu angehängte Zeilen.
+    Ohne FTS5-Unterstützung wird auf LIKE-Suche zurückgefallen. Die Verbindung
+    ist gesperrt statt threadgebunden, damit der erste (lange) sync() in einem
+    Worker-Thread laufen kann.
+    """
+
+    def __init__(self, history_path="prompt_history.jsonl", db_path="prompt_history.db"):
+        self.history_path = history_path
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.fts_enabled = True
+        self.create_schema()
+
+    def create_schema(self):
+        """Legt Tabellen, Indizes und (falls verfügbar) die FTS5-Tabelle an."""
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "id INTEGER PRIMARY KEY, date TEXT, category TEXT, language TEXT, prompt TEXT, fields TEXT)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_category ON entries(category, date)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_date ON entries(date)")
+            try:
+                self.connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5("
+                    "prompt, category, fields, content='entries', content_rowid='id')"
+                )
+            except sqlite3.OperationalError:
+                self.fts_enabled = False
+
+    def get_meta(self, key, default=None):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def clear(self):
+        """Leert den Index (z.B. wenn die History-Datei ersetzt oder gekürzt wurde)."""
+        with self.connection:
+            self.connection.execute("DELETE FROM entries")
+            if self.fts_enabled:
+                self.connection.execute("INSERT INTO entries_fts(entries_fts) VALUES ('delete-all')")
+            self.set_meta("offset", 0)
+
+    def sync(self):
+        """Indiziert alle seit dem letzten Aufruf angehängten History-Zeilen; liefert deren Anzahl."""
+        with self.lock:
+            return self.sync_locked()
+
+    def sync_locked(self):
+        if not os.path.exists(self.history_path):
+            return 0
+
+        offset = int(self.get_meta("offset", 0))
+        if os.path.getsize(self.history_path) < offset:
+            self.clear()
+            offset = 0
+
+        added = 0
+        with open(self.history_path, 'rb') as f, self.connection:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Unvollständige letzte Zeile erst beim nächsten Mal indizieren
+                    break
+                offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                self.add_entry(entry)
+                added += 1
+            self.set_meta("offset", offset)
+        return added
+
+    def add_entry(self, entry):
+        """Fügt einen History-Datensatz in Tabelle und FTS-Index ein."""
+        fields = entry.get("fields") or {}
+        fields_text = " ".join(str(value) for value in fields.values()) if isinstance(fields, dict) else str(fields)
+        cursor = self.connection.execute(
+            "INSERT INTO entries (date, category, language, prompt, fields) VALUES (?, ?, ?, ?, ?)",
+            (
+                str(entry.get("date", "")),
+                str(entry.get("category", "")),
+                entry.get("language") or "",
+                str(entry.get("prompt", "")),
+                fields_text,
+            ),
+        )
+        if self.fts_enabled:
+            self.connection.execute(
+                "INSERT INTO entries_fts (rowid, prompt, category, fields) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, str(entry.get("prompt", "")), str(entry.get("category", "")), fields_text),
+            )
+
+    def build_match_query(self, query):
+        """Wandelt Suchbegriffe in eine FTS5-Abfrage um (alle Wörter, jeweils als Präfix)."""
+        terms = [term.replace('"', '""') for term in query.split()]
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search(self, query="", category=None, language=None, date_from=None, date_to=None, limit=20, offset=0):
+        """Sucht in der History; liefert (Einträge neueste zuerst, Gesamtanzahl)."""
+        with self.lock:
+            self.sync_locked()
+            return self.query(query, category, language, date_from, date_to, limit, offset)
+
+    def query(self, query, category, language, date_from, date_to, limit, offset):
+        conditions = []
+        params = []
+        if query and query.strip():
+            if self.fts_enabled:
+                conditions.append("entries.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+                params.append(self.build_match_query(query))
+            else:
+                for term in query.split():
+                    conditions.append("(entries.prompt LIKE ? OR entries.category LIKE ? OR entries.fields LIKE ?)")
+                    params.extend([f"%{term}%"] * 3)
+        if category:
+            conditions.append("entries.category = ?")
+            params.append(category)
+        if language:
+            conditions.append("entries.language = ?")
+            params.append(language)
+        if date_from:
+            conditions.append("entries.date >= ?")
+            params.append(date_from)
+        if date_to:
+            # Datum ohne Uhrzeit schließt den ganzen Tag ein
+            conditions.append("entries.date < ?")
+            params.append(date_to + "\uffff")
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        total = self.connection.execute(f"SELECT COUNT(*) FROM entries{where}", params).fetchone()[0]
+        rows = self.connection.execute(
+            f"SELECT date, category, language, prompt FROM entries{where} ORDER BY entries.id DESC LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        entries = [
+            {"date": date, "category": category, "language": language, "prompt": prompt}
+            for date, category, language, prompt in rows
+        ]
+        return entries, total
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
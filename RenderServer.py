@@ -0,0 +1,230 @@
+import argparse
+import json
+import socket
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from BatchRenderer import BatchRenderer
+from PromptEngine import PromptEngine, CATEGORIES, CATEGORY_KEY_MAP
+from ResourceBundle import default_bundle_path
+from RuntimeMetrics import metrics
+
+
+DEFAULT_PORT = 8765
+MAX_BODY_SIZE = 10 * 1024 * 1024
+MAX_BATCH_SIZE = 10000
+
+
+class RenderService:
+    """Beantwortet Render-Anfragen ohne GUI; alle Kategorien bleiben vorkompiliert im Speicher."""
+
+    def __init__(self, engine=None, default_language="de"):
+        self.engine = engine or PromptEngine()
+        self.renderer = BatchRenderer(self.engine, default_language)
+        self.default_language = default_language
+
+    def warm(self):
+        """Lädt und kompiliert alle Kategorien in allen Sprachen vor; liefert die Dauer in Sekunden."""
+        started = time.perf_counter()
+        for category_id in CATEGORIES.values():
+            for language in self.engine.language_names:
+                self.engine.get_compiled_category(category_id, language)
+                self.renderer.get_field_values(category_id, language, None)
+                self.engine.get_category_display_name(category_id, language)
+        return time.perf_counter() - started
+
+    def get_language(self, language):
+        return language if language in self.engine.language_names else self.default_language
+
+    def list_categories(self, language=None):
+        """Liefert ID, internen Namen und lokalisierten Namen aller Kategorien."""
+        language = self.get_language(language)
+        categories = []
+        for internal_key, category_id in CATEGORIES.items():
+            name = self.engine.get_category_display_name(category_id, language)
+            if not name:
+                name = self.engine.tr(CATEGORY_KEY_MAP.get(internal_key, internal_key), language)
+            categories.append({"id": category_id, "internal": internal_key, "name": name})
+        return {"language": language, "categories": categories}
+
+    def get_fields(self, category, language=None):
+        """Liefert die lokalisierten Felddefinitionen einer Kategorie oder None."""
+        category_id = self.renderer.resolve_category_id(category)
+        if category_id is None:
+            return None
+        language = self.get_language(language)
+        return {
+            "category": category_id,
+            "language": language,
+            "fields": self.engine.get_category_fields(category_id, language),
+        }
+
+    def render(self, record):
+        """Rendert einen Datensatz {category, language, fields}; liefert (Ergebnis, Fehler)."""
+        if not isinstance(record, dict):
+            return None, "Datensatz ist kein JSON-Objekt"
+        # Sprache und Kategorie prüft render_record; unbekannte Werte ergeben einen Fehler
+        # statt neuer Cache-Einträge. Alles Übrige beantwortet der Handler mit 400 statt
+        # die Verbindung ohne Antwort abzubrechen.
+        try:
+            return self.renderer.render_record(record)
+        except Exception as exc:
+            return None, f"Datensatz konnte nicht gerendert werden: {exc}"
+
+    def render_batch(self, records):
+        """Rendert mehrere Datensätze; fehlerhafte Einträge enthalten statt prompt ein error."""
+        results = []
+        for record in records:
+            result, error = self.render(record)
+            results.append(result if error is None else {"error": error})
+        return {"results": results}
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP-Schnittstelle des RenderService (JSON rein, JSON raus)."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "UniversalPromptManager"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        language = parse_qs(url.query).get("language", [None])[0]
+        service = self.server.service
+
+        if parts == ["health"]:
+            self.send_json(200, {"status": "ok"})
+        elif parts == ["stats"]:
+            self.send_json(200, {"render_cache": service.engine.render_cache.stats()})
+        elif parts == ["metrics"]:
+            self.send_json(200, metrics.snapshot())
+        elif parts == ["categories"]:
+            self.send_json(200, service.list_categories(language))
+        elif len(parts) == 3 and parts[0] == "categories" and parts[2] == "fields":
+            fields = service.get_fields(parts[1], language)
+            if fields is None:
+                self.send_json(404, {"error": f"unbekannte Kategorie: {parts[1]!r}"})
+            else:
+                self.send_json(200, fields)
+        else:
+            self.send_json(404, {"error": "unbekannter Pfad"})
+
+    def do_POST(self):
+        parts = [part for part in urlsplit(self.path).path.split("/") if part]
+        if parts not in (["render"], ["render", "batch"]):
+            self.send_json(404, {"error": "unbekannter Pfad"})
+            return
+
+        body, error, status = self.read_json_body()
+        if error is not None:
+            self.send_json(status, {"error": error})
+            return
+
+        service = self.server.service
+        if parts == ["render"]:
+            with metrics.timer("server.render"):
+                result, error = service.render(body)
+            if error is not None:
+                self.send_json(400, {"error": error})
+            else:
+                self.send_json(200, result)
+            return
+
+        records = body.get("records") if isinstance(body, dict) else body
+        if not isinstance(records, list):
+            self.send_json(400, {"error": "erwartet eine Liste oder {\"records\": [...]}"})
+        elif len(records) > MAX_BATCH_SIZE:
+            self.send_json(413, {"error": f"höchstens {MAX_BATCH_SIZE} Datensätze pro Anfrage"})
+        else:
+            with metrics.timer("server.render_batch"):
+                results = service.render_batch(records)
+            self.send_json(200, results)
+
+    def read_json_body(self):
+        """Liest den JSON-Body; liefert (Daten, Fehler, HTTP-Status)."""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            return None, "ungültige Content-Length", 400
+        if length < 0:
+            # rfile.read(-1) würde bis zum Verbindungsende blockieren
+            return None, "ungültige Content-Length", 400
+        if length > MAX_BODY_SIZE:
+            return None, "Anfrage ist zu groß", 413
+        try:
+            return json.loads(self.rfile.read(length) or b"null"), None, 200
+        except ValueError as exc:
+            return None, f"ungültiges JSON: {exc}", 400
+
+    def send_json(self, status, payload):
+        content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """Mehrfädiger HTTP-Server; jede Verbindung läuft in einem eigenen Thread."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose=False):
+        super().__init__(address, RenderRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def build_argument_parser():
+    """Erstellt den Argument-Parser für den Server-Modus."""
+    parser = argparse.ArgumentParser(
+        prog="UniversalPromptManager serve",
+        description="Lokaler HTTP-Dienst zum Rendern von Prompts (nur localhost).",
+    )
+    parser.add_argument("--host", default="127.0.0.1", choices=["127.0.0.1", "localhost", "::1"],
+                        help="Adresse, an die der Server gebunden wird (nur lokal)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--language", default="de", help="Sprache für Anfragen ohne language")
+    parser.add_argument("--categories-dir", default="categories")
+    parser.add_argument("--languages-file", default="upmlanguages.json")
+    parser.add_argument("--bundle", default=default_bundle_path(),
+                        help="Ressourcen-Bundle statt loser JSON-Dateien verwenden")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Jede Anfrage protokollieren")
+    parser.add_argument("--metrics", metavar="DATEI", help="Laufzeitmetriken beim Beenden als JSON schreiben")
+    return parser
+
+
+def main(argv=None):
+    """Einstiegspunkt für den Server-Modus."""
+    args = build_argument_parser().parse_args(argv)
+    engine = PromptEngine(args.categories_dir, args.languages_file, args.language, bundle_file=args.bundle)
+    service = RenderService(engine, args.language)
+    warm_seconds = service.warm()
+
+    if args.host == "::1":
+        RenderServer.address_family = socket.AF_INET6
+    server = RenderServer((args.host, args.port), service, args.verbose)
+    sys.stderr.write(
+        f"Kategorien vorkompiliert in {warm_seconds:.2f}s; "
+        f"Server läuft auf http://{args.host}:{server.server_address[1]}/ (Strg+C beendet)\n"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.metrics:
+            metrics.write_json(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
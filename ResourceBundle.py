@@ -0,0 +1,279 @@
+import argparse
+import datetime
+import json
+import mmap
+import os
+import string
+import struct
+import sys
+
+
+BUNDLE_FILE = "upm_resources.bundle"
+BUNDLE_MAGIC = b"UPMRES\x00\x00"
+BUNDLE_VERSION = 1
+# Magic, Format-Version, Länge des JSON-Index in Bytes
+_HEADER = struct.Struct("<8sII")
+
+FIELD_TYPES = {"entry", "combobox", "text", "checkbox", "spinbox"}
+
+
+class ResourceBundle:
+    """Liest Kategorien und Sprachpakete aus einer vorkompilierten Bundle-Datei.
+
+    Aufbau: Header (Magic, Version, Indexlänge), JSON-Index mit Offsets und
+    Längen, danach die einzelnen Einträge als kompaktes JSON. Die Datei wird
+    per mmap eingeblendet; Einträge werden erst beim Zugriff dekodiert.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            try:
+                self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # z.B. leere Datei oder Dateisystem ohne mmap-Unterstützung
+                self.data = self.file.read()
+            self.index, self.payload_offset = self.read_index()
+        except Exception:
+            self.close()
+            raise
+        self.categories = self.index.get("categories", {})
+        self.languages = self.index.get("languages", {})
+        self.language_names = {code: entry.get("name", code) for code, entry in self.languages.items()}
+
+    def read_index(self):
+        """Prüft den Header und liefert (Index, Beginn der Nutzdaten)."""
+        if len(self.data) < _HEADER.size:
+            raise ValueError("Bundle ist zu kurz")
+        magic, version, index_length = _HEADER.unpack_from(self.data, 0)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError("keine Ressourcen-Bundle-Datei")
+        if version != BUNDLE_VERSION:
+            raise ValueError(f"nicht unterstützte Bundle-Version {version}")
+        payload_offset = _HEADER.size + index_length
+        index = json.loads(self.data[_HEADER.size:payload_offset])
+        if not isinstance(index, dict):
+            raise ValueError("ungültiger Bundle-Index")
+        return index, payload_offset
+
+    def read_entry(self, entry):
+        start = self.payload_offset + entry["offset"]
+        return json.loads(self.data[start:start + entry["length"]])
+
+    def get_category(self, category_id):
+        """Liefert die Definition einer Kategorie oder None, falls sie nicht im Bundle ist."""
+        entry = self.categories.get(category_id)
+        return self.read_entry(entry) if entry else None
+
+    def get_category_names(self, category_id):
+        """Liefert die lokalisierten Kategorienamen direkt aus dem Index."""
+        entry = self.categories.get(category_id)
+        return entry.get("names") if entry else None
+
+    def get_language_pack(self, language):
+        """Liefert ein Sprachpaket oder None."""
+        entry = self.languages.get(language)
+        return self.read_entry(entry) if entry else None
+
+    def close(self):
+        data = getattr(self, "data", None)
+        if isinstance(data, mmap.mmap):
+            data.close()
+        self.file.close()
+
+
+def default_bundle_path():
+    """Pfad des Bundles im PyInstaller-Build; in der Entwicklung None (lose JSON-Dateien)."""
+    if not getattr(sys, "frozen", False):
+        return None
+    base_path = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(sys.executable)))
+    path = os.path.join(base_path, BUNDLE_FILE)
+    return path if os.path.exists(path) else None
+
+
+# === BUILD-SCHRITT ===
+
+def validate_template(text):
+    """Prüft, ob ein Prompt-Text von str.format zerlegt werden kann."""
+    try:
+        list(string.Formatter().parse(text))
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def validate_category(category_id, data):
+    """Prüft eine Kategorie-Definition; liefert eine Liste von Fehlertexten."""
+    if not isinstance(data, dict):
+        return [f"{category_id}: Definition ist kein JSON-Objekt"]
+
+    errors = []
+    fields = data.get("fields", [])
+    if not isinstance(fields, list):
+        errors.append(f"{category_id}: 'fields' ist keine Liste")
+        fields = []
+    keys = set()
+    for position, field in enumerate(fields):
+        if not isinstance(field, dict):
+            errors.append(f"{category_id}: Feld {position} ist kein JSON-Objekt")
+            continue
+        field_key = field.get("key")
+        if not isinstance(field_key, str) or not field_key:
+            errors.append(f"{category_id}: Feld {position} hat keinen 'key'")
+            continue
+        if field_key in keys:
+            errors.append(f"{category_id}: Feld '{field_key}' ist doppelt")
+        keys.add(field_key)
+        field_type = field.get("type", "entry")
+        if field_type not in FIELD_TYPES:
+            errors.append(f"{category_id}: Feld '{field_key}' hat unbekannten Typ '{field_type}'")
+
+    prompts = data.get("prompts", {})
+    if not isinstance(prompts, dict):
+        errors.append(f"{category_id}: 'prompts' ist kein JSON-Objekt")
+        prompts = {}
+    for prompt_key, prompt_value in prompts.items():
+        texts = prompt_value.values() if isinstance(prompt_value, dict) else [prompt_value]
+        for text in texts:
+            if not isinstance(text, str):
+                errors.append(f"{category_id}: Prompt '{prompt_key}' ist kein Text")
+                continue
+            error = validate_template(text)
+            if error:
+                errors.append(f"{category_id}: Prompt '{prompt_key}' ist ungültig: {error}")
+    return errors
+
+
+def validate_language_pack(language, pack, reference=None):
+    """Prüft ein Sprachpaket; liefert (Fehler, Warnungen)."""
+    if not isinstance(pack, dict):
+        return [f"Sprache {language}: Paket ist kein JSON-Objekt"], []
+    errors = []
+    if not isinstance(pack.get("lang_name"), str):
+        errors.append(f"Sprache {language}: 'lang_name' fehlt")
+    warnings = []
+    if reference is not None and reference is not pack:
+        missing = [key for key in reference if key not in pack]
+        if missing:
+            warnings.append(f"Sprache {language}: {len(missing)} Schlüssel fehlen (Fallback Deutsch), z.B. {missing[0]}")
+    return errors, warnings
+
+
+def encode_entry(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build_bundle(output, categories_dir="categories", languages_file="upmlanguages.json"):
+    """Validiert alle Kategorien und Sprachpakete und schreibt sie in ein Bundle; liefert (Fehler, Warnungen)."""
+    errors = []
+    warnings = []
+    payload = []
+    payload_size = 0
+    index = {
+        "version": BUNDLE_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "categories": {},
+        "languages": {},
+    }
+
+    def add_entry(data):
+        nonlocal payload_size
+        encoded = encode_entry(data)
+        entry = {"offset": payload_size, "length": len(encoded)}
+        payload.append(encoded)
+        payload_size += len(encoded)
+        return entry
+
+    for file_name in sorted(os.listdir(categories_dir)):
+        if not file_name.endswith(".json"):
+            continue
+        category_id = file_name[:-len(".json")]
+        try:
+            with open(os.path.join(categories_dir, file_name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except ValueError as exc:
+            errors.append(f"{category_id}: ungültiges JSON: {exc}")
+            continue
+        category_errors = validate_category(category_id, data)
+        if category_errors:
+            errors.extend(category_errors)
+            continue
+        names = data.get("category_name")
+        if not isinstance(names, dict):
+            names = {"de": names} if isinstance(names, str) else {}
+        entry = add_entry(data)
+        entry["names"] = names
+        index["categories"][category_id] = entry
+
+    try:
+        with open(languages_file, 'r', encoding='utf-8') as f:
+            languages = json.load(f)
+    except (OSError, ValueError) as exc:
+        errors.append(f"{languages_file}: {exc}")
+        languages = {}
+    if not isinstance(languages, dict):
+        errors.append(f"{languages_file}: kein JSON-Objekt")
+        languages = {}
+    reference = languages.get("de")
+    for language, pack in languages.items():
+        pack_errors, pack_warnings = validate_language_pack(language, pack, reference)
+        errors.extend(pack_errors)
+        warnings.extend(pack_warnings)
+        if pack_errors:
+            continue
+        entry = add_entry(pack)
+        entry["name"] = pack["lang_name"]
+        index["languages"][language] = entry
+
+    if errors:
+        return errors, warnings
+
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    temp_path = f"{output}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for encoded in payload:
+            f.write(encoded)
+    os.replace(temp_path, output)
+    return errors, warnings
+
+
+def build_argument_parser():
+    """Erstellt den Argument-Parser für den Build-Schritt."""
+    parser = argparse.ArgumentParser(
+        prog="ResourceBundle",
+        description="Validiert Kategorien und Sprachpakete und kompiliert sie in eine Bundle-Datei.",
+    )
+    parser.add_argument("-o", "--output", default=BUNDLE_FILE)
+    parser.add_argument("--categories-dir", default="categories")
+    parser.add_argument("--languages-file", default="upmlanguages.json")
+    return parser
+
+
+def main(argv=None):
+    """Einstiegspunkt des Build-Schritts."""
+    args = build_argument_parser().parse_args(argv)
+    errors, warnings = build_bundle(args.output, args.categories_dir, args.languages_file)
+    for warning in warnings:
+        sys.stderr.write(f"Warnung: {warning}\n")
+    for error in errors:
+        sys.stderr.write(f"Fehler: {error}\n")
+    if errors:
+        sys.stderr.write("Bundle wurde nicht erstellt.\n")
+        return 1
+
+    bundle = ResourceBundle(args.output)
+    try:
+        sys.stderr.write(
+            f"{args.output}: {len(bundle.categories)} Kategorien, {len(bundle.languages)} Sprachen, "
+            f"{os.path.getsize(args.output)} Bytes\n"
+        )
+    finally:
+        bundle.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
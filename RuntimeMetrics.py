@@ -0,0 +1,194 @@
+import bisect
+import contextlib
+import datetime
+import json
+import threading
+import time
+
+
+# Obergrenzen der Histogramm-Buckets in Sekunden; ein letzter Bucket nimmt alles darüber auf
+TIME_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Counter:
+    """Einfacher Zähler; inc() ist nur eine Attribut-Addition."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    """Verteilung von Messwerten (z.B. Dauer in Sekunden) in festen Buckets."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(TIME_BUCKETS) + 1)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.buckets[bisect.bisect_left(TIME_BUCKETS, value)] += 1
+
+    def quantile(self, q):
+        """Schätzt ein Quantil als Obergrenze des Buckets, in den es fällt (höchstens max)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(TIME_BUCKETS[index], self.max) if index < len(TIME_BUCKETS) else self.max
+        return self.max
+
+    def merge(self, count, total, minimum, maximum, buckets):
+        if not count:
+            return
+        self.count += count
+        self.total += total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+        for index, bucket in enumerate(buckets):
+            self.buckets[index] += bucket
+
+    def to_dict(self):
+        """Liefert Anzahl, Summe, Mittelwert und Quantile in Millisekunden."""
+        to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+        return {
+            "count": self.count,
+            "total_ms": to_ms(self.total),
+            "mean_ms": to_ms(self.total / self.count) if self.count else None,
+            "min_ms": to_ms(self.min),
+            "p50_ms": to_ms(self.quantile(0.5)),
+            "p95_ms": to_ms(self.quantile(0.95)),
+            "max_ms": to_ms(self.max),
+        }
+
+
+class MetricsRegistry:
+    """Immer aktive Laufzeitmetriken (Zähler, Histogramme) für GUI und Headless-Modi.
+
+    Instrumentierte Stellen holen sich ihre Counter/Histogramme einmalig und
+    zählen danach ohne Lookup; ausgewertet wird nur bei snapshot(). Die
+    Erhöhungen sind nicht gesperrt, bei mehreren Threads können einzelne
+    Zählungen verloren gehen, was für Diagnosezwecke genügt. Quellen liefern
+    zusätzliche Werte (z.B. Cache-Statistiken) erst beim Auslesen.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self.sources = {}
+        self.lock = threading.Lock()
+
+    def counter(self, name):
+        counter = self.counters.get(name)
+        if counter is None:
+            with self.lock:
+                counter = self.counters.setdefault(name, Counter())
+        return counter
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """Misst die Dauer eines Abschnitts in das Histogramm name."""
+        histogram = self.histogram(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    def register_source(self, name, callback):
+        """Registriert eine Funktion, deren Dict beim Auslesen mit ausgegeben wird."""
+        self.sources[name] = callback
+
+    def snapshot(self):
+        """Liefert alle Metriken als JSON-taugliches Dict."""
+        sources = {}
+        for name, callback in list(self.sources.items()):
+            try:
+                sources[name] = callback()
+            except Exception as exc:
+                sources[name] = {"error": str(exc)}
+        return {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "uptime_s": round(time.time() - self.started, 3),
+            "counters": {name: counter.value for name, counter in sorted(self.counters.items())},
+            "histograms": {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())},
+            "sources": sources,
+        }
+
+    def format_report(self):
+        """Formatiert Zähler und Histogramme als Text (Diagnose-Dialog)."""
+        data = self.snapshot()
+        lines = [f"Laufzeit: {data['uptime_s']:.0f} s", ""]
+        for name, value in data["counters"].items():
+            lines.append(f"  {name:<48} {value:>10}")
+        if data["histograms"]:
+            lines.append("")
+            lines.append(f"  {'':<48} {'Anzahl':>7} {'Mittel':>9} {'p95':>9} {'Max':>9}  (ms)")
+        for name, histogram in data["histograms"].items():
+            lines.append(
+                f"  {name:<48} {histogram['count']:>7} {histogram['mean_ms'] or 0:>9.2f} "
+                f"{histogram['p95_ms'] or 0:>9.2f} {histogram['max_ms'] or 0:>9.2f}"
+            )
+        for name, values in data["sources"].items():
+            lines.append("")
+            lines.append(f"  {name}")
+            for key, value in values.items():
+                value_text = f"{value:.3f}" if isinstance(value, float) else str(value)
+                lines.append(f"    {key:<46} {value_text:>10}")
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        """Schreibt einen Schnappschuss als JSON-Datei."""
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    def drain(self):
+        """Liefert die Rohwerte und setzt sie zurück (Übergabe aus Worker-Prozessen)."""
+        with self.lock:
+            counters = {name: counter.value for name, counter in self.counters.items() if counter.value}
+            histograms = {
+                name: (histogram.count, histogram.total, histogram.min, histogram.max, list(histogram.buckets))
+                for name, histogram in self.histograms.items() if histogram.count
+            }
+            for counter in self.counters.values():
+                counter.value = 0
+            for name in histograms:
+                self.histograms[name].__init__()
+        return counters, histograms
+
+    def merge(self, drained):
+        """Addiert mit drain() übergebene Rohwerte."""
+        counters, histograms = drained
+        for name, value in counters.items():
+            self.counter(name).inc(value)
+        for name, values in histograms.items():
+            self.histogram(name).merge(*values)
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+
+from RuntimeMetrics import metrics
+
+
+class SettingsStore:
+    """Write-behind-Persistenz für app_settings.json.
+
+    save() übernimmt nur einen flachen Schnappschuss und kehrt sofort zurück; ein
+    Hintergrund-Thread fasst schnell aufeinanderfolgende Änderungen zusammen und
+    schreibt atomar (Temp-Datei + os.replace). Unveränderte Kategorien in
+    field_values werden nicht erneut serialisiert.
+    """
+
+    def __init__(self, path, delay=0.5):
+        self.path = path
+        self.delay = delay
+        self.condition = threading.Condition()
+        self.pending = None
+        self.deadline = 0.0
+        self.worker = None
+        self.write_lock = threading.Lock()
+        # Wird bei flush() und reset() erhöht, damit ein laufender Schreibvorgang alte Daten verwirft
+        self.generation = 0
+        # Kategorie → (zuletzt geschriebene Werte, serialisiertes Fragment)
+        self.fragment_cache = {}
+
+    def load(self):
+        """Lädt persistente Anwendungseinstellungen."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                    if isinstance(loaded, dict):
+                        return loaded
+            except Exception:
+                pass
+        return {}
+
+    def snapshot(self, settings):
+        """Kopiert die Einstellungen flach, damit der Hauptthread weiterarbeiten kann."""
+        snapshot = dict(settings)
+        field_values = snapshot.get("field_values")
+        if isinstance(field_values, dict):
+            snapshot["field_values"] = {
+                category: dict(values) if isinstance(values, dict) else values
+                for category, values in field_values.items()
+            }
+        return snapshot
+
+    def save(self, settings):
+        """Plant das Speichern; mehrere Aufrufe innerhalb von delay werden zusammengefasst."""
+        snapshot = self.snapshot(settings)
+        with self.condition:
+            self.pending = snapshot
+            self.deadline = time.monotonic() + self.delay
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.run_worker, name="SettingsStore", daemon=True)
+                self.worker.start()
+            self.condition.notify()
+
+    def flush(self, settings=None):
+        """Schreibt sofort und synchron (z.B. beim Beenden)."""
+        with self.condition:
+            snapshot = self.snapshot(settings) if settings is not None else self.pending
+            self.pending = None
+            self.generation += 1
+            self.condition.notify()
+        if snapshot is not None:
+            self.write(snapshot)
+
+    def reset(self):
+        """Verwirft ausstehende Änderungen und entfernt die Einstellungsdatei."""
+        with self.condition:
+            self.pending = None
+            self.generation += 1
+            self.condition.notify()
+        with self.write_lock:
+            self.fragment_cache.clear()
+            if os.path.exists(self.path):
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    with open(self.path, 'w', encoding='utf-8') as f:
+                        json.dump({}, f, indent=2, ensure_ascii=False)
+
+    def run_worker(self):
+        """Wartet, bis sich der Schnappschuss für delay Sekunden nicht geändert hat, und schreibt ihn."""
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    if not self.condition.wait(timeout=5.0) and self.pending is None:
+                        # Leerlauf: Thread beenden, save() startet bei Bedarf einen neuen
+                        self.worker = None
+                        return
+                remaining = self.deadline - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(timeout=remaining)
+                    continue
+                snapshot = self.pending
+                generation = self.generation
+                self.pending = None
+            try:
+                self.write(snapshot, generation)
+            except OSError:
+                pass
+
+    def serialize(self, settings):
+        """Serialisiert wie json.dump(indent=2), verwendet aber Fragmente unveränderter Kategorien wieder."""
+        parts = []
+        for key, value in settings.items():
+            if key == "field_values" and isinstance(value, dict):
+                value_text = self.serialize_field_values(value)
+            else:
+                value_text = self.indent(json.dumps(value, indent=2, ensure_ascii=False), 2)
+            parts.append(f"{json.dumps(key, ensure_ascii=False)}: {value_text}")
+        if not parts:
+            return "{}"
+        return "{\n  " + ",\n  ".join(parts) + "\n}"
+
+    def serialize_field_values(self, field_values):
+        """Serialisiert field_values; nur geänderte Kategorien werden neu kodiert."""
+        fragments = []
+        cache = {}
+        for category, values in field_values.items():
+            cached = self.fragment_cache.get(category)
+            if cached is not None and cached[0] == values:
+                fragment = cached[1]
+            else:
+                value_text = self.indent(json.dumps(values, indent=2, ensure_ascii=False), 4)
+                fragment = f"{json.dumps(category, ensure_ascii=False)}: {value_text}"
+            cache[category] = (values, fragment)
+            fragments.append(fragment)
+        self.fragment_cache = cache
+        if not fragments:
+            return "{}"
+        return "{\n    " + ",\n    ".join(fragments) + "\n  }"
+
+    def indent(self, text, width):
+        """Rückt alle Folgezeilen eines JSON-Blocks um width Leerzeichen ein."""
+        return text.replace("\n", "\n" + " " * width)
+
+    def write(self, settings, generation=None):
+        """Schreibt die Einstellungen atomar über eine temporäre Datei."""
+        with self.write_lock, metrics.timer("settings.write"):
+            if generation is not None and generation != self.generation:
+                return
+            content = self.serialize(settings)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(temp_path, self.path)
+            except OSError:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
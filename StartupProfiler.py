@@ -0,0 +1,107 @@
+import contextlib
+import datetime
+import json
+import platform
+import sys
+import time
+
+
+class StartupProfiler:
+    """Misst die Dauer der Startphasen (Importe, __init__, GUI-Aufbau bis zum ersten Leerlauf).
+
+    Phasen werden immer erfasst (nur wenige perf_counter-Aufrufe); ausgegeben
+    wird der Bericht nur mit --profile-startup. Phasen lassen sich verschachteln;
+    nach finish() werden keine weiteren Phasen aufgezeichnet.
+    """
+
+    def __init__(self):
+        # Referenzzeitpunkt: Import dieses Moduls, also vor tkinter/ttkbootstrap
+        self.started = time.perf_counter()
+        self.phases = []
+        self.depth = 0
+        self.finished = False
+        self.total = None
+        self.profile = None
+
+    def begin(self, name):
+        """Startet eine Phase; liefert den Eintrag für end() (None nach finish())."""
+        if self.finished:
+            return None
+        entry = {"name": name, "depth": self.depth, "start": time.perf_counter() - self.started, "duration": None}
+        self.phases.append(entry)
+        self.depth += 1
+        return entry
+
+    def end(self, entry):
+        """Beendet eine mit begin() gestartete Phase."""
+        if entry is None or entry["duration"] is not None:
+            return
+        self.depth -= 1
+        entry["duration"] = time.perf_counter() - self.started - entry["start"]
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Misst einen (ggf. verschachtelten) Abschnitt des Starts."""
+        entry = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(entry)
+
+    def start_cprofile(self):
+        """Startet zusätzlich cProfile für den restlichen Start."""
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def finish(self):
+        """Beendet die Messung (z.B. beim ersten Leerlauf der Ereignisschleife)."""
+        if self.finished:
+            return
+        self.finished = True
+        self.total = time.perf_counter() - self.started
+        if self.profile is not None:
+            self.profile.disable()
+
+    def to_dict(self):
+        """Liefert die Messung als JSON-taugliches Dict (Zeiten in Millisekunden)."""
+        return {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "total_ms": round(self.total * 1000, 3) if self.total is not None else None,
+            "phases": [
+                {
+                    "name": entry["name"],
+                    "depth": entry["depth"],
+                    "start_ms": round(entry["start"] * 1000, 3),
+                    "duration_ms": round(entry["duration"] * 1000, 3) if entry["duration"] is not None else None,
+                }
+                for entry in self.phases
+            ],
+        }
+
+    def format_report(self):
+        """Formatiert die Phasen als eingerückte Tabelle."""
+        data = self.to_dict()
+        lines = [f"Startzeit gesamt: {data['total_ms']:.1f} ms"]
+        for entry in data["phases"]:
+            duration = entry["duration_ms"]
+            duration_text = f"{duration:9.1f} ms" if duration is not None else "        - ms"
+            label = "  " * entry["depth"] + entry["name"]
+            lines.append(f"  {label:<44} {duration_text}   (ab {entry['start_ms']:.1f} ms)")
+        return "\n".join(lines)
+
+    def write_report(self, path):
+        """Hängt die Messung als JSONL-Zeile an, damit sich das Startbudget über Versionen verfolgen lässt."""
+        with open(path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+    def dump_cprofile(self, path):
+        """Schreibt die cProfile-Statistik (auswertbar mit pstats oder snakeviz)."""
+        if self.profile is not None:
+            self.profile.dump_stats(path)
+
+
+startup_profiler = StartupProfiler()
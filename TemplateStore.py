@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+
+from RuntimeMetrics import metrics
+
+
+class TemplateStore:
+    """Vorlagen-Bibliothek in SQLite statt einer einzigen prompt_templates.json.
+
+    Speichern und Löschen ändern nur die betroffene Zeile in einer Transaktion.
+    Vorlagen werden pro Kategorie erst beim ersten Zugriff geladen. Eine
+    vorhandene prompt_templates.json wird einmalig übernommen.
+    """
+
+    def __init__(self, path="prompt_templates.db", legacy_path="prompt_templates.json"):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.connection = sqlite3.connect(path)
+        # Kategorie → {Vorlagenname: Feldwerte} in Speicherreihenfolge
+        self.category_cache = {}
+        self.create_schema()
+        self.migrate_legacy_templates()
+
+    def create_schema(self):
+        """Legt die Tabellen an, falls sie noch nicht existieren."""
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS templates ("
+                "category TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL, "
+                "PRIMARY KEY (category, name))"
+            )
+
+    def migrate_legacy_templates(self):
+        """Übernimmt eine alte prompt_templates.json einmalig in die Datenbank."""
+        if self.connection.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+            return
+
+        templates = {}
+        if self.legacy_path and os.path.exists(self.legacy_path):
+            try:
+                with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    templates = loaded
+            except Exception:
+                templates = {}
+
+        with self.connection:
+            for category, category_templates in templates.items():
+                if not isinstance(category_templates, dict):
+                    continue
+                for name, data in category_templates.items():
+                    if isinstance(data, dict):
+                        self.upsert(category, name, data)
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated', '1')")
+
+    def upsert(self, category, name, data):
+        """Fügt eine Vorlage ein oder ersetzt sie; die ursprüngliche Reihenfolge bleibt erhalten."""
+        self.connection.execute(
+            "INSERT INTO templates (category, name, data) VALUES (?, ?, ?) "
+            "ON CONFLICT (category, name) DO UPDATE SET data = excluded.data",
+            (category, name, json.dumps(data, ensure_ascii=False)),
+        )
+
+    def get_category(self, category):
+        """Liefert alle Vorlagen einer Kategorie; wird beim ersten Zugriff geladen."""
+        templates = self.category_cache.get(category)
+        if templates is None:
+            templates = {}
+            rows = self.connection.execute(
+                "SELECT name, data FROM templates WHERE category = ? ORDER BY rowid", (category,)
+            )
+            for name, data in rows:
+                try:
+                    templates[name] = json.loads(data)
+                except ValueError:
+                    continue
+            self.category_cache[category] = templates
+        return templates
+
+    def get_names(self, category):
+        """Liefert die Vorlagennamen einer Kategorie."""
+        return list(self.get_category(category))
+
+    def get(self, category, name):
+        """Liefert die Feldwerte einer Vorlage oder None."""
+        return self.get_category(category).get(name)
+
+    def save(self, category, name, data):
+        """Speichert eine einzelne Vorlage transaktional."""
+        with metrics.timer("templates.save"), self.connection:
+            self.upsert(category, name, data)
+        if category in self.category_cache:
+            self.category_cache[category][name] = dict(data)
+
+    def delete(self, category, name):
+        """Löscht eine einzelne Vorlage; liefert True, falls sie existierte."""
+        with metrics.timer("templates.delete"), self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM templates WHERE category = ? AND name = ?", (category, name)
+            )
+        if category in self.category_cache:
+            self.category_cache[category].pop(name, None)
+        return cursor.rowcount > 0
+
+    def close(self):
+        self.connection.close()
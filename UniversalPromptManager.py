@@ -1,11 +1,41 @@
-import tkinter as tk
-from tkinter import messagebox, filedialog, simpledialog, scrolledtext
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import PRIMARY, SECONDARY, SUCCESS, DANGER, INFO, WARNING, OUTLINE, INVERSE
+from StartupProfiler import startup_profiler
+
+import argparse
 import json
+import multiprocessing
 import os
+import queue
+import sys
+import threading
 import datetime
 
+with startup_profiler.phase("import app modules"):
+    from PromptEngine import PromptEngine, CategoryWatcher, IncrementalRenderer, CATEGORIES, CATEGORY_KEY_MAP
+    from SettingsStore import SettingsStore
+    from PromptHistory import PromptHistory, HistorySearchIndex
+    from TemplateStore import TemplateStore
+    from ResourceBundle import default_bundle_path
+    from RuntimeMetrics import metrics
+
+# GUI-Module werden erst von load_gui_modules() geladen, damit Engine, Batch-Modus
+# und Benchmarks ohne tkinter/ttkbootstrap (z.B. auf Servern ohne Tk) auskommen
+tk = ttk = None
+messagebox = filedialog = simpledialog = scrolledtext = None
+PRIMARY = SECONDARY = SUCCESS = DANGER = INFO = WARNING = OUTLINE = INVERSE = None
+
+
+def load_gui_modules():
+    """Importiert tkinter und ttkbootstrap beim ersten Aufruf."""
+    global tk, ttk, messagebox, filedialog, simpledialog, scrolledtext
+    global PRIMARY, SECONDARY, SUCCESS, DANGER, INFO, WARNING, OUTLINE, INVERSE
+    if ttk is not None:
+        return
+    with startup_profiler.phase("import tkinter/ttkbootstrap"):
+        import tkinter as tk
+        from tkinter import messagebox, filedialog, simpledialog, scrolledtext
+        import ttkbootstrap as ttk
+        from ttkbootstrap.constants import PRIMARY, SECONDARY, SUCCESS, DANGER, INFO, WARNING, OUTLINE, INVERSE
+
 
 def resource_path(relative_path):
     """Liefert Ressourcenpfade für dev und PyInstaller onefile."""
@@ -14,123 +44,40 @@ def resource_path(relative_path):
 
 class UniversalPromptManager:
     def __init__(self, root):
+        load_gui_modules()
         self.root = root
         self.root.title("Universal Prompt Manager")
-        self.set_window_icon()
+        with startup_profiler.phase("set_window_icon"):
+            self.set_window_icon()
         self.default_window_geometry = "1580x1580"
 
         # Sprachsystem
         self.languages_file = "upmlanguages.json"
         self.settings_file = "app_settings.json"
-        self.languages = self.load_languages()
+        self.settings_store = SettingsStore(self.settings_file)
+        self.categories_dir = "categories"
+        with startup_profiler.phase("load_languages"):
+            self.engine = PromptEngine(self.categories_dir, self.languages_file, bundle_file=default_bundle_path())
+        # Sprachcode → Sprachname; die Übersetzungen selbst lädt die Engine pro Sprache bei Bedarf
+        self.languages = self.engine.language_names
         self.current_language = "de"
         self.language_display_to_code = {}
-        self.settings = self.load_settings()
-        self.apply_saved_window_geometry()
+        with startup_profiler.phase("load_settings"):
+            self.settings = self.load_settings()
+            self.apply_saved_window_geometry()
         saved_language = self.settings.get("current_language")
         if isinstance(saved_language, str) and saved_language in self.languages:
             self.current_language = saved_language
 
         # Kategorie-Mapping: interner Schlüssel → Übersetzungs-Key
-        self.category_key_map = {
-            "Architektur": "cat_architecture",
-            "Automatisierung / Workflow": "cat_automation",
-            "Bildbeschreibung": "cat_image_desc",
-            "Businessplan": "cat_businessplan",
-            "Technische Probleme": "cat_technical_issues",
-            "Feedback und Vorschlaege": "cat_feedback_suggestions",
-            "Produktinformationen": "cat_product_information",
-            "Bestellungsanfragen": "cat_order_inquiries",
-            "Ruecksendungen und Umtausch": "cat_returns_exchanges",
-            "Zahlungsanfragen": "cat_payment_inquiries",
-            "Lieferungsanfragen": "cat_delivery_inquiries",
-            "Garantie und Reparaturen": "cat_warranty_repairs",
-            "Datenschutz und Sicherheit": "cat_privacy_security",
-            "Karriere und Stellenangebote": "cat_careers_jobs",
-            "Presse und Medienanfragen": "cat_press_media_inquiries",
-            "Partnerschaften und Kooperationen": "cat_partnerships_cooperations",
-            "Veranstaltungen und Webinare": "cat_events_webinars",
-            "Account und Login": "cat_account_login",
-            "Rechnungen und Belege": "cat_invoices_receipts",
-            "Vertragsaenderung und Kuendigung": "cat_contract_changes_cancellation",
-            "Allgemeine/Sonstige Anfragen": "cat_general_inquiries",
-            "Datenanalyse / SQL": "cat_data_analysis",
-            "Dokumentation": "cat_documentation",
-            "E-Mail / Kommunikation": "cat_email",
-            "Eigene Vorlage": "cat_custom",
-            "Ernährungsplan": "cat_nutrition",
-            "KI-Kunst": "cat_ai_art",
-            "Marketing": "cat_marketing",
-            "Präsentationen / Pitch Deck": "cat_presentations",
-            "Produktanforderungen": "cat_specification",
-            "SEO / Blog / Content": "cat_seo_content",
-            "Social Media": "cat_social_media",
-            "Sourcecode": "cat_sourcecode",
-            "UX/UI Konzept": "cat_ux_ui",
-        }
+        self.category_key_map = dict(CATEGORY_KEY_MAP)
         self.category_display_to_internal = {}
         
         # Prompt-Kategorien
-        self.categories = {
-            "Architektur": "architecture",
-            "Automatisierung / Workflow": "automation",
-            "Bildbeschreibung": "image_description",
-            "Businessplan": "businessplan",
-            "Technische Probleme": "technical_issues",
-            "Feedback und Vorschlaege": "feedback_suggestions",
-            "Produktinformationen": "product_information",
-            "Bestellungsanfragen": "order_inquiries",
-            "Ruecksendungen und Umtausch": "returns_exchanges",
-            "Zahlungsanfragen": "payment_inquiries",
-            "Lieferungsanfragen": "delivery_inquiries",
-            "Garantie und Reparaturen": "warranty_repairs",
-            "Datenschutz und Sicherheit": "privacy_security",
-            "Karriere und Stellenangebote": "careers_jobs",
-            "Presse und Medienanfragen": "press_media_inquiries",
-            "Partnerschaften und Kooperationen": "partnerships_cooperations",
-            "Veranstaltungen und Webinare": "events_webinars",
-            "Account und Login": "account_login",
-            "Rechnungen und Belege": "invoices_receipts",
-            "Vertragsaenderung und Kuendigung": "contract_changes_cancellation",
-            "Allgemeine/Sonstige Anfragen": "general_inquiries",
-            "Datenanalyse / SQL": "data_analysis",
-            "Dokumentation": "documentation",
-            "E-Mail / Kommunikation": "email",
-            "Eigene Vorlage": "custom",
-            "Ernährungsplan": "nutrition",
-            "KI-Kunst": "ai_art",
-            "Marketing": "marketing",
-            "Präsentationen / Pitch Deck": "presentations",
-            "Produktanforderungen": "specification",
-            "SEO / Blog / Content": "seo_content",
-            "Social Media": "social_media",
-            "Sourcecode": "sourcecode",
-            "UX/UI Konzept": "ux_ui",
-        }
-
-        # Fallback auf bestehende Methoden, falls externe JSON-Datei fehlt
-        self.category_fallback_fields = {
-            "architecture": self.get_architecture_fields,
-            "image_description": self.get_image_description_fields,
-            "sourcecode": self.get_sourcecode_fields,
-            "ai_art": self.get_ai_art_fields,
-            "marketing": self.get_marketing_fields,
-            "nutrition": self.get_nutrition_fields,
-            "custom": self.get_custom_fields,
-            "specification": self.get_specification_fields,
-            "ux_ui": self.get_ux_ui_fields,
-            "social_media": self.get_social_media_fields,
-            "seo_content": self.get_seo_content_fields,
-            "businessplan": self.get_businessplan_fields,
-            "data_analysis": self.get_data_analysis_fields,
-            "automation": self.get_automation_fields,
-            "email": self.get_email_fields,
-            "presentations": self.get_presentations_fields,
-            "documentation": self.get_documentation_fields,
-        }
-
-        self.categories_dir = "categories"
-        self.category_cache = {}
+        self.categories = dict(CATEGORIES)
+        self.category_cache = self.engine.category_cache
+        with startup_profiler.phase("refresh_category_index"):
+            self.engine.refresh_category_index(self.categories.values())
         
         # Aktuelle Kategorie
         self.current_category = "Architektur"
@@ -138,15 +85,34 @@ class UniversalPromptManager:
         if isinstance(saved_category, str) and saved_category in self.categories:
             self.current_category = saved_category
         
-        # Template-System
+        # Template-System (SQLite, einmalige Übernahme aus prompt_templates.json)
         self.templates_file = "prompt_templates.json"
-        self.templates = self.load_templates()
+        with startup_profiler.phase("open template store"):
+            self.template_store = TemplateStore("prompt_templates.db", self.templates_file)
+
+        # Prompt-History (append-only JSONL)
+        with startup_profiler.phase("open history"):
+            self.history = PromptHistory("prompt_history.jsonl", "prompt_history.json")
+        self.history_index = None
+        self.history_index_ready = threading.Event()
+
+        # Live-Vorschau: geänderte Felder sammeln und verzögert nur betroffene Zeilen neu rendern
+        self.live_preview_delay_ms = 150
+        self.live_preview_job = None
+        self.live_preview_pending = set()
+        self.live_preview_renderer = None
         
         # GUI aufbauen
-        self.setup_gui()
+        with startup_profiler.phase("setup_gui"):
+            self.setup_gui()
         
         # Erste Kategorie laden
-        self.load_category_fields()
+        with startup_profiler.phase("load_category_fields"):
+            self.load_category_fields()
+
+        # Kategorie-Dateien auf Änderungen überwachen (Hot-Reload)
+        self.category_watch_interval_ms = 2000
+        self.start_category_watch()
 
     def set_window_icon(self):
         """Setzt das Fenster-Icon mit PNG, Fallback auf ICO."""
@@ -166,45 +132,28 @@ class UniversalPromptManager:
         except Exception:
             pass
     
-    def load_templates(self):
-        """Lädt gespeicherte Vorlagen"""
-        if os.path.exists(self.templates_file):
-            try:
-                with open(self.templates_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def save_templates(self):
-        """Speichert Vorlagen"""
-        with open(self.templates_file, 'w', encoding='utf-8') as f:
-            json.dump(self.templates, f, indent=2, ensure_ascii=False)
-
     def load_settings(self):
         """Lädt persistente Anwendungseinstellungen."""
-        if os.path.exists(self.settings_file):
-            try:
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    if isinstance(loaded, dict):
-                        return loaded
-            except Exception:
-                pass
-        return {}
-
-    def save_settings(self):
-        """Speichert persistente Anwendungseinstellungen."""
-        self.settings["current_language"] = self.current_language
-        self.settings["current_category"] = self.current_category
-        self.settings["window_geometry"] = self.get_current_window_geometry()
-        with open(self.settings_file, 'w', encoding='utf-8') as f:
-            json.dump(self.settings, f, indent=2, ensure_ascii=False)
-
-    def get_current_window_geometry(self):
+        return self.settings_store.load()
+
+    def save_settings(self, flush=False):
+        """Speichert persistente Anwendungseinstellungen (verzögert im Hintergrund, bei flush sofort)."""
+        # Gemessen wird die Zeit, die der GUI-Thread blockiert ist
+        with metrics.timer("gui.save_settings"):
+            self.settings["current_language"] = self.current_language
+            self.settings["current_category"] = self.current_category
+            self.settings["window_geometry"] = self.get_current_window_geometry(refresh=flush)
+            if flush:
+                self.settings_store.flush(self.settings)
+            else:
+                self.settings_store.save(self.settings)
+
+    def get_current_window_geometry(self, refresh=False):
         """Liefert die aktuelle Fenstergeometrie fuer die Persistenz."""
         try:
-            self.root.update_idletasks()
+            # Layout nur beim Beenden erzwingen; sonst genügen die zuletzt bekannten Maße
+            if refresh:
+                self.root.update_idletasks()
             width = self.root.winfo_width()
             height = self.root.winfo_height()
             x_pos = self.root.winfo_x()
@@ -251,14 +200,18 @@ class UniversalPromptManager:
         saved_values = stored_field_values.get(category_name, {})
         return saved_values if isinstance(saved_values, dict) else {}
 
-    def save_current_state(self):
+    def save_current_state(self, flush=False):
         """Speichert Kategorie, Sprache und aktuelle Feldwerte persistiert."""
         self.save_current_field_values()
-        self.save_settings()
+        self.save_settings(flush=flush)
 
     def on_app_close(self):
         """Persistiert den letzten Zustand vor dem Schließen der Anwendung."""
-        self.save_current_state()
+        self.save_current_state(flush=True)
+        self.history.close()
+        if self.history_index is not None:
+            self.history_index.close()
+        self.template_store.close()
         self.root.destroy()
 
     def reset_saved_state(self):
@@ -270,68 +223,33 @@ class UniversalPromptManager:
             return
 
         self.settings = {}
-        if os.path.exists(self.settings_file):
-            try:
-                os.remove(self.settings_file)
-            except OSError:
-                with open(self.settings_file, 'w', encoding='utf-8') as f:
-                    json.dump({}, f, indent=2, ensure_ascii=False)
+        self.settings_store.reset()
 
         self.current_language = "de"
         self.current_category = "Architektur"
         self.root.geometry(self.default_window_geometry)
         self.refresh_language_options()
         self.apply_ui_language()
+        self.discard_category_widget_sets()
+        self.live_preview_var.set(False)
+        self.cancel_live_preview()
         self.load_category_fields()
         self.update_template_list()
         self.preview_text.delete('1.0', tk.END)
         self.status_var.set(self.tr("status_state_reset"))
         messagebox.showinfo(self.tr("msg_success_title"), self.tr("msg_state_reset_done"))
 
-    def load_languages(self):
-        """Lädt die Übersetzungen aus einer JSON-Datei."""
-        default_languages = {
-            "de": {
-                "lang_name": "Deutsch",
-                "app_title": "Universal Prompt Manager",
-                "label_category": "Kategorie:",
-                "label_template": "Vorlage:",
-                "label_language": "Sprache:",
-                "status_ready": "Bereit"
-            }
-        }
-        if os.path.exists(self.languages_file):
-            try:
-                with open(self.languages_file, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    if isinstance(loaded, dict) and loaded:
-                        return loaded
-            except Exception:
-                pass
-        return default_languages
-
     def tr(self, key, **kwargs) -> str:
         """Liefert einen übersetzten Text mit Fallback auf Deutsch."""
-        de_pack = self.languages.get("de", {})
-        lang_pack = self.languages.get(self.current_language, de_pack)
-        raw_text = lang_pack.get(key, de_pack.get(key, key))
-        text = raw_text if isinstance(raw_text, str) else str(raw_text)
-        if kwargs:
-            try:
-                return text.format(**kwargs)
-            except Exception:
-                return text
-        return text
+        return self.engine.tr(key, self.current_language, **kwargs)
 
     def get_category_display_name(self, internal_key):
         """Liefert den sichtbaren Kategorienamen aus category JSON mit Fallback auf upmlanguages."""
         category_id = self.categories.get(internal_key)
         if category_id:
-            definition = self.load_category_definition(category_id)
-            if isinstance(definition, dict):
-                category_name = self.resolve_localized_value(definition.get("category_name"))
-                if isinstance(category_name, str) and category_name.strip():
-                    return category_name
+            category_name = self.engine.get_category_display_name(category_id, self.current_language)
+            if category_name:
+                return category_name
 
         translation_key = self.category_key_map.get(internal_key)
         if translation_key:
@@ -354,19 +272,19 @@ class UniversalPromptManager:
         """Aktualisiert Sprachliste und Mapping für die Sprachauswahl."""
         options = []
         self.language_display_to_code.clear()
-        for code, language_pack in self.languages.items():
-            display = language_pack.get("lang_name", code)
+        for code, display in self.languages.items():
             options.append(display)
             self.language_display_to_code[display] = code
 
         self.language_combo['values'] = options
-        current_display = self.languages.get(self.current_language, {}).get("lang_name", self.current_language)
+        current_display = self.languages.get(self.current_language, self.current_language)
         self.language_var.set(current_display)
 
     def apply_ui_language(self):
         """Aktualisiert die sichtbaren UI-Texte anhand der gewählten Sprache."""
         self.root.title(self.tr("app_title"))
-        self.refresh_category_options()
+        with startup_profiler.phase("refresh_category_options"):
+            self.refresh_category_options()
         self.category_label.config(text=self.tr("label_category"))
         self.template_label.config(text=self.tr("label_template"))
         self.language_label.config(text=self.tr("label_language"))
@@ -381,12 +299,14 @@ class UniversalPromptManager:
         self.shorten_button.config(text=self.tr("btn_shorten"))
         self.expand_button.config(text=self.tr("btn_expand"))
         self.quick_copy_button.config(text=self.tr("btn_copy"))
+        self.live_preview_check.config(text=self.tr("label_live_preview"))
 
         self.generate_button.config(text=self.tr("btn_generate"))
         self.copy_button.config(text=self.tr("btn_copy"))
         self.export_button.config(text=self.tr("btn_export"))
         self.reset_state_button.config(text=self.tr("btn_reset_state"))
         self.history_button.config(text=self.tr("btn_history"))
+        self.diagnostics_button.config(text=self.tr("btn_diagnostics"))
 
         self.status_var.set(self.tr("status_ready"))
 
@@ -396,6 +316,8 @@ class UniversalPromptManager:
         selected_code = self.language_display_to_code.get(selected_display, "de")
         self.save_current_field_values()
         self.current_language = selected_code
+        # Sprachpaket erst jetzt laden (flache Tabelle mit deutschem Fallback)
+        self.engine.get_translations(selected_code)
         self.save_settings()
         self.refresh_language_options()
         self.apply_ui_language()
@@ -457,6 +379,10 @@ class UniversalPromptManager:
         # Dynamische Eingabefelder werden hier eingefügt
         self.input_fields = {}
         self.field_vars = {}
+
+        # Widget-Pool: pro Kategorie einmal aufgebaute Eingabefelder
+        self.category_widget_sets = {}
+        self.active_widget_set = None
         
         # Rechte Spalte: Prompt-Ausgabe
         self.output_frame = ttk.Labelframe(content_frame, text="Generierter Prompt", padding=10, bootstyle=INFO)
@@ -482,6 +408,10 @@ class UniversalPromptManager:
         self.expand_button.pack(side='left', padx=2)
         self.quick_copy_button = ttk.Button(optimize_frame, text="📋 Kopieren", command=self.copy_to_clipboard, bootstyle=(SUCCESS, OUTLINE))
         self.quick_copy_button.pack(side='left', padx=2)
+        self.live_preview_var = tk.BooleanVar(value=bool(self.settings.get("live_preview", False)))
+        self.live_preview_check = ttk.Checkbutton(optimize_frame, text="Live-Vorschau", variable=self.live_preview_var,
+                                                  command=self.on_live_preview_toggle, bootstyle="info-round-toggle")
+        self.live_preview_check.pack(side='right', padx=2)
         
         # Untere Leiste: Aktions-Buttons
         bottom_frame = ttk.Frame(main_container)
@@ -497,6 +427,8 @@ class UniversalPromptManager:
         self.reset_state_button.pack(side='right', padx=5)
         self.history_button = ttk.Button(bottom_frame, text="🕘 History", command=self.show_history, bootstyle=(SECONDARY, OUTLINE))
         self.history_button.pack(side='right', padx=5)
+        self.diagnostics_button = ttk.Button(bottom_frame, text="🩺 Diagnose", command=self.show_diagnostics, bootstyle=(SECONDARY, OUTLINE))
+        self.diagnostics_button.pack(side='right', padx=5)
         
         # Statusleiste
         self.status_var = tk.StringVar(value=self.tr("status_ready"))
@@ -508,6 +440,56 @@ class UniversalPromptManager:
         # Templates aktualisieren
         self.update_template_list()
     
+    def start_category_watch(self):
+        """Startet das stat-basierte Polling der Kategorie-Dateien."""
+        self.category_watcher = CategoryWatcher(self.engine, self.categories.values())
+        self.category_reload_queue = queue.Queue()
+        self.root.after(self.category_watch_interval_ms, self.poll_category_changes)
+
+    def poll_category_changes(self):
+        """Prüft auf geänderte Kategorie-Dateien und übernimmt fertig neu geladene Kategorien."""
+        changed = self.category_watcher.poll()
+        if changed:
+            threading.Thread(
+                target=self.reload_categories_in_background,
+                args=(changed,),
+                daemon=True,
+            ).start()
+
+        while True:
+            try:
+                reloaded = self.category_reload_queue.get_nowait()
+            except queue.Empty:
+                break
+            # Die Caches der Engine werden nur hier im Tk-Hauptthread verändert
+            for category_id, definition, index_entry in reloaded:
+                self.engine.install_category(category_id, definition, index_entry, self.current_language)
+            self.on_categories_reloaded([category_id for category_id, _, _ in reloaded])
+
+        self.root.after(self.category_watch_interval_ms, self.poll_category_changes)
+
+    def reload_categories_in_background(self, category_ids):
+        """Liest und parst geänderte Kategorie-Dateien außerhalb des Tk-Hauptthreads."""
+        self.category_reload_queue.put([
+            (category_id, *self.engine.read_category_definition(category_id))
+            for category_id in category_ids
+        ])
+
+    def on_categories_reloaded(self, category_ids):
+        """Aktualisiert Kategorieliste und, falls betroffen, die Felder der aktiven Kategorie."""
+        self.refresh_category_options()
+        if self.categories.get(self.current_category) in category_ids:
+            self.save_current_field_values()
+        self.discard_category_widget_sets(
+            category_name for category_name, category_id in self.categories.items()
+            if category_id in category_ids
+        )
+        if self.active_widget_set is None:
+            self.load_category_fields()
+        else:
+            self.schedule_live_preview(full=True)
+        self.status_var.set(self.tr("status_categories_reloaded", count=len(category_ids)))
+
     def on_category_change(self, event=None):
         """Wechselt die Kategorie"""
         selected_display = self.category_var.get()
@@ -520,18 +502,60 @@ class UniversalPromptManager:
         self.status_var.set(self.tr("status_category_changed", category=cat_display))
     
     def load_category_fields(self):
-        """Lädt die Eingabefelder für die aktuelle Kategorie"""
-        # Alte Felder löschen
-        for old_widget in self.input_frame.winfo_children():
-            old_widget.destroy()
-        
-        self.input_fields.clear()
-        self.field_vars.clear()
-        
-        # Neue Felder erstellen
+        """Zeigt die Eingabefelder der aktuellen Kategorie (aus dem Widget-Pool oder neu aufgebaut)"""
         category_id = self.categories.get(self.current_category, "custom")
+        with metrics.timer(f"gui.load_category_fields.{category_id}"):
+            self.show_category_widget_set()
+
+    def show_category_widget_set(self):
+        """Blendet den Widget-Satz der aktuellen Kategorie ein und baut ihn bei Bedarf auf."""
+        if self.active_widget_set is not None:
+            self.active_widget_set["frame"].grid_remove()
+
+        widget_set = self.category_widget_sets.get(self.current_category)
+        if widget_set is None:
+            widget_set = self.build_category_widget_set(self.current_category)
+            self.category_widget_sets[self.current_category] = widget_set
+
+        self.active_widget_set = widget_set
+        self.input_fields = widget_set["input_fields"]
+        self.field_vars = widget_set["field_vars"]
+
+        # Bei Sprachwechsel nur Beschriftungen, Optionen und Werte umstellen
+        if widget_set["language"] != self.current_language:
+            self.relabel_category_widget_set(widget_set)
+
+        widget_set["frame"].grid(row=0, column=0, sticky='nsew')
+        self.schedule_live_preview(full=True)
+
+    def get_field_label_text(self, field_config):
+        """Liefert den sichtbaren Feldnamen aus label_text oder Übersetzungs-Key."""
+        label_text = field_config.get("label_text")
+        if not label_text:
+            label_value = field_config.get("label", "")
+            if isinstance(label_value, str) and label_value.startswith("field_"):
+                label_text = self.tr(label_value)
+            else:
+                label_text = str(label_value)
+        return label_text
+
+    def build_category_widget_set(self, category_name):
+        """Erstellt die Eingabefelder einer Kategorie in einem eigenen Frame"""
+        frame = ttk.Frame(self.input_frame)
+        widget_set = {
+            "frame": frame,
+            "input_fields": {},
+            "field_vars": {},
+            "labels": {},
+            "language": self.current_language,
+        }
+        input_fields = widget_set["input_fields"]
+        field_vars = widget_set["field_vars"]
+
+        # Neue Felder erstellen
+        category_id = self.categories.get(category_name, "custom")
         fields = self.get_category_fields(category_id)
-        saved_values = self.get_saved_field_values(self.current_category)
+        saved_values = self.get_saved_field_values(category_name)
 
         for field_name, saved_value in saved_values.items():
             if field_name in fields:
@@ -541,15 +565,9 @@ class UniversalPromptManager:
         row = 0
         for field_name, field_config in fields.items():
             # Label
-            label_text = field_config.get("label_text")
-            if not label_text:
-                label_value = field_config.get("label", "")
-                if isinstance(label_value, str) and label_value.startswith("field_"):
-                    label_text = self.tr(label_value)
-                else:
-                    label_text = str(label_value)
-            label = ttk.Label(self.input_frame, text=label_text + ":")
+            label = ttk.Label(frame, text=self.get_field_label_text(field_config) + ":")
             label.grid(row=row, column=0, sticky='w', pady=5, padx=(0, 10))
+            widget_set["labels"][field_name] = label
             
             # Eingabefeld basierend auf Typ
             field_type = field_config.get("type", "entry")
@@ -558,21 +576,23 @@ class UniversalPromptManager:
 
             if field_type == "entry":
                 var = tk.StringVar(value=field_config.get("default", ""))
-                widget = ttk.Entry(self.input_frame, textvariable=var, width=40)
+                widget = ttk.Entry(frame, textvariable=var, width=40)
                 
             elif field_type == "combobox":
                 var = tk.StringVar(value=field_config.get("default", ""))
-                widget = ttk.Combobox(self.input_frame, textvariable=var, 
+                widget = ttk.Combobox(frame, textvariable=var, 
                                      values=field_config.get("options", []), width=37)
                 
             elif field_type == "text":
                 var = tk.StringVar(value=field_config.get("default", ""))
-                widget = scrolledtext.ScrolledText(self.input_frame, height=4, width=40)
+                widget = scrolledtext.ScrolledText(frame, height=4, width=40)
                 widget.insert('1.0', var.get())
+                widget.edit_modified(False)
+                widget.bind('<<Modified>>', lambda event, name=field_name: self.on_text_field_modified(event, name))
                 # Spezielle Behandlung für Text-Widgets
                 widget.grid(row=row, column=1, sticky='ew', pady=5)
-                self.input_fields[field_name] = {"widget": widget, "type": "text"}
-                self.field_vars[field_name] = var
+                input_fields[field_name] = {"widget": widget, "type": "text"}
+                field_vars[field_name] = var
                 row += 1
                 continue
                 
@@ -583,7 +603,7 @@ class UniversalPromptManager:
                 else:
                     checkbox_default = bool(raw_default)
                 var = tk.BooleanVar(value=checkbox_default)
-                widget = ttk.Checkbutton(self.input_frame, variable=var)
+                widget = ttk.Checkbutton(frame, variable=var)
                 
             elif field_type == "spinbox":
                 var = tk.StringVar(value=str(field_config.get("default", 1)))
@@ -597,174 +617,81 @@ class UniversalPromptManager:
                     max_float = float(max_value)
                 except (TypeError, ValueError):
                     max_float = 10.0
-                widget = ttk.Spinbox(self.input_frame, textvariable=var, 
+                widget = ttk.Spinbox(frame, textvariable=var, 
                                     from_=min_float,
                                     to=max_float, width=10)
             
             if widget is not None:
                 widget.grid(row=row, column=1, sticky='ew', pady=5)
-                self.input_fields[field_name] = {"widget": widget, "type": field_type}
+                input_fields[field_name] = {"widget": widget, "type": field_type}
             if var is not None:
-                self.field_vars[field_name] = var
+                field_vars[field_name] = var
+                var.trace_add('write', lambda *args, name=field_name: self.on_field_edited(name))
             
             row += 1
 
-    def resolve_localized_value(self, value):
-        """Liefert einen sprachabhängigen Wert mit Fallback auf Deutsch."""
-        if not isinstance(value, dict):
-            return value
+        return widget_set
 
-        if self.current_language in value:
-            return value[self.current_language]
-        if "de" in value:
-            return value["de"]
-        if value:
-            return next(iter(value.values()))
-        return ""
-
-    def localize_saved_field_value(self, category_id, field_name, saved_value):
-        """Überführt gespeicherte lokalisierte Auswahl-/Defaultwerte in die aktuelle Sprache."""
-        if not isinstance(saved_value, str) or not saved_value:
-            return saved_value
-
-        definition = self.load_category_definition(category_id)
-        if not definition:
-            return saved_value
-
-        raw_fields = definition.get("fields", [])
-        field_definition = next(
-            (field for field in raw_fields if isinstance(field, dict) and field.get("key") == field_name),
-            None,
-        )
-        if not field_definition:
-            return saved_value
-
-        option_mapping = self.build_localized_option_mapping(field_definition.get("options"))
-        if saved_value in option_mapping:
-            return option_mapping[saved_value]
-
-        default_mapping = self.build_localized_scalar_mapping(field_definition.get("default"))
-        return default_mapping.get(saved_value, saved_value)
-
-    def build_localized_option_mapping(self, options):
-        """Erzeugt ein Mapping lokalisierter Optionswerte auf den Wert der aktuellen Sprache."""
-        if not isinstance(options, dict):
-            return {}
+    def relabel_category_widget_set(self, widget_set):
+        """Stellt einen gecachten Widget-Satz auf die aktuelle Sprache um, ohne Widgets neu zu bauen."""
+        category_id = self.categories.get(self.current_category, "custom")
+        fields = self.get_category_fields(category_id)
+        current_values = {
+            field_name: self.get_field_value(field_name)
+            for field_name in widget_set["input_fields"]
+        }
 
-        current_options = options.get(self.current_language)
-        if not isinstance(current_options, list):
-            current_options = options.get("de")
-        if not isinstance(current_options, list):
-            for values in options.values():
-                if isinstance(values, list):
-                    current_options = values
-                    break
-        if not isinstance(current_options, list):
-            return {}
+        for field_name, field_config in fields.items():
+            label = widget_set["labels"].get(field_name)
+            if label is not None:
+                label.config(text=self.get_field_label_text(field_config) + ":")
 
-        mapping = {}
-        for values in options.values():
-            if not isinstance(values, list):
+            field_info = widget_set["input_fields"].get(field_name)
+            if not field_info:
                 continue
-            for index, option_value in enumerate(values):
-                if index < len(current_options):
-                    mapping[option_value] = current_options[index]
-        return mapping
-
-    def build_localized_scalar_mapping(self, value):
-        """Erzeugt ein Mapping lokalisierter Einzelwerte auf den Wert der aktuellen Sprache."""
-        if not isinstance(value, dict):
-            return {}
+            if field_info["type"] == "combobox":
+                field_info["widget"].config(values=field_config.get("options", []))
+
+            localized_value = self.localize_saved_field_value(category_id, field_name, current_values.get(field_name))
+            if field_info["type"] == "text":
+                field_info["widget"].delete('1.0', tk.END)
+                field_info["widget"].insert('1.0', localized_value)
+            elif field_name in widget_set["field_vars"]:
+                widget_set["field_vars"][field_name].set(localized_value)
+
+        widget_set["language"] = self.current_language
+
+    def discard_category_widget_sets(self, category_names=None):
+        """Entfernt gecachte Widget-Sätze (alle oder die angegebenen Kategorien)."""
+        names = list(self.category_widget_sets) if category_names is None else list(category_names)
+        for category_name in names:
+            widget_set = self.category_widget_sets.pop(category_name, None)
+            if widget_set is None:
+                continue
+            if widget_set is self.active_widget_set:
+                self.active_widget_set = None
+            widget_set["frame"].destroy()
 
-        target_value = self.resolve_localized_value(value)
-        return {
-            localized_value: target_value
-            for localized_value in value.values()
-            if isinstance(localized_value, str)
-        }
+    def resolve_localized_value(self, value):
+        """Liefert einen sprachabhängigen Wert mit Fallback auf Deutsch."""
+        return self.engine.resolve_localized_value(value, self.current_language)
+
+    def localize_saved_field_value(self, category_id, field_name, saved_value):
+        """Überführt gespeicherte lokalisierte Auswahl-/Defaultwerte in die aktuelle Sprache."""
+        return self.engine.localize_saved_field_value(category_id, field_name, saved_value, self.current_language)
 
     def load_category_definition(self, category_id):
         """Lädt eine Kategorie-Definition aus JSON (mit einfachem Cache)."""
-        if category_id in self.category_cache:
-            return self.category_cache[category_id]
-
-        candidate_paths = [
-            os.path.join(self.categories_dir, f"{category_id}.json"),
-            os.path.join("UniversalPromptManager", self.categories_dir, f"{category_id}.json"),
-        ]
-
-        for path in candidate_paths:
-            if not os.path.exists(path):
-                continue
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if isinstance(data, dict):
-                    self.category_cache[category_id] = data
-                    return data
-            except Exception:
-                continue
-
-        return None
+        return self.engine.load_category_definition(category_id)
 
     def get_category_fields(self, category_id):
         """Ermittelt Felder aus externer Kategorie-JSON, sonst Fallback-Methode."""
-        definition = self.load_category_definition(category_id)
-        if not definition:
-            fallback = self.category_fallback_fields.get(category_id)
-            return fallback() if fallback else {}
-
-        fields = {}
-        raw_fields = definition.get("fields", [])
-        for field in raw_fields:
-            if not isinstance(field, dict):
-                continue
-            field_key = field.get("key")
-            if not field_key:
-                continue
-
-            field_type = field.get("type", "entry")
-            label_text = self.resolve_localized_value(field.get("label", field_key))
-            default_value = self.resolve_localized_value(field.get("default", ""))
-
-            field_config = {
-                "type": field_type,
-                "label_text": str(label_text),
-                "default": default_value,
-            }
-
-            if field_type == "combobox":
-                options = self.resolve_localized_value(field.get("options", []))
-                field_config["options"] = options if isinstance(options, list) else []
-
-            if field_type == "spinbox":
-                field_config["min"] = field.get("min", 1)
-                field_config["max"] = field.get("max", 10)
-
-            fields[field_key] = field_config
-
-        return fields
+        return self.engine.get_category_fields(category_id, self.current_language)
 
     def get_category_prompt_text(self, category_id, prompt_key, fallback_key, **kwargs):
         """Liest Prompt-Text aus Kategorie-JSON mit Fallback auf Sprachdatei."""
-        text = None
-        definition = self.load_category_definition(category_id)
-        if isinstance(definition, dict):
-            prompts = definition.get("prompts", {})
-            if isinstance(prompts, dict) and prompt_key in prompts:
-                text = self.resolve_localized_value(prompts.get(prompt_key))
-
-        if text is None:
-            text = self.tr(fallback_key)
-
-        text_str = text if isinstance(text, str) else str(text)
-        if kwargs:
-            try:
-                return text_str.format(**kwargs)
-            except Exception:
-                return text_str
-        return text_str
-    
+        return self.engine.get_category_prompt_text(category_id, prompt_key, fallback_key, self.current_language, **kwargs)
+
     def get_field_value(self, field_name):
         """Holt den Wert eines Feldes"""
         field_info = self.input_fields.get(field_name)
@@ -777,466 +704,13 @@ class UniversalPromptManager:
             var = self.field_vars.get(field_name)
             return var.get() if var else ""
     
-    # === KATEGORIE-DEFINITIONEN ===
-    
-    def get_architecture_fields(self):
-        """Felder für Architektur-Prompts"""
-        return {
-            "style": {
-                "label": "field_arch_style",
-                "type": "combobox",
-                "options": ["modern", "klassisch", "minimalistisch", "rustikal", "industriell", "viktorianisch"],
-                "default": "modern"
-            },
-            "material": {
-                "label": "field_arch_material",
-                "type": "combobox",
-                "options": ["Putz", "Holz", "Backstein", "Stein", "Metall", "Glas"],
-                "default": "Putz"
-            },
-            "color": {
-                "label": "field_arch_color",
-                "type": "entry",
-                "default": "weiß"
-            },
-            "lighting": {
-                "label": "field_arch_lighting",
-                "type": "combobox",
-                "options": ["Tageslicht", "Abendlicht", "Morgenlicht", "dramatisch", "Studio", "Nacht"],
-                "default": "Tageslicht"
-            },
-            "details": {
-                "label": "field_arch_details",
-                "type": "text",
-                "default": "Vordach, Hausnummer, Briefkasten, Fensterläden"
-            },
-            "quality": {
-                "label": "field_arch_quality",
-                "type": "combobox",
-                "options": ["4K fotorealistisch", "8K ultra-realistisch", "Skizzen-Stil", "Aquarell", "Low-Poly"],
-                "default": "4K fotorealistisch"
-            }
-        }
-    
-    def get_image_description_fields(self):
-        """Felder für Bildbeschreibungen"""
-        return {
-            "subject": {
-                "label": "field_img_subject",
-                "type": "entry",
-                "default": "Hausfassade"
-            },
-            "style": {
-                "label": "field_img_style",
-                "type": "combobox",
-                "options": ["Portrait", "Landschaft", "Architektur", "Street", "Makro", "Produkt"],
-                "default": "Architektur"
-            },
-            "composition": {
-                "label": "field_img_composition",
-                "type": "combobox",
-                "options": ["Rule of Thirds", "Symmetrisch", "Zentral", "Diagonale", "Führende Linien"],
-                "default": "Rule of Thirds"
-            },
-            "lighting": {
-                "label": "field_img_lighting",
-                "type": "combobox",
-                "options": ["Weiches Licht", "Hartes Licht", "Goldene Stunde", "Blaue Stunde", "Dramatisch"],
-                "default": "Goldene Stunde"
-            },
-            "camera": {
-                "label": "field_img_camera",
-                "type": "combobox",
-                "options": ["Weitwinkel", "Teleobjektiv", "Makro", "Fisheye", "50mm Prime"],
-                "default": "Weitwinkel"
-            },
-            "mood": {
-                "label": "field_img_mood",
-                "type": "text",
-                "default": "Friedlich, einladend, modern"
-            },
-            "details": {
-                "label": "field_img_details",
-                "type": "text",
-                "default": "Texturen sichtbar, natürliche Schatten, realistische Farben"
-            }
-        }
-    
-    def get_sourcecode_fields(self):
-        """Felder für Sourcecode-Prompts"""
-        return {
-            "language": {
-                "label": "field_code_language",
-                "type": "combobox",
-                "options": [
-                    "Bash", "C", "C#", "C++", "CSS", "Dart", "Go", "HTML",
-                    "Java", "JavaScript", "Kotlin", "MATLAB", "PHP", "Python",
-                    "R", "Ruby", "Rust", "SQL", "Swift", "TypeScript"
-                ],
-                "default": "Python"
-            },
-            "task": {
-                "label": "field_code_task",
-                "type": "text",
-                "default": "Eine Funktion zum Sortieren von Listen"
-            },
-            "requirements": {
-                "label": "field_code_requirements",
-                "type": "text",
-                "default": "Effizient, gut lesbar, mit Fehlerbehandlung"
-            },
-            "framework": {
-                "label": "field_code_framework",
-                "type": "combobox",
-                "options": [
-                    "Kein spezielles Framework", "Standard Library",
-                    "Tkinter", "ttkbootstrap", "Tkinter + ttkbootstrap", "PySide6", "CustomTkinter",
-                    "Django", "Flask", "FastAPI",
-                    "React", "Vue", "Angular", "Next.js", "Nuxt",
-                    "Node.js", "Express", "NestJS",
-                    "Laravel", "Symfony", "CodeIgniter", "WordPress",
-                    "Spring Boot", "ASP.NET Core", "Ruby on Rails"
-                ],
-                "default": "Kein spezielles Framework"
-            },
-            "target_platform": {
-                "label": "field_code_target_platform",
-                "type": "combobox",
-                "options": ["Desktop", "Web", "Mobile", "CLI", "Backend/API", "Embedded"],
-                "default": "Desktop"
-            },
-            "output_structure": {
-                "label": "field_code_output_structure",
-                "type": "combobox",
-                "options": ["Single File", "Multi-File", "Clean Architecture", "Hexagonal"],
-                "default": "Multi-File"
-            },
-            "runtime_version": {
-                "label": "field_code_runtime_version",
-                "type": "entry",
-                "default": "Aktuelle stabile Version"
-            },
-            "package_manager": {
-                "label": "field_code_package_manager",
-                "type": "combobox",
-                "options": ["Keiner", "pip", "poetry", "npm", "pnpm", "yarn", "composer", "cargo", "maven", "gradle"],
-                "default": "Keiner"
-            },
-            "database": {
-                "label": "field_code_database",
-                "type": "combobox",
-                "options": ["Keine", "SQLite", "PostgreSQL", "MySQL", "MariaDB", "MongoDB", "Redis"],
-                "default": "Keine"
-            },
-            "api_style": {
-                "label": "field_code_api_style",
-                "type": "combobox",
-                "options": ["Keine API", "REST", "GraphQL", "gRPC", "WebSocket"],
-                "default": "Keine API"
-            },
-            "ui_framework": {
-                "label": "field_code_ui_framework",
-                "type": "combobox",
-                "options": ["Keine UI", "Tkinter", "ttkbootstrap", "Tkinter + ttkbootstrap", "PySide6", "CustomTkinter"],
-                "default": "Tkinter + ttkbootstrap"
-            },
-            "complexity": {
-                "label": "field_code_complexity",
-                "type": "combobox",
-                "options": ["Einfach", "Mittel", "Komplex", "Produktions-ready"],
-                "default": "Mittel"
-            },
-            "style": {
-                "label": "field_code_style",
-                "type": "combobox",
-                "options": ["Funktional", "OOP", "Prozedural", "Deklarativ"],
-                "default": "Funktional"
-            },
-            "security_level": {
-                "label": "field_code_security_level",
-                "type": "combobox",
-                "options": ["Basis", "Standard", "Hoch", "OWASP-orientiert"],
-                "default": "Standard"
-            },
-            "multilang": {
-                "label": "field_code_multilang",
-                "type": "combobox",
-                "options": ["Nein", "Ja"],
-                "default": "Nein"
-            },
-            "target_languages": {
-                "label": "field_code_target_languages",
-                "type": "combobox",
-                "options": [
-                    "Deutsch",
-                    "Englisch",
-                    "Deutsch + Englisch",
-                    "Englisch + Deutsch + Französisch + Spanisch"
-                ],
-                "default": "Englisch + Deutsch + Französisch + Spanisch"
-            },
-            "test_depth": {
-                "label": "field_code_test_depth",
-                "type": "combobox",
-                "options": ["Keine", "Unit", "Unit + Integration", "Unit + Integration + E2E"],
-                "default": "Unit + Integration"
-            },
-            "documentation_level": {
-                "label": "field_code_documentation_level",
-                "type": "combobox",
-                "options": ["Minimal", "Standard", "Ausführlich", "Ausführlich + README + Beispiele"],
-                "default": "Standard"
-            },
-            "deployment_target": {
-                "label": "field_code_deployment_target",
-                "type": "combobox",
-                "options": ["Lokal", "Docker", "VPS", "Shared Hosting", "Serverless", "WordPress Plugin ZIP"],
-                "default": "Lokal"
-            },
-            "comments": {
-                "label": "field_code_comments",
-                "type": "checkbox",
-                "default": True
-            },
-            "tests": {
-                "label": "field_code_tests",
-                "type": "checkbox",
-                "default": True
-            }
-        }
-    
-    def get_ai_art_fields(self):
-        """Felder für KI-Kunst-Prompts"""
-        return {
-            "subject": {
-                "label": "field_art_subject",
-                "type": "text",
-                "default": "Futuristisches Haus in einer Naturlandschaft"
-            },
-            "style": {
-                "label": "field_art_style",
-                "type": "combobox",
-                "options": ["Fotorealistisch", "Ölmalerei", "Aquarell", "Pixel Art", "Cyberpunk", "Steampunk"],
-                "default": "Fotorealistisch"
-            },
-            "artist": {
-                "label": "field_art_artist",
-                "type": "entry",
-                "default": ""
-            },
-            "colors": {
-                "label": "field_art_colors",
-                "type": "text",
-                "default": "Erdtöne mit akzentuierenden Blautönen"
-            },
-            "composition": {
-                "label": "field_art_composition",
-                "type": "combobox",
-                "options": ["Epische Weitwinkel", "Nahaufnahme", "Vogelperspektive", "Froschperspektive"],
-                "default": "Epische Weitwinkel"
-            },
-            "details": {
-                "label": "field_art_details",
-                "type": "combobox",
-                "options": ["Hochdetailliert", "Mitteldetailliert", "Stilisiert", "Minimalistisch"],
-                "default": "Hochdetailliert"
-            },
-            "parameters": {
-                "label": "field_art_parameters",
-                "type": "text",
-                "default": "--ar 16:9 --v 6.0 --style raw"
-            }
-        }
-    
-    def get_marketing_fields(self):
-        """Felder für Marketing-Prompts"""
-        return {
-            "product": {
-                "label": "field_mkt_product",
-                "type": "entry",
-                "default": "Architektur-Software"
-            },
-            "audience": {
-                "label": "field_mkt_audience",
-                "type": "entry",
-                "default": "Architekten und Bauherren"
-            },
-            "goal": {
-                "label": "field_mkt_goal",
-                "type": "combobox",
-                "options": ["Verkauf", "Lead-Generierung", "Brand Awareness", "Education"],
-                "default": "Verkauf"
-            },
-            "tone": {
-                "label": "field_mkt_tone",
-                "type": "combobox",
-                "options": ["Professionell", "Freundlich", "Überzeugend", "Dringlich", "Inspirierend"],
-                "default": "Professionell"
-            },
-            "platform": {
-                "label": "field_mkt_platform",
-                "type": "combobox",
-                "options": ["Website", "Social Media", "E-Mail", "Werbung", "Blog"],
-                "default": "Website"
-            },
-            "keywords": {
-                "label": "field_mkt_keywords",
-                "type": "text",
-                "default": "modern, effizient, benutzerfreundlich, innovativ"
-            },
-            "cta": {
-                "label": "field_mkt_cta",
-                "type": "entry",
-                "default": "Jetzt kostenlos testen!"
-            }
-        }
-    
-    def get_nutrition_fields(self):
-        """Felder für Ernährungsplan-Prompts"""
-        return {
-            "days": {
-                "label": "field_nut_days",
-                "type": "spinbox",
-                "default": 7,
-                "min": 1,
-                "max": 31
-            },
-            "age": {
-                "label": "field_nut_age",
-                "type": "spinbox",
-                "default": 62,
-                "min": 18,
-                "max": 99
-            },
-            "weight": {
-                "label": "field_nut_weight",
-                "type": "spinbox",
-                "default": 110,
-                "min": 40,
-                "max": 250
-            },
-            "gender": {
-                "label": "field_nut_gender",
-                "type": "combobox",
-                "options": ["männlich", "weiblich", "divers"],
-                "default": "männlich"
-            },
-            "goal": {
-                "label": "field_nut_goal",
-                "type": "combobox",
-                "options": ["Ausgewogen & gesund", "Gewichtsreduktion", "Muskelaufbau", "Gesundheitserhalt"],
-                "default": "Gewichtsreduktion"
-            },
-            "taste": {
-                "label": "field_nut_taste",
-                "type": "combobox",
-                "options": ["Abwechslungsreich", "Mediterran", "Vegetarisch", "Fleischbetont", "Asiatisch"],
-                "default": "Abwechslungsreich"
-            },
-            "appliances": {
-                "label": "field_nut_appliances",
-                "type": "text",
-                "default": "Heißluftfritteuse, Mikrowelle, Umluftherd"
-            },
-            "meal_prep": {
-                "label": "field_nut_meal_prep",
-                "type": "checkbox",
-                "default": True
-            },
-            "storage": {
-                "label": "field_nut_storage",
-                "type": "text",
-                "default": "ungekühlt, Kühlschrank, Gefriertruhe"
-            },
-            "show_calories": {
-                "label": "field_nut_show_calories",
-                "type": "checkbox",
-                "default": True
-            },
-            "show_tips": {
-                "label": "field_nut_show_tips",
-                "type": "checkbox",
-                "default": True
-            },
-            "show_portions": {
-                "label": "field_nut_show_portions",
-                "type": "checkbox",
-                "default": True
-            }
-        }
-
-    def get_custom_fields(self):
-        """Felder für benutzerdefinierte Vorlagen"""
-        return {
-            "custom_prompt": {
-                "label": "field_custom_prompt",
-                "type": "text",
-                "default": "Geben Sie hier Ihren Prompt ein..."
-            }
-        }
-
-    def get_specification_fields(self):
-        """Felder für Produktanforderungen (Fallback)"""
-        return {}
-
-    def get_ux_ui_fields(self):
-        """Felder für UX/UI Konzept (Fallback)"""
-        return {}
-
-    def get_social_media_fields(self):
-        """Felder für Social Media (Fallback)"""
-        return {}
-
-    def get_seo_content_fields(self):
-        """Felder für SEO/Blog/Content (Fallback)"""
-        return {}
-
-    def get_businessplan_fields(self):
-        """Felder für Businessplan (Fallback)"""
-        return {}
-
-    def get_data_analysis_fields(self):
-        """Felder für Datenanalyse/SQL (Fallback)"""
-        return {}
-
-    def get_automation_fields(self):
-        """Felder für Automatisierung/Workflow (Fallback)"""
-        return {}
-
-    def get_email_fields(self):
-        """Felder für E-Mail/Kommunikation (Fallback)"""
-        return {}
-
-    def get_presentations_fields(self):
-        """Felder für Präsentationen/Pitch Deck (Fallback)"""
-        return {}
-
-    def get_documentation_fields(self):
-        """Felder für Dokumentation (Fallback)"""
-        return {}
-    
     def generate_prompt(self):
         """Generiert den Prompt basierend auf der aktuellen Kategorie"""
         category = self.current_category
-        prompt = ""
-        
-        if category == "Architektur":
-            prompt = self.generate_architecture_prompt()
-        elif category == "Bildbeschreibung":
-            prompt = self.generate_image_description_prompt()
-        elif category == "Sourcecode":
-            prompt = self.generate_sourcecode_prompt()
-        elif category == "KI-Kunst":
-            prompt = self.generate_ai_art_prompt()
-        elif category == "Marketing":
-            prompt = self.generate_marketing_prompt()
-        elif category == "Ernährungsplan":
-            prompt = self.generate_nutrition_prompt()
-        elif category == "Eigene Vorlage":
-            prompt = self.generate_category_prompt_from_json(category)
-        else:
-            # Generische Prompt-Generierung für neue Kategorien aus JSON
-            prompt = self.generate_category_prompt_from_json(category)
+        category_id = self.categories.get(category, "custom")
+        field_values = self.collect_current_field_values()
+        prompt = self.engine.render(category_id, field_values, self.current_language)
+        self.history.append(category, prompt, self.current_language, field_values)
         
         # In Vorschau anzeigen
         self.preview_text.delete('1.0', tk.END)
@@ -1251,290 +725,125 @@ class UniversalPromptManager:
     def generate_category_prompt_from_json(self, category):
         """Generiert Prompt generisch aus JSON-Definition für alle neuen Kategorien"""
         category_id = self.categories.get(category, "custom")
-        definition = self.load_category_definition(category_id)
-        
-        if not definition or "prompts" not in definition:
-            return ""
-        
-        lines = []
-        prompts = definition.get("prompts", {})
-        
-        # Sammle alle Feldwerte
-        field_values = {field_name: self.get_field_value(field_name) 
-                        for field_name in self.input_fields}
-
-        def prompt_sort_key(prompt_key):
-            prefix, separator, suffix = prompt_key.rpartition("_")
-            if separator and suffix.isdigit():
-                return (prefix, int(suffix), prompt_key)
-            return (prompt_key, -1, prompt_key)
-        
-        # Gehe durch alle Prompts und setze die Feldwerte ein
-        for prompt_key in sorted(prompts.keys(), key=prompt_sort_key):
-            prompt_text = self.get_category_prompt_text(
-                category_id, prompt_key, prompt_key, **field_values
-            )
-            if prompt_text and prompt_text.strip():
-                lines.append(prompt_text)
-        
-        return "\n".join(lines)
-    
-    def generate_architecture_prompt(self):
-        """Generiert Architektur-Prompt"""
-        style = self.get_field_value("style")
-        material = self.get_field_value("material")
-        color = self.get_field_value("color")
-        lighting = self.get_field_value("lighting")
-        details = self.get_field_value("details")
-        quality = self.get_field_value("quality")
-        building_type = self.get_field_value("building_type")
-        environment_context = self.get_field_value("environment_context")
-        camera_perspective = self.get_field_value("camera_perspective")
-        landscaping = self.get_field_value("landscaping")
-
-        lines = [
-            self.get_category_prompt_text("architecture", "arch_1", "prompt_arch_1", quality=quality),
-            self.get_category_prompt_text("architecture", "arch_2", "prompt_arch_2", style=style),
-            self.get_category_prompt_text("architecture", "arch_3", "prompt_arch_3", material=material, color=color),
-            self.get_category_prompt_text("architecture", "arch_4", "prompt_arch_4", lighting=lighting),
-            self.get_category_prompt_text("architecture", "arch_5", "prompt_arch_5", details=details),
-            self.get_category_prompt_text("architecture", "arch_6", "prompt_arch_6"),
-            self.get_category_prompt_text("architecture", "arch_7", "prompt_arch_7"),
-            self.get_category_prompt_text("architecture", "arch_8", "prompt_arch_8", building_type=building_type),
-            self.get_category_prompt_text("architecture", "arch_9", "prompt_arch_9", environment_context=environment_context),
-            self.get_category_prompt_text("architecture", "arch_10", "prompt_arch_10", camera_perspective=camera_perspective),
-            self.get_category_prompt_text("architecture", "arch_11", "prompt_arch_11", landscaping=landscaping),
-        ]
-        return "\n".join(lines)
-
-    def generate_image_description_prompt(self):
-        """Generiert Bildbeschreibungs-Prompt"""
-        subject = self.get_field_value("subject")
-        style = self.get_field_value("style")
-        composition = self.get_field_value("composition")
-        lighting = self.get_field_value("lighting")
-        camera = self.get_field_value("camera")
-        mood = self.get_field_value("mood")
-        details = self.get_field_value("details")
-        aspect_ratio = self.get_field_value("aspect_ratio")
-        subject_context = self.get_field_value("subject_context")
-        usage_purpose = self.get_field_value("usage_purpose")
-        negative_details = self.get_field_value("negative_details")
-
-        lines = [
-            self.get_category_prompt_text("image_description", "img_1", "prompt_img_1", subject=subject),
-            self.get_category_prompt_text("image_description", "img_2", "prompt_img_2", style=style),
-            self.get_category_prompt_text("image_description", "img_3", "prompt_img_3", composition=composition),
-            self.get_category_prompt_text("image_description", "img_4", "prompt_img_4", lighting=lighting),
-            self.get_category_prompt_text("image_description", "img_5", "prompt_img_5", camera=camera),
-            self.get_category_prompt_text("image_description", "img_6", "prompt_img_6", mood=mood),
-            self.get_category_prompt_text("image_description", "img_7", "prompt_img_7", details=details),
-            self.get_category_prompt_text("image_description", "img_8", "prompt_img_8"),
-            self.get_category_prompt_text("image_description", "img_9", "prompt_img_9", aspect_ratio=aspect_ratio),
-            self.get_category_prompt_text("image_description", "img_10", "prompt_img_10", subject_context=subject_context),
-            self.get_category_prompt_text("image_description", "img_11", "prompt_img_11", usage_purpose=usage_purpose),
-            self.get_category_prompt_text("image_description", "img_12", "prompt_img_12", negative_details=negative_details),
-        ]
-        return "\n".join(lines)
-
-    def generate_sourcecode_prompt(self):
-        """Generiert Sourcecode-Prompt"""
-        language = self.get_field_value("language")
-        task = self.get_field_value("task")
-        requirements = self.get_field_value("requirements")
-        framework = self.get_field_value("framework")
-        target_platform = self.get_field_value("target_platform")
-        output_structure = self.get_field_value("output_structure")
-        runtime_version = self.get_field_value("runtime_version")
-        package_manager = self.get_field_value("package_manager")
-        database = self.get_field_value("database")
-        api_style = self.get_field_value("api_style")
-        ui_framework = self.get_field_value("ui_framework")
-        complexity = self.get_field_value("complexity")
-        style = self.get_field_value("style")
-        security_level = self.get_field_value("security_level")
-        multilang = self.get_field_value("multilang")
-        target_languages = self.get_field_value("target_languages")
-        test_depth = self.get_field_value("test_depth")
-        documentation_level = self.get_field_value("documentation_level")
-        deployment_target = self.get_field_value("deployment_target")
-        error_handling_strategy = self.get_field_value("error_handling_strategy")
-        auth_requirements = self.get_field_value("auth_requirements")
-        observability = self.get_field_value("observability")
-        performance_constraints = self.get_field_value("performance_constraints")
-        comments = self.get_category_prompt_text("sourcecode", "code_comments", "prompt_code_comments") if self.get_field_value("comments") == "1" else ""
-        tests = self.get_category_prompt_text("sourcecode", "code_tests", "prompt_code_tests") if self.get_field_value("tests") == "1" else ""
-
-        is_multilang = str(multilang).strip().lower() in {"ja", "yes", "oui", "si", "sí", "1", "true"}
-        i18n_line = (
-            self.get_category_prompt_text("sourcecode", "code_multilang_yes", "prompt_code_multilang_yes", target_languages=target_languages)
-            if is_multilang
-            else self.get_category_prompt_text("sourcecode", "code_multilang_no", "prompt_code_multilang_no")
+        return self.engine.generate_category_prompt_from_json(
+            category_id, self.collect_current_field_values(), self.current_language
         )
 
-        lines = [
-            self.get_category_prompt_text("sourcecode", "code_1", "prompt_code_1", complexity=complexity.lower(), language=language),
-            self.get_category_prompt_text("sourcecode", "code_2", "prompt_code_2", task=task),
-            self.get_category_prompt_text("sourcecode", "code_3", "prompt_code_3", requirements=requirements),
-            self.get_category_prompt_text("sourcecode", "code_4", "prompt_code_4", framework=framework),
-            self.get_category_prompt_text("sourcecode", "code_platform", "prompt_code_platform", target_platform=target_platform),
-            self.get_category_prompt_text("sourcecode", "code_structure", "prompt_code_structure", output_structure=output_structure),
-            self.get_category_prompt_text("sourcecode", "code_runtime", "prompt_code_runtime", runtime_version=runtime_version),
-            self.get_category_prompt_text("sourcecode", "code_package_manager", "prompt_code_package_manager", package_manager=package_manager),
-            self.get_category_prompt_text("sourcecode", "code_database", "prompt_code_database", database=database),
-            self.get_category_prompt_text("sourcecode", "code_api_style", "prompt_code_api_style", api_style=api_style),
-            self.get_category_prompt_text("sourcecode", "code_ui", "prompt_code_ui", ui_framework=ui_framework),
-            self.get_category_prompt_text("sourcecode", "code_security", "prompt_code_security", security_level=security_level),
-            i18n_line,
-            self.get_category_prompt_text("sourcecode", "code_test_depth", "prompt_code_test_depth", test_depth=test_depth),
-            self.get_category_prompt_text("sourcecode", "code_documentation", "prompt_code_documentation", documentation_level=documentation_level),
-            self.get_category_prompt_text("sourcecode", "code_deployment", "prompt_code_deployment", deployment_target=deployment_target),
-            self.get_category_prompt_text("sourcecode", "code_error_handling", "prompt_code_error_handling", error_handling_strategy=error_handling_strategy),
-            self.get_category_prompt_text("sourcecode", "code_auth", "prompt_code_auth", auth_requirements=auth_requirements),
-            self.get_category_prompt_text("sourcecode", "code_observability", "prompt_code_observability", observability=observability),
-            self.get_category_prompt_text("sourcecode", "code_performance", "prompt_code_performance", performance_constraints=performance_constraints),
-            self.get_category_prompt_text("sourcecode", "code_5", "prompt_code_5", style=style.lower(), comments=comments, tests=tests),
-            self.get_category_prompt_text("sourcecode", "code_6", "prompt_code_6"),
-            self.get_category_prompt_text("sourcecode", "code_7", "prompt_code_7"),
-        ]
-        return "\n".join(lines)
-
-    def generate_ai_art_prompt(self):
-        """Generiert KI-Kunst-Prompt"""
-        subject = self.get_field_value("subject")
-        style = self.get_field_value("style")
-        artist = self.get_field_value("artist")
-        colors = self.get_field_value("colors")
-        composition = self.get_field_value("composition")
-        details = self.get_field_value("details")
-        parameters = self.get_field_value("parameters")
-        lighting = self.get_field_value("lighting")
-        medium = self.get_field_value("medium")
-        aspect_ratio = self.get_field_value("aspect_ratio")
-        negative_prompt = self.get_field_value("negative_prompt")
-
-        artist_ref = self.get_category_prompt_text("ai_art", "art_artist_ref", "prompt_art_artist_ref", artist=artist) if artist else ""
-
-        lines = [
-            self.get_category_prompt_text("ai_art", "art_subject_style", "prompt_art_subject_style", subject=subject, style=style.lower(), artist_ref=artist_ref),
-            self.get_category_prompt_text("ai_art", "art_2", "prompt_art_2", colors=colors),
-            self.get_category_prompt_text("ai_art", "art_3", "prompt_art_3", composition=composition),
-            self.get_category_prompt_text("ai_art", "art_4", "prompt_art_4", details=details),
-            self.get_category_prompt_text("ai_art", "art_5", "prompt_art_5", style=style.lower()),
-            self.get_category_prompt_text("ai_art", "art_6", "prompt_art_6", lighting=lighting),
-            self.get_category_prompt_text("ai_art", "art_7", "prompt_art_7", medium=medium),
-            self.get_category_prompt_text("ai_art", "art_8", "prompt_art_8", aspect_ratio=aspect_ratio),
-            self.get_category_prompt_text("ai_art", "art_9", "prompt_art_9", negative_prompt=negative_prompt),
-            parameters,
-        ]
-        return "\n".join(lines)
-
-    def generate_marketing_prompt(self):
-        """Generiert Marketing-Prompt"""
-        product = self.get_field_value("product")
-        audience = self.get_field_value("audience")
-        goal = self.get_field_value("goal")
-        tone = self.get_field_value("tone")
-        platform = self.get_field_value("platform")
-        keywords = self.get_field_value("keywords")
-        cta = self.get_field_value("cta")
-        unique_value = self.get_field_value("unique_value")
-        offer_details = self.get_field_value("offer_details")
-        proof_points = self.get_field_value("proof_points")
-        funnel_stage = self.get_field_value("funnel_stage")
-
-        lines = [
-            self.get_category_prompt_text("marketing", "mkt_1", "prompt_mkt_1", product=product),
-            self.get_category_prompt_text("marketing", "mkt_2", "prompt_mkt_2", audience=audience),
-            self.get_category_prompt_text("marketing", "mkt_3", "prompt_mkt_3", goal=goal.lower()),
-            self.get_category_prompt_text("marketing", "mkt_4", "prompt_mkt_4", tone=tone.lower()),
-            self.get_category_prompt_text("marketing", "mkt_5", "prompt_mkt_5", platform=platform),
-            self.get_category_prompt_text("marketing", "mkt_6", "prompt_mkt_6", keywords=keywords),
-            self.get_category_prompt_text("marketing", "mkt_7", "prompt_mkt_7", cta=cta),
-            self.get_category_prompt_text("marketing", "mkt_8", "prompt_mkt_8"),
-            self.get_category_prompt_text("marketing", "mkt_9", "prompt_mkt_9", unique_value=unique_value),
-            self.get_category_prompt_text("marketing", "mkt_10", "prompt_mkt_10", offer_details=offer_details),
-            self.get_category_prompt_text("marketing", "mkt_11", "prompt_mkt_11", proof_points=proof_points),
-            self.get_category_prompt_text("marketing", "mkt_12", "prompt_mkt_12", funnel_stage=funnel_stage),
-        ]
-        return "\n".join(lines)
-
-    def generate_nutrition_prompt(self):
-        """Generiert Ernährungsplan-Prompt"""
-        days = self.get_field_value("days")
-        age = self.get_field_value("age")
-        weight = self.get_field_value("weight")
-        gender = self.get_field_value("gender")
-        goal = self.get_field_value("goal")
-        taste = self.get_field_value("taste")
-        activity_level = self.get_field_value("activity_level")
-        dietary_restrictions = self.get_field_value("dietary_restrictions")
-        budget_level = self.get_field_value("budget_level")
-        meals_per_day = self.get_field_value("meals_per_day")
-        appliances = self.get_field_value("appliances")
-        meal_prep = self.get_field_value("meal_prep") == "1"
-        storage = self.get_field_value("storage")
-        show_calories = self.get_field_value("show_calories") == "1"
-        show_tips = self.get_field_value("show_tips") == "1"
-        show_portions = self.get_field_value("show_portions") == "1"
-
-        meal_prep_section = ""
-        if meal_prep:
-            meal_prep_section = self.get_category_prompt_text("nutrition", "mealprep", "nutrition_mealprep", storage=storage)
-
-        optional_parts = []
-        if show_calories:
-            optional_parts.append(self.get_category_prompt_text("nutrition", "opt_calories", "nutrition_opt_calories"))
-        if show_tips:
-            optional_parts.append(self.get_category_prompt_text("nutrition", "opt_tips", "nutrition_opt_tips"))
-        if show_portions:
-            optional_parts.append(self.get_category_prompt_text("nutrition", "opt_portions", "nutrition_opt_portions"))
-        optional_section = ""
-        if optional_parts:
-            optional_section = "\n\n" + self.get_category_prompt_text("nutrition", "optional", "nutrition_optional") + "\n" + "\n".join(optional_parts)
-
-        plan_label = self.get_category_prompt_text("nutrition", "plan_week", "nutrition_plan_week", days=days) if days != "1" else self.get_category_prompt_text("nutrition", "plan_day", "nutrition_plan_day")
-        shopping_period = self.get_category_prompt_text("nutrition", "shopping_day", "nutrition_shopping_day") if days == "1" else self.get_category_prompt_text("nutrition", "shopping_days", "nutrition_shopping_days", days=days)
-
-        lines = [
-            self.get_category_prompt_text("nutrition", "intro", "nutrition_intro", gender=gender),
-            "",
-            self.get_category_prompt_text("nutrition", "age", "nutrition_age", age=age),
-            self.get_category_prompt_text("nutrition", "weight", "nutrition_weight", weight=weight),
-            self.get_category_prompt_text("nutrition", "activity", "nutrition_activity", activity_level=activity_level),
-            self.get_category_prompt_text("nutrition", "goal", "nutrition_goal", goal=goal),
-            self.get_category_prompt_text("nutrition", "restrictions", "nutrition_restrictions", dietary_restrictions=dietary_restrictions),
-            self.get_category_prompt_text("nutrition", "taste", "nutrition_taste", taste=taste),
-            "",
-            self.get_category_prompt_text("nutrition", "requirements", "nutrition_requirements"),
-            "",
-            self.get_category_prompt_text("nutrition", "r1", "nutrition_r1", plan_label=plan_label),
-            self.get_category_prompt_text("nutrition", "r2", "nutrition_r2"),
-            self.get_category_prompt_text("nutrition", "r3", "nutrition_r3"),
-            f"   {appliances}",
-            self.get_category_prompt_text("nutrition", "r4", "nutrition_r4", meals_per_day=meals_per_day, budget_level=budget_level),
-        ]
-
-        if meal_prep_section:
-            lines.append(meal_prep_section)
-
-        lines.extend([
-            self.get_category_prompt_text("nutrition", "r5", "nutrition_r5"),
-            self.get_category_prompt_text("nutrition", "r6", "nutrition_r6"),
-            self.get_category_prompt_text("nutrition", "r7", "nutrition_r7"),
-            self.get_category_prompt_text("nutrition", "r8", "nutrition_r8", shopping_period=shopping_period),
-        ])
+    # === LIVE-VORSCHAU ===
+
+    def on_live_preview_toggle(self):
+        """Schaltet die Live-Vorschau ein oder aus und merkt sich die Einstellung."""
+        self.settings["live_preview"] = bool(self.live_preview_var.get())
+        self.save_settings()
+        if self.live_preview_var.get():
+            self.schedule_live_preview(full=True)
+        else:
+            self.cancel_live_preview()
+
+    def on_text_field_modified(self, event, field_name):
+        """Leitet Änderungen in mehrzeiligen Textfeldern an die Live-Vorschau weiter."""
+        if not event.widget.edit_modified():
+            return
+        event.widget.edit_modified(False)
+        self.on_field_edited(field_name)
+
+    def on_field_edited(self, field_name):
+        """Merkt ein geändertes Feld für die nächste Aktualisierung der Live-Vorschau vor."""
+        if not self.live_preview_var.get():
+            return
+        self.live_preview_pending.add(field_name)
+        self.schedule_live_preview()
+
+    def schedule_live_preview(self, full=False):
+        """Plant die Aktualisierung der Vorschau; schnelle Eingaben werden zusammengefasst."""
+        if not self.live_preview_var.get():
+            return
+        if full:
+            self.live_preview_renderer = None
+        if self.live_preview_job is not None:
+            self.root.after_cancel(self.live_preview_job)
+        self.live_preview_job = self.root.after(self.live_preview_delay_ms, self.update_live_preview)
+
+    def cancel_live_preview(self):
+        """Verwirft eine geplante Aktualisierung der Live-Vorschau."""
+        if self.live_preview_job is not None:
+            self.root.after_cancel(self.live_preview_job)
+        self.live_preview_job = None
+        self.live_preview_pending.clear()
+        self.live_preview_renderer = None
+
+    def update_live_preview(self):
+        """Rendert nur die Zeilen neu, deren Platzhalter geänderte Felder verwenden."""
+        self.live_preview_job = None
+        changed_fields = self.live_preview_pending
+        self.live_preview_pending = set()
+        if not self.live_preview_var.get():
+            return
+
+        category_id = self.categories.get(self.current_category, "custom")
+        renderer = self.live_preview_renderer
+        # Vollständig neu rendern bei Kategorie-/Sprachwechsel oder wenn die Vorschau
+        # anderweitig geändert wurde (Generieren, Optimieren, manuelle Eingabe)
+        if (renderer is None or renderer.category_id != category_id
+                or renderer.language != self.current_language or self.preview_text.edit_modified()):
+            self.render_live_preview(category_id)
+            return
+        if not changed_fields:
+            return
 
-        return "\n".join(lines) + optional_section
+        changed_values = {
+            field_name: self.get_field_value(field_name)
+            for field_name in changed_fields
+            if field_name in self.input_fields
+        }
+        changes = renderer.update(changed_values)
+        if changes is None:
+            self.render_live_preview(category_id)
+            return
+        for row, old_line, new_line, has_previous, has_next in changes:
+            self.patch_preview_line(row, old_line, new_line, has_previous, has_next)
+        self.preview_text.edit_modified(False)
+
+    def render_live_preview(self, category_id):
+        """Rendert die Vorschau vollständig und legt den Zeilenstand für spätere Teilupdates an."""
+        self.live_preview_renderer = IncrementalRenderer(self.engine, category_id, self.current_language)
+        prompt = self.live_preview_renderer.render_all(self.collect_current_field_values())
+        self.preview_text.delete('1.0', tk.END)
+        self.preview_text.insert('1.0', prompt)
+        self.preview_text.edit_modified(False)
+
+    def patch_preview_line(self, row, old_line, new_line, has_previous, has_next):
+        """Ersetzt eine Prompt-Zeile in der Vorschau; leere Zeilen werden dabei aus- bzw. eingeblendet."""
+        old_visible = bool(old_line.strip())
+        new_visible = bool(new_line.strip())
+        first = row + 1
+        last = row + old_line.count("\n") + 1
+        if old_visible and new_visible:
+            self.preview_text.delete(f"{first}.0", f"{last}.end")
+            self.preview_text.insert(f"{first}.0", new_line)
+        elif old_visible:
+            if has_next:
+                self.preview_text.delete(f"{first}.0", f"{last + 1}.0")
+            elif has_previous:
+                self.preview_text.delete(f"{row}.end", f"{last}.end")
+            else:
+                self.preview_text.delete(f"{first}.0", f"{last}.end")
+        elif new_visible:
+            if has_next:
+                self.preview_text.insert(f"{first}.0", new_line + "\n")
+            elif has_previous:
+                self.preview_text.insert(f"{row}.end", "\n" + new_line)
+            else:
+                self.preview_text.insert('1.0', new_line)
 
     # === TEMPLATE-FUNKTIONEN ===
     
     def update_template_list(self):
         """Aktualisiert die Template-Liste für aktuelle Kategorie"""
-        category_templates = self.templates.get(self.current_category, {})
-        self.template_combo['values'] = list(category_templates.keys())
-        if category_templates:
-            self.template_combo.set(next(iter(category_templates.keys())))
+        template_names = self.template_store.get_names(self.current_category)
+        self.template_combo['values'] = template_names
+        if template_names:
+            self.template_combo.set(template_names[0])
     
     def save_as_template(self):
         """Speichert aktuelle Einstellungen als Template"""
@@ -1551,12 +860,8 @@ class UniversalPromptManager:
         for field_name in self.input_fields:
             template_data[field_name] = self.get_field_value(field_name)
         
-        # In Templates speichern
-        if self.current_category not in self.templates:
-            self.templates[self.current_category] = {}
-        
-        self.templates[self.current_category][template_name] = template_data
-        self.save_templates()
+        # Nur diese Vorlage speichern
+        self.template_store.save(self.current_category, template_name, template_data)
         self.update_template_list()
         
         self.status_var.set(self.tr("status_template_saved", name=template_name))
@@ -1568,7 +873,7 @@ class UniversalPromptManager:
         if not template_name:
             return
         
-        template_data = self.templates.get(self.current_category, {}).get(template_name)
+        template_data = self.template_store.get(self.current_category, template_name)
         if not template_data:
             return
 
@@ -1599,12 +904,9 @@ class UniversalPromptManager:
             self.tr("dialog_delete_title"),
             self.tr("dialog_delete_prompt", name=template_name)
         ):
-            if self.current_category in self.templates:
-                if template_name in self.templates[self.current_category]:
-                    del self.templates[self.current_category][template_name]
-                    self.save_templates()
-                    self.update_template_list()
-                    self.status_var.set(self.tr("status_template_deleted", name=template_name))
+            if self.template_store.delete(self.current_category, template_name):
+                self.update_template_list()
+                self.status_var.set(self.tr("status_template_deleted", name=template_name))
     
     # === PROMPT-OPTIMIERUNG ===
     
@@ -1703,46 +1005,249 @@ class UniversalPromptManager:
             self.status_var.set(self.tr("status_prompt_exported", filename=os.path.basename(filename)))
             messagebox.showinfo(self.tr("msg_success_title"), self.tr("msg_exported", filename=filename))
     
+    def get_history_index(self):
+        """Öffnet den Volltext-Index beim ersten Gebrauch und baut ihn im Hintergrund auf."""
+        if self.history_index is None:
+            self.history_index = HistorySearchIndex(self.history.path, "prompt_history.db")
+            threading.Thread(target=self.sync_history_index_in_background, daemon=True).start()
+        return self.history_index
+
+    def sync_history_index_in_background(self):
+        """Indiziert die History außerhalb des Tk-Hauptthreads (beim ersten Mal die ganze Datei)."""
+        try:
+            self.history_index.sync()
+        finally:
+            # Bei Fehlern sucht show_history trotzdem; search() synchronisiert dann selbst
+            self.history_index_ready.set()
+
     def show_history(self):
-        """Zeigt die History der generierten Prompts an"""
+        """Zeigt die History der generierten Prompts mit Volltextsuche, Filtern und Seiten an"""
         history_window = tk.Toplevel(self.root)
         history_window.title(self.tr("history_title"))
-        history_window.geometry("700x500")
-        
-        # Versuche, History aus Datei zu laden
-        history_file = "prompt_history.json"
-        history_data = []
-        
-        if os.path.exists(history_file):
+        history_window.geometry("900x600")
+        page_size = 20
+        state = {"page": 0, "total": 0}
+
+        all_label = self.tr("history_all")
+        category_options = {all_label: None}
+        for internal_key in self.categories:
+            category_options[self.get_category_display_name(internal_key)] = internal_key
+        language_options = {all_label: None}
+        for code, display in self.languages.items():
+            language_options[display] = code
+
+        # Suchleiste mit Filtern
+        filter_frame = ttk.Frame(history_window)
+        filter_frame.pack(fill='x', padx=10, pady=(10, 0))
+        ttk.Label(filter_frame, text=self.tr("history_search_label")).pack(side='left', padx=(0, 5))
+        search_var = tk.StringVar()
+        search_entry = ttk.Entry(filter_frame, textvariable=search_var, width=30)
+        search_entry.pack(side='left', padx=(0, 10))
+        ttk.Label(filter_frame, text=self.tr("label_category")).pack(side='left', padx=(0, 5))
+        category_filter_var = tk.StringVar(value=all_label)
+        ttk.Combobox(filter_frame, textvariable=category_filter_var, values=list(category_options),
+                     width=22, state='readonly').pack(side='left', padx=(0, 10))
+        ttk.Label(filter_frame, text=self.tr("label_language")).pack(side='left', padx=(0, 5))
+        language_filter_var = tk.StringVar(value=all_label)
+        ttk.Combobox(filter_frame, textvariable=language_filter_var, values=list(language_options),
+                     width=10, state='readonly').pack(side='left', padx=(0, 10))
+        ttk.Label(filter_frame, text=self.tr("history_filter_since")).pack(side='left', padx=(0, 5))
+        date_from_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=date_from_var, width=12).pack(side='left', padx=(0, 10))
+
+        text_widget = scrolledtext.ScrolledText(history_window)
+        text_widget.pack(fill='both', expand=True, padx=10, pady=10)
+
+        nav_frame = ttk.Frame(history_window)
+        nav_frame.pack(fill='x', padx=10, pady=(0, 10))
+        page_var = tk.StringVar()
+
+        def show_page():
+            if not self.history_index_ready.is_set():
+                # Solange der Index aufgebaut wird, die neuesten Einträge direkt vom Dateiende zeigen
+                state["total"] = 0
+                show_entries(list(reversed(self.history.read_last(page_size))))
+                page_var.set(self.tr("history_indexing"))
+                return
+
+            # Datum prüfen und normalisieren; verglichen wird als Text mit ISO-Zeitstempeln
+            date_text = date_from_var.get().strip()
             try:
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    history_data = json.load(f)
-            except:
-                history_data = []
-        
-        if not history_data:
-            tk.Label(history_window, text=self.tr("history_empty")).pack(pady=20)
-        else:
-            # History anzeigen
-            text_widget = scrolledtext.ScrolledText(history_window)
-            text_widget.pack(fill='both', expand=True, padx=10, pady=10)
-            
-            for entry in history_data[-20:]:  # Letzte 20 Einträge
+                date_from = datetime.date.fromisoformat(date_text).isoformat() if date_text else None
+            except ValueError:
+                state["total"] = 0
+                text_widget.delete('1.0', tk.END)
+                text_widget.insert('end', self.tr("history_invalid_date", date=date_text))
+                page_var.set("")
+                return
+
+            entries, total = self.get_history_index().search(
+                search_var.get(),
+                category=category_options.get(category_filter_var.get()),
+                language=language_options.get(language_filter_var.get()),
+                date_from=date_from,
+                limit=page_size,
+                offset=state["page"] * page_size,
+            )
+            state["total"] = total
+            if show_entries(entries):
+                first = state["page"] * page_size + 1
+                page_var.set(self.tr("history_results", start=first, end=first + len(entries) - 1, total=total))
+            else:
+                page_var.set("")
+
+        def show_entries(entries):
+            text_widget.delete('1.0', tk.END)
+            if not entries:
+                text_widget.insert('end', self.tr("history_empty"))
+                return False
+
+            for entry in entries:
+                category = entry.get('category') or self.tr("history_unknown")
+                if category in self.categories:
+                    category = self.get_category_display_name(category)
                 text_widget.insert('end', f"\n{'='*60}\n")
-                text_widget.insert('end', self.tr("history_category", category=entry.get('category', self.tr("history_unknown"))) + "\n")
-                text_widget.insert('end', self.tr("history_date", date=entry.get('date', self.tr("history_unknown"))) + "\n")
+                text_widget.insert('end', self.tr("history_category", category=category) + "\n")
+                text_widget.insert('end', self.tr("history_date", date=entry.get('date') or self.tr("history_unknown")) + "\n")
                 text_widget.insert('end', "\n" + self.tr("history_prompt_label") + "\n" + entry.get('prompt', '') + "\n")
+            return True
+
+        def wait_for_index():
+            if not history_window.winfo_exists():
+                return
+            if self.history_index_ready.is_set():
+                show_page()
+            else:
+                self.root.after(100, wait_for_index)
+
+        def search(event=None):
+            state["page"] = 0
+            show_page()
 
-def main():
-    """Startet die Anwendung"""
-    root = ttk.Window(
-        title="Universal Prompt Manager",
-        themename="darkly",
-        size=(980, 780),
-        resizable=(True, True)
-    )
-    app = UniversalPromptManager(root)
+        def change_page(step):
+            new_page = state["page"] + step
+            if new_page < 0 or new_page * page_size >= state["total"]:
+                return
+            state["page"] = new_page
+            show_page()
+
+        ttk.Button(filter_frame, text=self.tr("btn_history_search"), command=search,
+                   bootstyle=(PRIMARY, OUTLINE)).pack(side='left')
+        search_entry.bind('<Return>', search)
+        ttk.Button(nav_frame, text="◀", command=lambda: change_page(-1), width=3,
+                   bootstyle=(SECONDARY, OUTLINE)).pack(side='left')
+        ttk.Label(nav_frame, textvariable=page_var).pack(side='left', padx=10)
+        ttk.Button(nav_frame, text="▶", command=lambda: change_page(1), width=3,
+                   bootstyle=(SECONDARY, OUTLINE)).pack(side='left')
+
+        self.get_history_index()
+        show_page()
+        if not self.history_index_ready.is_set():
+            wait_for_index()
+
+    def show_diagnostics(self):
+        """Zeigt Laufzeitmetriken (Zähler, Ladezeiten, Cache-Trefferquoten) an"""
+        diagnostics_window = tk.Toplevel(self.root)
+        diagnostics_window.title(self.tr("diagnostics_title"))
+        diagnostics_window.geometry("820x560")
+
+        text_widget = scrolledtext.ScrolledText(diagnostics_window, font=('Consolas', 9))
+        text_widget.pack(fill='both', expand=True, padx=10, pady=10)
+
+        def refresh():
+            text_widget.delete('1.0', tk.END)
+            text_widget.insert('1.0', metrics.format_report())
+
+        def save_json():
+            filename = filedialog.asksaveasfilename(
+                parent=diagnostics_window,
+                defaultextension=".json",
+                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                initialfile=f"upm_metrics_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            )
+            if filename:
+                metrics.write_json(filename)
+                self.status_var.set(self.tr("status_diagnostics_saved", filename=os.path.basename(filename)))
+
+        button_frame = ttk.Frame(diagnostics_window)
+        button_frame.pack(fill='x', padx=10, pady=(0, 10))
+        ttk.Button(button_frame, text=self.tr("btn_diagnostics_refresh"), command=refresh,
+                   bootstyle=(PRIMARY, OUTLINE)).pack(side='left')
+        ttk.Button(button_frame, text=self.tr("btn_diagnostics_save"), command=save_json,
+                   bootstyle=(INFO, OUTLINE)).pack(side='left', padx=5)
+
+        refresh()
+
+def build_argument_parser():
+    """Erstellt den Argument-Parser für den GUI-Start."""
+    parser = argparse.ArgumentParser(prog="UniversalPromptManager")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Dauer der Startphasen nach stderr ausgeben")
+    parser.add_argument("--profile-output", help="Startmessung als JSONL-Zeile an diese Datei anhängen")
+    parser.add_argument("--profile-cprofile", help="Zusätzlich cProfile-Statistik für den Start in diese Datei schreiben")
+    parser.add_argument("--profile-exit", action="store_true",
+                        help="Nach dem Start sofort beenden (für automatisierte Messungen)")
+    return parser
+
+
+def report_startup_profile(args):
+    """Gibt die Startmessung aus bzw. schreibt sie in die gewünschten Dateien."""
+    startup_profiler.finish()
+    sys.stderr.write(startup_profiler.format_report() + "\n")
+    if args.profile_output:
+        startup_profiler.write_report(args.profile_output)
+    if args.profile_cprofile:
+        startup_profiler.dump_cprofile(args.profile_cprofile)
+
+
+def main(argv=None):
+    """Startet die Anwendung (oder den Batch-Modus mit 'batch', die Benchmarks mit 'benchmark', den lokalen Render-Dienst mit 'serve', Varianten mit 'variants')"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        import BatchRenderer
+        return BatchRenderer.main(argv[1:])
+    if argv and argv[0] == "benchmark":
+        import PromptBenchmark
+        return PromptBenchmark.main(argv[1:])
+    if argv and argv[0] == "serve":
+        import RenderServer
+        return RenderServer.main(argv[1:])
+    if argv and argv[0] == "variants":
+        import VariantGenerator
+        return VariantGenerator.main(argv[1:])
+
+    args = build_argument_parser().parse_args(argv)
+    profiling = args.profile_startup or args.profile_output or args.profile_cprofile or args.profile_exit
+    if args.profile_cprofile:
+        startup_profiler.start_cprofile()
+
+    load_gui_modules()
+    with startup_profiler.phase("create window"):
+        root = ttk.Window(
+            title="Universal Prompt Manager",
+            themename="darkly",
+            size=(980, 780),
+            resizable=(True, True)
+        )
+    with startup_profiler.phase("UniversalPromptManager.__init__"):
+        app = UniversalPromptManager(root)
+
+    if profiling:
+        # Erster Leerlauf der Ereignisschleife: Fenster ist aufgebaut und gezeichnet
+        first_idle = startup_profiler.begin("mainloop until first idle")
+
+        def on_first_idle():
+            startup_profiler.end(first_idle)
+            report_startup_profile(args)
+            if args.profile_exit:
+                root.destroy()
+
+        root.after_idle(on_first_idle)
+    else:
+        startup_profiler.finish()
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Notwendig für Prozess-Pools im PyInstaller-onefile-Build (Windows/spawn)
+    multiprocessing.freeze_support()
+    sys.exit(main())
\ No newline at end of file
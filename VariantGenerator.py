@@ -0,0 +1,235 @@
+import argparse
+import hashlib
+import random
+import sys
+import time
+from itertools import product
+
+from BatchRenderer import BatchRenderer, discard_stdout, open_output, write_result
+from PromptEngine import PromptEngine
+from ResourceBundle import default_bundle_path
+from RuntimeMetrics import metrics
+
+
+class VariantGenerator:
+    """Erzeugt Prompt-Varianten über die Optionen der Combobox-Felder einer Kategorie.
+
+    Das kartesische Produkt wird nie vollständig erzeugt: Kombinationen
+    entstehen einzeln (itertools.product) oder werden per Index gezogen und
+    in Feldwerte zurückgerechnet. Nicht variierte Felder behalten ihren
+    Standardwert bzw. den festgelegten Wert.
+    """
+
+    def __init__(self, engine, category_id, language=None, fixed=None, subsets=None, vary=None):
+        self.engine = engine
+        self.category_id = category_id
+        self.language = language or engine.language
+        fixed = dict(fixed or {})
+        subsets = dict(subsets or {})
+
+        fields = engine.get_category_fields(category_id, self.language)
+        if not fields:
+            raise ValueError(f"unbekannte Kategorie oder keine Felder: {category_id!r}")
+        for field_name in (*fixed, *subsets, *(vary or ())):
+            if field_name not in fields:
+                raise ValueError(f"unbekanntes Feld: {field_name!r}")
+        for field_name in fixed:
+            if field_name in subsets:
+                raise ValueError(f"Feld {field_name!r} ist zugleich festgelegt und variiert")
+
+        # Feste Felder und Standardwerte gehen in jede Variante ein
+        self.fixed = fixed
+        self.base_values = {name: config.get("default", "") for name, config in fields.items()}
+        self.base_values.update(fixed)
+
+        axes = []
+        for field_name, config in fields.items():
+            if field_name in fixed or (vary is not None and field_name not in vary and field_name not in subsets):
+                continue
+            options = config.get("options") if config["type"] == "combobox" else None
+            if field_name in subsets:
+                values = tuple(dict.fromkeys(subsets[field_name]))
+                unknown = [value for value in values if options is not None and value not in options]
+                if unknown:
+                    raise ValueError(f"Feld {field_name!r}: unbekannte Option {unknown[0]!r}")
+            elif options:
+                values = tuple(options)
+            else:
+                continue
+            if not values:
+                raise ValueError(f"Feld {field_name!r}: keine Werte zum Variieren")
+            axes.append((field_name, values))
+        self.axes = tuple(axes)
+
+    @property
+    def field_names(self):
+        return tuple(field_name for field_name, _ in self.axes)
+
+    @property
+    def count(self):
+        """Anzahl aller Kombinationen (kann sehr groß werden, wird nur berechnet)."""
+        total = 1
+        for _, values in self.axes:
+            total *= len(values)
+        return total
+
+    def combination_at(self, index):
+        """Rechnet einen Index (0 ≤ index < count) in eine Kombination um; das letzte Feld variiert am schnellsten."""
+        combination = []
+        for _, values in reversed(self.axes):
+            index, position = divmod(index, len(values))
+            combination.append(values[position])
+        return tuple(reversed(combination))
+
+    def combinations(self):
+        """Alle Kombinationen in fester Reihenfolge (lazy)."""
+        return product(*(values for _, values in self.axes))
+
+    def sample(self, count, seed=None):
+        """Zieht bis zu count verschiedene Kombinationen; mit gleichem seed immer dieselben."""
+        total = self.count
+        rng = random.Random(seed)
+        if count >= total:
+            indices = list(range(total))
+            rng.shuffle(indices)
+        elif total <= sys.maxsize:
+            indices = rng.sample(range(total), count)
+        else:
+            # range() mit mehr als sys.maxsize Elementen unterstützt kein len()
+            indices = []
+            seen = set()
+            while len(indices) < count:
+                index = rng.randrange(total)
+                if index not in seen:
+                    seen.add(index)
+                    indices.append(index)
+        for index in indices:
+            yield self.combination_at(index)
+
+    def variants(self, sample=None, seed=None, dedupe=False):
+        """Liefert (Feldwerte der Variante, Prompt) für alle oder gesampelte Kombinationen.
+
+        Feldwerte enthalten nur variierte und festgelegte Felder, so dass die
+        Ergebnisse wieder als Batch-Datensätze taugen. Mit dedupe werden
+        Varianten mit bereits erzeugtem Prompt-Text übersprungen (ein
+        16-Byte-Hash pro eindeutigem Prompt bleibt im Speicher).
+        """
+        names = self.field_names
+        combinations = self.combinations() if sample is None else self.sample(sample, seed)
+        field_values = dict(self.base_values)
+        seen = set() if dedupe else None
+        render = self.engine.render_uncached
+        rendered = metrics.counter("variants.rendered")
+        duplicates = metrics.counter("variants.duplicates")
+        for combination in combinations:
+            field_values.update(zip(names, combination))
+            prompt = render(self.category_id, field_values, self.language)
+            rendered.value += 1
+            if seen is not None:
+                digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+                if digest in seen:
+                    duplicates.value += 1
+                    continue
+                seen.add(digest)
+            variant = dict(self.fixed)
+            variant.update(zip(names, combination))
+            yield variant, prompt
+
+
+def parse_assignments(items, option_name):
+    """Zerlegt Angaben der Form feld=wert in ein Dict."""
+    values = {}
+    for item in items or ():
+        field_name, separator, value = item.partition("=")
+        if not separator or not field_name:
+            raise ValueError(f"{option_name} erwartet feld=wert, nicht {item!r}")
+        values[field_name] = value
+    return values
+
+
+def build_argument_parser():
+    """Erstellt den Argument-Parser für den Varianten-Modus."""
+    parser = argparse.ArgumentParser(
+        prog="UniversalPromptManager variants",
+        description="Erzeugt Prompt-Varianten über alle (oder gesampelte) Kombinationen der Auswahlfelder.",
+    )
+    parser.add_argument("category", help="Kategorie-ID, z.B. ai_art")
+    parser.add_argument("-o", "--output", default="-", help="Ausgabedatei, Standard: stdout")
+    parser.add_argument("--output-format", choices=["jsonl", "text"], default="jsonl")
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--fix", action="append", metavar="FELD=WERT", help="Feld auf einen Wert festlegen")
+    parser.add_argument("--only", action="append", metavar="FELD=A,B",
+                        help="Nur diese Werte eines Feldes verwenden (auch für Textfelder)")
+    parser.add_argument("--vary", metavar="FELD,FELD", help="Nur diese Felder variieren, alle übrigen auf Standardwert")
+    parser.add_argument("--sample", type=int, metavar="N", help="N zufällige Kombinationen statt aller")
+    parser.add_argument("--seed", type=int, help="Startwert für reproduzierbares Sampling")
+    parser.add_argument("--dedupe", action="store_true", help="Varianten mit gleichem Prompt-Text nur einmal ausgeben")
+    parser.add_argument("--count", action="store_true", help="Nur die Anzahl der Kombinationen ausgeben")
+    parser.add_argument("--categories-dir", default="categories")
+    parser.add_argument("--languages-file", default="upmlanguages.json")
+    parser.add_argument("--bundle", default=default_bundle_path(),
+                        help="Ressourcen-Bundle statt loser JSON-Dateien verwenden")
+    parser.add_argument("--metrics", metavar="DATEI", help="Laufzeitmetriken am Ende als JSON schreiben")
+    return parser
+
+
+def main(argv=None):
+    """Einstiegspunkt für den Varianten-Modus."""
+    parser = build_argument_parser()
+    args = parser.parse_args(argv)
+    if args.sample is not None and args.sample < 1:
+        parser.error("--sample erwartet eine Anzahl ab 1")
+    engine = PromptEngine(args.categories_dir, args.languages_file, args.language, bundle_file=args.bundle)
+    category_id = BatchRenderer(engine, args.language).resolve_category_id(args.category)
+    try:
+        subsets = {
+            field_name: [value.strip() for value in values.split(",") if value.strip()]
+            for field_name, values in parse_assignments(args.only, "--only").items()
+        }
+        generator = VariantGenerator(
+            engine, category_id or args.category, args.language,
+            fixed=parse_assignments(args.fix, "--fix"),
+            subsets=subsets,
+            vary=[name.strip() for name in args.vary.split(",")] if args.vary else None,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.count:
+        sys.stdout.write(f"{generator.count}\n")
+        return 0
+
+    output_stream = open_output(args.output)
+    started = time.perf_counter()
+    written = 0
+    try:
+        try:
+            for fields, prompt in generator.variants(args.sample, args.seed, args.dedupe):
+                write_result(output_stream, {
+                    "category": generator.category_id,
+                    "language": generator.language,
+                    "fields": fields,
+                    "prompt": prompt,
+                }, args.output_format)
+                written += 1
+        finally:
+            if output_stream is not sys.stdout:
+                output_stream.close()
+        if output_stream is sys.stdout:
+            output_stream.flush()
+    except BrokenPipeError:
+        discard_stdout()
+        return 1
+
+    elapsed = time.perf_counter() - started
+    rate = written / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(
+        f"{written} Varianten von {generator.count} Kombinationen in {elapsed:.2f}s ({rate:.0f} Varianten/s)\n"
+    )
+    if args.metrics:
+        metrics.write_json(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
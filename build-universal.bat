@@ -7,15 +7,22 @@ if errorlevel 1 (
 	echo PyInstaller wird installiert...
 	pip install pyinstaller
 )
+
+:: Kategorien und Sprachpakete pruefen und in ein Ressourcen-Bundle kompilieren
+echo Erstelle upm_resources.bundle ...
+python ResourceBundle.py -o upm_resources.bundle
+if errorlevel 1 (
+	echo Bundle fehlerhaft, Build abgebrochen.
+	exit /b 1
+)
+
 echo Baue UniversalPromptManager.exe ...
-pyinstaller --onefile --icon=icon.ico --add-data "icon.png;." --add-data "icon.ico;." UniversalPromptManager.py
+pyinstaller --onefile --icon=icon.ico --add-data "icon.png;." --add-data "icon.ico;." --add-data "upm_resources.bundle;." UniversalPromptManager.py
 echo Fertig! Die EXE befindet sich im dist-Ordner.
 
-:: languages.json kopieren
-copy upmlanguages.json dist\upmlanguages.json
-
-:: Verzeichnis categories kopieren
-xcopy categories dist\categories /E /I /Y
+:: Kategorien und Sprachen stecken im Bundle der EXE. Eine Datei dist\categories\<id>.json
+:: ueberschreibt die gebuendelte Kategorie gleichen Namens und wird zur Laufzeit neu geladen;
+:: weitere Kategorien erscheinen nicht, die GUI listet nur die eingebauten Kategorien
 
 :: todo: icon.ico und icon.png kopieren
 copy icon.ico dist\icon.ico
@@ -0,0 +1,15 @@
+import os
+
+from PromptEngine import PromptEngine
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATEGORIES_DIR = os.path.join(ROOT, "categories")
+LANGUAGES_FILE = os.path.join(ROOT, "upmlanguages.json")
+
+
+def create_engine(**kwargs):
+    """Engine auf den Repo-Dateien, ohne Index-, Sprach-Index- und Binär-Cache-Dateien."""
+    options = {"index_file": None, "cache_dir": None, "language_index_file": None}
+    options.update(kwargs)
+    return PromptEngine(options.pop("categories_dir", CATEGORIES_DIR), LANGUAGES_FILE, "de", **options)
@@ -0,0 +1,147 @@
+import json
+import os
+import unittest
+
+from PromptEngine import CompiledPrompt, IncrementalRenderer, CATEGORIES, is_valid_category_id, prompt_sort_key
+from tests import CATEGORIES_DIR, create_engine
+
+
+def resolve(value, language):
+    if not isinstance(value, dict):
+        return value
+    if language in value:
+        return value[language]
+    if "de" in value:
+        return value["de"]
+    return next(iter(value.values()), "")
+
+
+def reference_render(category_id, field_values, language):
+    """Bisheriger generischer Generator: Zeilen sortiert, str.format je Zeile, Rohtext bei Fehlern."""
+    with open(os.path.join(CATEGORIES_DIR, f"{category_id}.json"), 'r', encoding='utf-8') as f:
+        prompts = json.load(f).get("prompts", {})
+    lines = []
+    for prompt_key in sorted(prompts, key=prompt_sort_key):
+        text = resolve(prompts[prompt_key], language)
+        text = text if isinstance(text, str) else str(text)
+        if field_values:
+            try:
+                text = text.format(**field_values)
+            except Exception:
+                pass
+        if text and text.strip():
+            lines.append(text)
+    return "\n".join(lines)
+
+
+def apply_changes(text, changes):
+    """Überträgt die Zeilenänderungen von IncrementalRenderer.update() auf einen Vorschautext."""
+    lines = text.split("\n") if text else []
+    for row, old_line, new_line, _, _ in changes:
+        old_count = old_line.count("\n") + 1 if old_line.strip() else 0
+        lines[row:row + old_count] = new_line.split("\n") if new_line.strip() else []
+    return "\n".join(lines)
+
+
+class CompiledPromptTest(unittest.TestCase):
+
+    def test_matches_str_format(self):
+        for text in ("Stil: {style}", "{a}{b} und {a}", "ohne Platzhalter", "{{escaped}} {a}", "{a:>5}|{b!r}"):
+            values = {"a": "x", "b": 3, "style": "modern"}
+            self.assertEqual(CompiledPrompt("k", text).render(values), text.format(**values), text)
+
+    def test_missing_field_and_invalid_template_keep_raw_text(self):
+        self.assertEqual(CompiledPrompt("k", "{a} {fehlt}").render({"a": "x"}), "{a} {fehlt}")
+        self.assertEqual(CompiledPrompt("k", "kaputt {").render({"a": "x"}), "kaputt {")
+
+    def test_values_are_not_formatted_again(self):
+        self.assertEqual(CompiledPrompt("k", "Wert: {a}").render({"a": "{b}"}), "Wert: {b}")
+
+
+class PromptEngineRenderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(render_cache_entries=0)
+        cls.generic_ids = sorted(
+            category_id for category_id in set(CATEGORIES.values())
+            if category_id not in cls.engine.prompt_generators
+            and os.path.exists(os.path.join(CATEGORIES_DIR, f"{category_id}.json"))
+        )
+
+    def test_generic_categories_match_previous_generator(self):
+        for category_id in self.generic_ids:
+            for language in self.engine.language_names:
+                values = self.engine.get_default_field_values(category_id, language)
+                with self.subTest(category=category_id, language=language):
+                    self.assertEqual(self.engine.render(category_id, values, language),
+                                     reference_render(category_id, values, language))
+
+    def test_unusual_values_match_previous_generator(self):
+        for category_id in self.generic_ids:
+            values = {key: "{x}" for key in self.engine.get_default_field_values(category_id, "de")}
+            if values:
+                first = next(iter(values))
+                values[first] = ""
+            with self.subTest(category=category_id):
+                self.assertEqual(self.engine.render(category_id, values, "de"),
+                                 reference_render(category_id, values, "de"))
+
+    def test_incremental_update_matches_full_render(self):
+        for category_id in self.generic_ids:
+            renderer = IncrementalRenderer(self.engine, category_id, "de")
+            values = self.engine.get_default_field_values(category_id, "de")
+            text = renderer.render_all(values)
+            for index, field_name in enumerate(values):
+                changed = {field_name: f"neu {index}\nzweite Zeile" if index % 2 else ""}
+                values.update(changed)
+                text = apply_changes(text, renderer.update(changed))
+                with self.subTest(category=category_id, field=field_name):
+                    self.assertEqual(text, self.engine.render(category_id, values, "de"))
+
+
+class CheckboxRenderingTest(unittest.TestCase):
+    """Checkboxen werden über is_checked() ausgewertet (bool, 0/1 und Text wie "nein")."""
+
+    CHECKED = (True, 1, "1", "true", "ja", " Yes ")
+    UNCHECKED = (False, 0, None, "", "0", "false", "nein", "no")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(render_cache_entries=0)
+
+    def assert_line_toggles(self, category_id, field_name, line):
+        defaults = self.engine.get_default_field_values(category_id, "de")
+        self.assertTrue(line.strip())
+        for value in self.CHECKED:
+            with self.subTest(value=value):
+                self.assertIn(line, self.engine.render(category_id, dict(defaults, **{field_name: value}), "de"))
+        for value in self.UNCHECKED:
+            with self.subTest(value=value):
+                self.assertNotIn(line, self.engine.render(category_id, dict(defaults, **{field_name: value}), "de"))
+
+    def test_sourcecode_comments_and_tests(self):
+        comments = self.engine.get_category_prompt_text("sourcecode", "code_comments", "prompt_code_comments", "de")
+        tests = self.engine.get_category_prompt_text("sourcecode", "code_tests", "prompt_code_tests", "de")
+        self.assert_line_toggles("sourcecode", "comments", comments)
+        self.assert_line_toggles("sourcecode", "tests", tests)
+
+    def test_nutrition_optional_sections(self):
+        calories = self.engine.get_category_prompt_text("nutrition", "opt_calories", "nutrition_opt_calories", "de")
+        self.assert_line_toggles("nutrition", "show_calories", calories)
+
+
+class CategoryIdTest(unittest.TestCase):
+
+    def test_only_plain_names_are_valid(self):
+        for category_id in ("email", "ai_art", "seo-content", "X1"):
+            self.assertTrue(is_valid_category_id(category_id), category_id)
+        for category_id in ("", "../x", "a/b", "a\\b", "a.json", None, ["email"]):
+            self.assertFalse(is_valid_category_id(category_id), category_id)
+
+    def test_engine_does_not_load_paths(self):
+        self.assertIsNone(create_engine().load_category_definition("../categories/email"))
+
+
+if __name__ == "__main__":
+    unittest.main()
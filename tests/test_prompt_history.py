@@ -0,0 +1,134 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from PromptHistory import PromptHistory, HistorySearchIndex
+
+
+class PromptHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "prompt_history.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_read_last_across_block_boundaries(self):
+        history = PromptHistory(self.path, None)
+        for index in range(50):
+            history.append("Architektur", f"Prompt {index} " + "x" * index)
+        history.close()
+
+        entries = history.read_last(5, block_size=16)
+        self.assertEqual([entry["prompt"].split()[1] for entry in entries], ["45", "46", "47", "48", "49"])
+        self.assertEqual(len(history.read_last(100, block_size=16)), 50)
+        self.assertEqual(history.read_last(0), [])
+
+    def test_read_last_skips_broken_lines(self):
+        with open(self.path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write('{"prompt": "a"}\nkein json\n[1, 2]\n{"prompt": "b"}\n')
+        self.assertEqual([entry["prompt"] for entry in PromptHistory(self.path, None).read_last(3)], ["a", "b"])
+
+    def test_read_last_without_file(self):
+        self.assertEqual(PromptHistory(self.path, None).read_last(5), [])
+
+    def test_migrates_legacy_json_list(self):
+        legacy_path = os.path.join(self.directory, "prompt_history.json")
+        with open(legacy_path, 'w', encoding='utf-8') as f:
+            json.dump([{"prompt": "alt 1"}, "ungültig", {"prompt": "alt 2"}], f)
+        history = PromptHistory(self.path, legacy_path)
+        self.assertEqual([entry["prompt"] for entry in history.read_last(10)], ["alt 1", "alt 2"])
+
+    def test_unsynced_entries_are_synced_after_interval(self):
+        history = PromptHistory(self.path, None, sync_every=100, sync_interval=0.05)
+        history.append("Architektur", "erster")
+        history.append("Architektur", "zweiter")
+        deadline = time.monotonic() + 5
+        while history.unsynced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(history.unsynced, 0)
+        history.close()
+
+
+class HistorySearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.history_path = os.path.join(self.directory, "prompt_history.jsonl")
+        entries = [
+            {"date": "2025-01-10T09:00:00", "category": "Architektur", "language": "de",
+             "prompt": "Moderne Villa am Hang", "fields": {"style": "modern"}},
+            {"date": "2025-03-05T12:00:00", "category": "E-Mail", "language": "en",
+             "prompt": "Newsletter about the villa launch", "fields": {"tone": "friendly"}},
+            {"date": "2025-03-06T18:30:00", "category": "Architektur", "language": "en",
+             "prompt": "Townhouse with garden", "fields": {"style": "klassisch"}},
+        ]
+        self.write_history(entries)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_history(self, entries, mode='w'):
+        with open(self.history_path, mode, encoding='utf-8', newline='\n') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def open_index(self, fts):
+        index = HistorySearchIndex(self.history_path, os.path.join(self.directory, "prompt_history.db"))
+        self.addCleanup(index.close)
+        if not fts:
+            # LIKE-Suche wie ohne FTS5-Unterstützung
+            index.fts_enabled = False
+        elif not index.fts_enabled:
+            self.skipTest("SQLite ohne FTS5")
+        return index
+
+    def assert_search_results(self, index):
+        def prompts(*args, **kwargs):
+            return [entry["prompt"] for entry in index.search(*args, **kwargs)[0]]
+
+        self.assertEqual(index.search()[1], 3)
+        self.assertEqual(prompts("villa"), ["Newsletter about the villa launch", "Moderne Villa am Hang"])
+        self.assertEqual(prompts("villa", category="Architektur"), ["Moderne Villa am Hang"])
+        self.assertEqual(prompts("klassisch"), ["Townhouse with garden"])
+        self.assertEqual(prompts(language="en", date_from="2025-03-06"), ["Townhouse with garden"])
+        self.assertEqual(prompts(date_to="2025-03-05"), ["Newsletter about the villa launch", "Moderne Villa am Hang"])
+        self.assertEqual(prompts(limit=1, offset=1), ["Newsletter about the villa launch"])
+
+    def test_full_text_search(self):
+        index = self.open_index(fts=True)
+        self.assert_search_results(index)
+        # Präfixsuche über alle Wörter
+        self.assertEqual(index.search("vill new")[1], 1)
+
+    def test_like_fallback(self):
+        self.assert_search_results(self.open_index(fts=False))
+
+    def test_sync_is_incremental_and_restarts_after_truncation(self):
+        index = self.open_index(fts=True)
+        self.assertEqual(index.sync(), 3)
+        self.assertEqual(index.sync(), 0)
+        self.write_history([{"date": "2025-04-01", "category": "E-Mail", "prompt": "Nachtrag"}], mode='a')
+        self.assertEqual(index.sync(), 1)
+
+        self.write_history([{"date": "2025-05-01", "category": "E-Mail", "prompt": "neu"}])
+        self.assertEqual(index.sync(), 1)
+        self.assertEqual(index.search()[1], 1)
+
+    def test_incomplete_last_line_waits_for_next_sync(self):
+        index = self.open_index(fts=True)
+        with open(self.history_path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write('{"prompt": "halb')
+        self.assertEqual(index.sync(), 3)
+        with open(self.history_path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write(' fertig"}\n')
+        self.assertEqual(index.sync(), 1)
+        self.assertEqual(index.search("fertig")[1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
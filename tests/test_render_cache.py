@@ -0,0 +1,55 @@
+import sys
+import unittest
+
+from PromptEngine import RenderCache
+
+
+class RenderCacheTest(unittest.TestCase):
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = RenderCache(max_entries=2, max_bytes=1 << 20)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        self.assertEqual(cache.get("a"), "A")
+        cache.put("c", "C")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(cache.get("c"), "C")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_evicts_by_size(self):
+        prompt_size = sys.getsizeof("x" * 100)
+        cache = RenderCache(max_entries=100, max_bytes=prompt_size * 2)
+        for key in ("a", "b", "c"):
+            cache.put(key, key * 100)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "c" * 100)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_skips_prompts_larger_than_the_cache(self):
+        cache = RenderCache(max_entries=10, max_bytes=100)
+        cache.put("a", "x" * 1000)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size, 0)
+
+    def test_replacing_an_entry_keeps_size_consistent(self):
+        cache = RenderCache(max_entries=10, max_bytes=1 << 20)
+        cache.put("a", "kurz")
+        cache.put("a", "deutlich länger")
+        self.assertEqual(cache.size, sys.getsizeof("deutlich länger"))
+        cache.clear()
+        self.assertEqual((len(cache.entries), cache.size), (0, 0))
+
+    def test_normalize_distinguishes_types_and_rejects_unhashable_values(self):
+        keys = {RenderCache.normalize_field_values({"a": value}) for value in (True, 1, "1")}
+        self.assertEqual(len(keys), 3)
+        self.assertIsNone(RenderCache.normalize_field_values({"a": ["x"]}))
+        self.assertIsNone(RenderCache.normalize_field_values(None))
+
+    def test_disabled_cache(self):
+        self.assertFalse(RenderCache(max_entries=0).enabled)
+        self.assertFalse(RenderCache(max_bytes=0).enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from PromptEngine import CATEGORIES
+from ResourceBundle import ResourceBundle, build_bundle
+from tests import CATEGORIES_DIR, LANGUAGES_FILE, create_engine
+
+
+class ResourceBundleTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.bundle_file = os.path.join(cls.directory, "upm_resources.bundle")
+        cls.errors, _ = build_bundle(cls.bundle_file, CATEGORIES_DIR, LANGUAGES_FILE)
+        # Leeres Kategorie-Verzeichnis: Kategorien kommen ausschließlich aus dem Bundle
+        cls.empty_categories_dir = os.path.join(cls.directory, "categories")
+        os.mkdir(cls.empty_categories_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def open_bundle(self):
+        bundle = ResourceBundle(self.bundle_file)
+        self.addCleanup(bundle.close)
+        return bundle
+
+    def test_build_has_no_errors(self):
+        self.assertEqual(self.errors, [])
+
+    def test_round_trip_matches_source_files(self):
+        bundle = self.open_bundle()
+        category_files = sorted(name[:-len(".json")] for name in os.listdir(CATEGORIES_DIR) if name.endswith(".json"))
+        self.assertEqual(sorted(bundle.categories), category_files)
+        for category_id in category_files:
+            with open(os.path.join(CATEGORIES_DIR, f"{category_id}.json"), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.assertEqual(bundle.get_category(category_id), data, category_id)
+            self.assertEqual(bundle.get_category_names(category_id), data.get("category_name"), category_id)
+
+        with open(LANGUAGES_FILE, 'r', encoding='utf-8') as f:
+            languages = json.load(f)
+        self.assertEqual(sorted(bundle.languages), sorted(languages))
+        for code, pack in languages.items():
+            self.assertEqual(bundle.get_language_pack(code), pack, code)
+            self.assertEqual(bundle.language_names[code], pack.get("lang_name", code))
+        self.assertIsNone(bundle.get_category("gibt_es_nicht"))
+
+    def test_rejects_foreign_files(self):
+        path = os.path.join(self.directory, "kein.bundle")
+        with open(path, 'wb') as f:
+            f.write(b"kein Bundle, nur Text" * 4)
+        with self.assertRaises(ValueError):
+            ResourceBundle(path)
+
+    def test_engine_renders_the_same_from_bundle(self):
+        files_engine = create_engine(render_cache_entries=0)
+        bundle_engine = create_engine(categories_dir=self.empty_categories_dir, bundle_file=self.bundle_file,
+                                      render_cache_entries=0)
+        self.assertEqual(bundle_engine.language_names, files_engine.language_names)
+        for category_id in sorted(set(CATEGORIES.values())):
+            for language in ("de", "en"):
+                values = files_engine.get_default_field_values(category_id, language)
+                with self.subTest(category=category_id, language=language):
+                    self.assertTrue(bundle_engine.is_bundled_category(category_id))
+                    self.assertEqual(bundle_engine.get_category_display_name(category_id, language),
+                                     files_engine.get_category_display_name(category_id, language))
+                    self.assertEqual(bundle_engine.render(category_id, values, language),
+                                     files_engine.render(category_id, values, language))
+
+    def test_loose_file_overrides_bundled_category(self):
+        categories_dir = os.path.join(self.directory, "override")
+        os.mkdir(categories_dir)
+        self.addCleanup(shutil.rmtree, categories_dir, True)
+        with open(os.path.join(CATEGORIES_DIR, "email.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data["category_name"] = {"de": "Eigene E-Mail"}
+        data["prompts"] = {"line_1": "Eigener Prompt {tone}"}
+        with open(os.path.join(categories_dir, "email.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+        engine = create_engine(categories_dir=categories_dir, bundle_file=self.bundle_file)
+        self.assertFalse(engine.is_bundled_category("email"))
+        self.assertTrue(engine.is_bundled_category("ai_art"))
+        self.assertEqual(engine.get_category_display_name("email", "de"), "Eigene E-Mail")
+        self.assertEqual(engine.render("email", {"tone": "locker"}, "de"), "Eigener Prompt locker")
+
+
+if __name__ == "__main__":
+    unittest.main()
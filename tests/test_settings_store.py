@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from SettingsStore import SettingsStore
+
+
+class SettingsStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "app_settings.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_serialize_matches_json_dump(self):
+        store = SettingsStore(self.path)
+        settings = {"current_language": "de", "field_values": {"Architektur": {"style": "modern"}, "E-Mail": {}}}
+        for _ in range(2):
+            # Der zweite Durchlauf verwendet die zwischengespeicherten Fragmente
+            self.assertEqual(store.serialize(settings), json.dumps(settings, indent=2, ensure_ascii=False))
+            settings["field_values"]["E-Mail"] = {"tone": "förmlich"}
+        self.assertEqual(store.serialize({}), json.dumps({}, indent=2))
+
+    def test_flush_writes_snapshot_synchronously(self):
+        store = SettingsStore(self.path, delay=60)
+        store.save({"value": 1})
+        store.flush()
+        self.assertEqual(self.read(), {"value": 1})
+        store.flush({"value": 2})
+        self.assertEqual(self.read(), {"value": 2})
+
+    def test_flush_discards_older_background_write(self):
+        store = SettingsStore(self.path, delay=0)
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        write = store.write
+
+        def blocked_write(settings, generation=None):
+            if generation is not None:
+                # Hintergrundschreiben hat den alten Schnappschuss übernommen und wartet
+                started.set()
+                release.wait(5)
+                write(settings, generation)
+                finished.set()
+            else:
+                write(settings, generation)
+
+        store.write = blocked_write
+        store.save({"value": "alt"})
+        self.assertTrue(started.wait(5))
+        store.flush({"value": "neu"})
+        release.set()
+        self.assertTrue(finished.wait(5))
+        self.assertEqual(self.read(), {"value": "neu"})
+
+    def test_reset_discards_pending_changes_and_removes_file(self):
+        store = SettingsStore(self.path, delay=60)
+        store.flush({"value": 1})
+        store.save({"value": 2})
+        store.reset()
+        self.assertFalse(os.path.exists(self.path))
+        store.flush()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(store.load(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import unittest
+from itertools import islice
+
+from VariantGenerator import VariantGenerator, main
+from tests import create_engine
+
+
+class VariantGeneratorTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine()
+
+    def test_combination_at_matches_product_order(self):
+        generator = VariantGenerator(self.engine, "ai_art", "de")
+        combinations = list(generator.combinations())
+        self.assertEqual(len(combinations), generator.count)
+        self.assertGreater(generator.count, 1)
+        for index, combination in enumerate(combinations):
+            self.assertEqual(generator.combination_at(index), combination)
+
+    def test_sample_is_reproducible_and_distinct(self):
+        generator = VariantGenerator(self.engine, "ai_art", "de")
+        first = list(generator.sample(10, seed=7))
+        self.assertEqual(first, list(generator.sample(10, seed=7)))
+        self.assertEqual(len(set(first)), 10)
+        self.assertEqual(sorted(generator.sample(generator.count + 5, seed=1)), sorted(generator.combinations()))
+
+    def test_fixed_and_subset_fields(self):
+        generator = VariantGenerator(self.engine, "ai_art", "de")
+        field_name, values = generator.axes[0]
+        subset = VariantGenerator(self.engine, "ai_art", "de", subsets={field_name: list(values[:2])}, vary=[field_name])
+        self.assertEqual(subset.count, 2)
+        variants = list(subset.variants())
+        self.assertEqual([variant[field_name] for variant, _ in variants], list(values[:2]))
+
+        fixed = VariantGenerator(self.engine, "ai_art", "de", fixed={field_name: values[0]})
+        self.assertNotIn(field_name, fixed.field_names)
+        variant, prompt = next(islice(fixed.variants(), 1))
+        self.assertEqual(variant[field_name], values[0])
+        self.assertEqual(prompt, self.engine.render("ai_art", dict(fixed.base_values, **variant), "de"))
+
+    def test_invalid_definitions(self):
+        with self.assertRaises(ValueError):
+            VariantGenerator(self.engine, "ai_art", "de", fixed={"gibt_es_nicht": "x"})
+        with self.assertRaises(ValueError):
+            VariantGenerator(self.engine, "gibt_es_nicht", "de")
+
+    def test_sample_below_one_is_a_usage_error(self):
+        for value in ("0", "-1"):
+            with self.assertRaises(SystemExit) as raised, contextlib.redirect_stderr(io.StringIO()):
+                main(["ai_art", "--sample", value])
+            self.assertEqual(raised.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()